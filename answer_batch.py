@@ -0,0 +1,85 @@
+from rag_agent import GeorgianTaxRAGAgent
+from src.agent.fake_llm import FakeAnthropic
+from src.agent.rate_limiter import RateLimiter
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+
+# კითხვების JSONL -> პასუხების JSONL (answer, sources, usage, ეტაპების დრო)
+#
+#   python answer_batch.py questions.jsonl --output answers.jsonl --rpm 50
+#
+# ყოველ ხაზზე: {"id": ..., "question": ...} ან requests.jsonl-ის მსგავსად {"request_id", "title", "body"}
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def read_questions(path):
+    items = []
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+
+            record = json.loads(line)
+            question = record.get('question') or "\n\n".join(
+                part for part in (record.get('title'), record.get('body')) if part
+            )
+            items.append({
+                'id': record.get('id', record.get('request_id', line_number)),
+                'question': question
+            })
+
+    return items
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("input", help="კითხვების JSONL ფაილი")
+parser.add_argument("--output", default="data/answers.jsonl")
+parser.add_argument("--batch-size", type=int, default=32, help="კითხვები ერთ encode/query ნაკადში")
+parser.add_argument("--max-workers", type=int, default=8, help="ერთდროული LLM მოთხოვნები")
+parser.add_argument("--rpm", type=int, default=None, help="LLM მოთხოვნების ლიმიტი წუთში")
+parser.add_argument("--max-tokens", type=int, default=2000)
+parser.add_argument("--fake-llm", action="store_true", help="ლოკალური FakeAnthropic, API key-ის გარეშე")
+args = parser.parse_args()
+
+
+api_key = os.getenv("ANTHROPIC_API_KEY")
+
+if not api_key and not args.fake_llm:
+    logger.error("ANTHROPIC_API_KEY is not set (use --fake-llm to run without the API)")
+    sys.exit(1)
+
+
+agent = GeorgianTaxRAGAgent(api_key, client=FakeAnthropic() if args.fake_llm else None)
+items = read_questions(args.input)
+rate_limiter = RateLimiter(args.rpm) if args.rpm else None
+
+started = time.perf_counter()
+answered = 0
+failed = 0
+
+with open(args.output, 'w', encoding='utf-8') as out:
+    for start in range(0, len(items), args.batch_size):
+        batch = items[start:start + args.batch_size]
+        results = agent.answer_questions(
+            [item['question'] for item in batch],
+            max_tokens=args.max_tokens,
+            max_workers=args.max_workers,
+            rate_limiter=rate_limiter
+        )
+
+        for item, result in zip(batch, results):
+            failed += 'error' in result
+            answered += 'error' not in result
+            out.write(json.dumps({'id': item['id'], 'question': item['question'], **result}, ensure_ascii=False) + "\n")
+        out.flush()
+
+elapsed = time.perf_counter() - started
+print(f"{answered} answered, {failed} failed in {elapsed:.1f}s -> {args.output}")
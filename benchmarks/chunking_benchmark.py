@@ -0,0 +1,130 @@
+# ფიქსირებული ფანჯრის და სტრუქტურული chunker-ების შედარება:
+# ინდექსის ზომა, აწყობის დრო და retrieval hit-rate.
+#
+#   python -m benchmarks.chunking_benchmark --texts data/processed/texts --output chunking.json
+
+import argparse
+import json
+import random
+import re
+import time
+from pathlib import Path
+
+import chromadb
+from src.processing.chunking import FixedWindowChunker, LegalStructureChunker, TokenCounter, sentence_boundaries
+from src.processing.embedding_backends import BACKENDS, DEFAULT_MODEL, load_model
+from src.processing.text_store import TextStore, iter_json_texts
+
+
+def load_texts(path):
+    path = Path(path)
+    if path.is_dir():
+        return dict(TextStore(path).items())
+    return dict(iter_json_texts(path))
+
+
+def make_probes(texts, per_doc, seed=0):
+    # თითოეული დოკუმენტიდან შემთხვევითი წინადადებები - სწორი პასუხი მათი წყაროა
+    rng = random.Random(seed)
+    probes = []
+
+    for source, text in texts.items():
+        sentences = []
+        start = 0
+        for end in sentence_boundaries(text):
+            sentence = ' '.join(text[start:end].split())
+            start = end
+            if len(re.findall(r'\w+', sentence)) >= 8:
+                sentences.append(sentence)
+
+        for sentence in rng.sample(sentences, min(per_doc, len(sentences))):
+            probes.append((sentence, source))
+
+    return probes
+
+
+def run(name, chunker, model, texts, probes, top_k):
+    started = time.perf_counter()
+    chunks, sources = [], []
+    for source, text in texts.items():
+        for chunk in chunker.chunk(text):
+            chunks.append(chunk)
+            sources.append(source)
+    chunk_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    embeddings = model.encode(chunks, batch_size=32)
+    encode_seconds = time.perf_counter() - started
+
+    client = chromadb.EphemeralClient()
+    collection = client.create_collection(f"bench_{name}_{int(time.time() * 1000)}")
+    for start in range(0, len(chunks), 1000):
+        collection.add(
+            ids=[str(i) for i in range(start, min(start + 1000, len(chunks)))],
+            embeddings=embeddings[start:start + 1000].tolist(),
+            documents=chunks[start:start + 1000],
+            metadatas=[{'source': source} for source in sources[start:start + 1000]]
+        )
+
+    query_embeddings = model.encode([query for query, _ in probes], batch_size=32)
+    results = collection.query(query_embeddings=query_embeddings.tolist(), n_results=top_k)
+
+    hits = 0
+    reciprocal_ranks = 0.0
+    for (_, expected), metadatas in zip(probes, results['metadatas']):
+        ranked = [metadata['source'] for metadata in metadatas]
+        if expected in ranked:
+            hits += 1
+            reciprocal_ranks += 1 / (ranked.index(expected) + 1)
+
+    token_counter = TokenCounter(model.tokenizer)
+    tokens = token_counter.count_many(chunks)
+
+    return {
+        'chunker': chunker.signature,
+        'chunks': len(chunks),
+        'avg_tokens': sum(tokens) / max(len(tokens), 1),
+        'truncated_chunks': sum(1 for count in tokens if count > model.max_seq_length - 2),
+        'text_bytes': sum(len(chunk.encode('utf-8')) for chunk in chunks),
+        'vector_bytes': int(embeddings.nbytes),
+        'chunk_seconds': round(chunk_seconds, 4),
+        'encode_seconds': round(encode_seconds, 3),
+        f'hit@{top_k}': hits / max(len(probes), 1),
+        'mrr': reciprocal_ranks / max(len(probes), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", default="data/processed/extracted_texts.json")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--backend", choices=BACKENDS, default="torch")
+    parser.add_argument("--probes-per-doc", type=int, default=5)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    texts = load_texts(args.texts)
+    model = load_model(args.model, args.backend)
+    probes = make_probes(texts, args.probes_per_doc)
+
+    chunkers = {
+        'fixed': FixedWindowChunker(500, 100),
+        'legal': LegalStructureChunker(token_counter=TokenCounter(model.tokenizer)),
+    }
+
+    results = []
+    for name, chunker in chunkers.items():
+        if getattr(chunker, 'max_tokens', 0) + 2 > model.max_seq_length:
+            model.max_seq_length = chunker.max_tokens + 2
+        result = run(name, chunker, model, texts, probes, args.top_k)
+        results.append(result)
+        print(json.dumps(result, ensure_ascii=False))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'documents': len(texts), 'probes': len(probes), 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# DocumentDownloader-ის გამტარუნარიანობა ლოკალურ InfoHubStub-ზე (ქსელის და ბრაუზერის გარეშე):
+# დოკუმენტები/წამში სხვადასხვა max_workers-ით, დეტალების გვერდიდან ან pdf_url_template-ით.
+#
+#   python -m benchmarks.downloader_benchmark --documents 200 --latency-ms 50 --workers 1 4 8
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from benchmarks.infohub_stub import InfoHubStub
+from src.scraper.downloader import DocumentDownloader
+
+
+def run(stub, documents, workers, template, rpm):
+    workdir = Path(tempfile.mkdtemp(prefix="rag-download-"))
+
+    try:
+        downloader = DocumentDownloader(
+            stub.base_url,
+            download_dir=workdir / "pdfs",
+            max_workers=workers,
+            requests_per_minute=rpm,
+            pdf_url_template="{base_url}/api/documents/{uuid}/pdf" if template else None,
+            use_browser=False
+        )
+
+        requests_before = stub.requests
+        started = time.perf_counter()
+        results = list(downloader.download_many(documents))
+        elapsed = time.perf_counter() - started
+        downloader.close()
+
+        return {
+            'workers': workers,
+            'template': template,
+            'downloaded': sum(result['download_status'] == 'success' for result in results),
+            'requests': stub.requests - requests_before,
+            'seconds': round(elapsed, 2),
+            'docs_per_s': round(len(results) / elapsed, 1)
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--rpm", type=int, default=None, help="RateLimiter-ის ლიმიტი (ნაგულისხმევად გამორთული)")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    stub = InfoHubStub(latency_ms=args.latency_ms).start()
+    documents = [
+        {'detail_url': f"/ka/workspace/document/{uuid.uuid4()}?openFromSearch=true", 'doc_number': f"N {i}"}
+        for i in range(args.documents)
+    ]
+
+    try:
+        results = [
+            run(stub, documents, workers, template, args.rpm)
+            for template in (False, True)
+            for workers in args.workers
+        ]
+    finally:
+        stub.stop()
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# ემბედინგის backend-ების შედარება (torch fp32 / onnx / onnx-int8):
+# ჩატვირთვის დრო, ჩანქების encode throughput, ერთი query-ის latency,
+# fidelity (cosine fp32-თან იმავე ჩანქებზე) და recall@k მონიშნულ კითხვებზე.
+# ძებნა brute-force cosine-ით, რომ შედეგზე მხოლოდ ემბედინგი მოქმედებდეს.
+#
+#   python -m benchmarks.embedding_backend_benchmark --backends torch onnx onnx-int8 --output backends.json
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.retrieval_benchmark import latency_summary, load_corpus, load_questions, peak_rss_mb
+from src.processing.chunking import FixedWindowChunker
+from src.processing.embedding_backends import BACKENDS, DEFAULT_MODEL, EmbeddingBackend
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def recall(query_vectors, chunk_vectors, chunk_sources, questions, ks):
+    hits = {k: 0 for k in ks}
+    order = np.argsort(-(query_vectors @ chunk_vectors.T), axis=1)
+
+    for item, ranked in zip(questions, order):
+        # ერთი დოკუმენტის რამდენიმე ჩანქი ერთ პოზიციად ითვლება
+        sources = list(dict.fromkeys(chunk_sources[i] for i in ranked))
+        for k in ks:
+            hits[k] += any(source in item['sources'] for source in sources[:k])
+
+    return {f"at_{k}": round(hits[k] / len(questions), 3) for k in ks}
+
+
+def run_backend(backend, args, chunks, chunk_sources, questions, reference):
+    started = time.perf_counter()
+    embedding = EmbeddingBackend(args.model, backend, export_dir=args.export_dir, check_fidelity=False)
+    load_seconds = time.perf_counter() - started
+    model = embedding.model
+
+    model.encode(chunks[:args.batch_size], batch_size=args.batch_size)
+
+    started = time.perf_counter()
+    chunk_vectors = normalize(model.encode(chunks, batch_size=args.batch_size))
+    encode_seconds = time.perf_counter() - started
+
+    latencies = []
+    for item in questions:
+        started = time.perf_counter()
+        model.encode([item['question']])
+        latencies.append(time.perf_counter() - started)
+
+    query_vectors = normalize(model.encode([item['question'] for item in questions], batch_size=args.batch_size))
+
+    result = {
+        'load_s': round(load_seconds, 2),
+        'chunks_per_s': round(len(chunks) / encode_seconds, 1) if encode_seconds else 0.0,
+        'query_ms': latency_summary(latencies),
+        'recall': recall(query_vectors, chunk_vectors, chunk_sources, questions, args.k),
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+    if reference is not None:
+        similarities = (reference * chunk_vectors).sum(axis=1)
+        result['fidelity'] = {
+            'mean_cosine': round(float(similarities.mean()), 4),
+            'min_cosine': round(float(similarities.min()), 4)
+        }
+
+    return result, chunk_vectors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default="data/processed/extracted_texts.json")
+    parser.add_argument("--questions", default=str(FIXTURES / "retrieval_questions.jsonl"))
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--export-dir", default="data/models")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-chunks", type=int, default=2000)
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    questions = load_questions(args.questions)
+
+    # ფიქსირებული ფანჯარა - chunker-ს tokenizer არ სჭირდება და ყველა backend-ისთვის ერთნაირია
+    chunker = FixedWindowChunker(500, 100)
+    chunks, chunk_sources = [], []
+    for source, text in corpus.items():
+        for chunk in chunker.chunk(text):
+            chunks.append(chunk)
+            chunk_sources.append(source)
+    chunks, chunk_sources = chunks[:args.max_chunks], chunk_sources[:args.max_chunks]
+
+    # fidelity torch-თან იზომება, ამიტომ ის პირველი გაიშვება
+    backends = sorted(set(args.backends), key=BACKENDS.index)
+    reference = None
+    results = {
+        'config': {'model': args.model, 'chunks': len(chunks), 'questions': len(questions)},
+        'backends': {}
+    }
+
+    for backend in backends:
+        result, vectors = run_backend(backend, args, chunks, chunk_sources, questions, reference)
+        results['backends'][backend] = result
+        if backend == "torch":
+            reference = vectors
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
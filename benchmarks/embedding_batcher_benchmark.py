@@ -0,0 +1,71 @@
+# query embedding-ის QPS: თითო მოთხოვნაზე encode([query]) vs EmbeddingBatcher
+#
+#   python -m benchmarks.embedding_batcher_benchmark --threads 1 4 16 32 --window-ms 2 5
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.agent.embedding_batcher import EmbeddingBatcher
+from src.processing.embedding_backends import BACKENDS, DEFAULT_MODEL, load_model
+
+QUERIES = [
+    "რა არის დღგ?",
+    "როგორ ხდება დავების განხილვა?",
+    "რა არის საგადასახადო შემოწმება?",
+    "როგორ უნდა გავასაჩივრო გადაწყვეტილება?",
+    "რა არის საგადასახადო მოთხოვნა?",
+]
+
+
+def measure(encode_one, threads, requests):
+    queries = [f"{QUERIES[i % len(QUERIES)]} {i}" for i in range(requests)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(encode_one, queries))
+    elapsed = time.perf_counter() - started
+
+    return round(requests / elapsed, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--backend", choices=BACKENDS, default="torch")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--window-ms", type=float, nargs="+", default=[2, 5])
+    parser.add_argument("--requests", type=int, default=512)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    # ქეშის გარეშე - იზომება მხოლოდ მოდელის გამოყენების ეფექტურობა
+    model = load_model(args.model, args.backend)
+    model.encode(QUERIES)
+
+    results = []
+    for threads in args.threads:
+        row = {
+            'threads': threads,
+            'per_request_qps': measure(lambda query: model.encode([query])[0], threads, args.requests)
+        }
+
+        for window_ms in args.window_ms:
+            batcher = EmbeddingBatcher(model, window_ms=window_ms)
+            row[f'batched_{window_ms}ms_qps'] = measure(batcher.encode, threads, args.requests)
+            stats = batcher.stats()
+            row[f'batched_{window_ms}ms_avg_batch'] = round(stats['avg_batch_size'], 1)
+            row[f'batched_{window_ms}ms_histogram'] = stats['batch_size_histogram']
+            batcher.close()
+
+        results.append(row)
+        print(json.dumps(row, ensure_ascii=False))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
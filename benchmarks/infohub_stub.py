@@ -0,0 +1,125 @@
+# infohub.rs.ge-ის ლოკალური ჩანაცვლება სკრაპერის ბენჩმარკებისთვის:
+#   /ka/workspace/document/<uuid>   - დეტალების გვერდი (detail_page_debug.html + PDF-ის ბმული)
+#   /api/documents/<uuid>/pdf       - PDF, Content-Disposition-ით
+#   /ka/search?...&page=N           - ძიების შედეგები (page_size ბარათი selenium_page.html-ის გარსში)
+# latency_ms - თითო პასუხის ხელოვნური დაყოვნება (ქსელის იმიტაცია)
+
+import threading
+import time
+import uuid as uuid_module
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlparse
+
+from src.scraper.downloader import document_uuid
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# ბარათი InfoHub-ის მარკაპის მსგავსად: ჩადგმული card / collapsed-card კონტეინერები
+# (metadata.json-ის title ამ ტექსტების შეერთებაა)
+SEARCH_CARD = (
+    '<rs-card><div class="transition-colors border box-border card p-2-0 m-0-2">'
+    '<div class="collapsed-card cursor-pointer"><a href="/ka/workspace/document/{uuid}?openFromSearch=true">'
+    '<div class="flex gap-1-0"><div class="font-bold">დოკუმენტის #:</div><div>{number}</div></div>'
+    '<div class="flex gap-1-0"><div class="font-bold">სტატუსი:</div><div>მოქმედი</div></div>'
+    '<div class="flex gap-1-0"><div class="font-bold">დოკუმენტის ტიპი:</div>'
+    '<div>შემოსავლების სამსახურის დავების გადაწყვეტილება</div></div>'
+    '<div class="flex gap-1-0"><div class="font-bold">მიღების თარიღი:</div><div>06 თებერვალი 2026</div></div>'
+    '<div class="text-1-6">ბრძანება N {number}</div>'
+    '</a></div></div></rs-card>'
+)
+
+
+def search_page(shell, cards):
+    # selenium_page.html-ის გარსი + შედეგების ბარათები (ბენჩმარკისთვის რეალისტური ზომის გვერდი)
+    html = "".join(SEARCH_CARD.format(uuid=uuid, number=number) for uuid, number in cards)
+    return shell.replace("</body>", html + "</body>", 1)
+
+
+PDF_BODY = (
+    b"%PDF-1.4\n1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n"
+    b"2 0 obj << /Type /Pages /Kids [] /Count 0 >> endobj\n"
+    b"trailer << /Root 1 0 R >>\n%%EOF\n"
+)
+
+
+class InfoHubStub:
+
+    def __init__(self, detail_page=ROOT / "detail_page_debug.html", latency_ms=0, link_in_page=True,
+                 documents=0, page_size=10, search_shell=ROOT / "selenium_page.html"):
+        self.detail_html = Path(detail_page).read_text(encoding='utf-8')
+        self.search_shell = Path(search_shell).read_text(encoding='utf-8')
+        # ძიების შედეგები: (uuid, ნომერი), უახლესი პირველია
+        self.documents = [(str(uuid_module.uuid4()), 1000 + i) for i in range(documents)]
+        self.page_size = page_size
+        self.latency = latency_ms / 1000
+        self.link_in_page = link_in_page
+        self.requests = 0
+        self.server = None
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def detail_page(self, uuid):
+        if not self.link_in_page:
+            return self.detail_html
+        link = f'<a href="/api/documents/{uuid}/pdf">PDF</a>'
+        return self.detail_html.replace("</body>", link + "</body>", 1)
+
+    def pdf(self, uuid):
+        # ყოველ დოკუმენტს განსხვავებული შინაარსი, რომ ჰეშები არ დაემთხვეს
+        return PDF_BODY + f"% {uuid}\n".encode('ascii')
+
+    def handle(self, path):
+        parsed = urlparse(path)
+        uuid = document_uuid(parsed.path)
+
+        if parsed.path == "/ka/search":
+            page = int(parse_qs(parsed.query).get('page', ['1'])[0])
+            cards = self.documents[(page - 1) * self.page_size:page * self.page_size]
+            return 200, "text/html; charset=utf-8", search_page(self.search_shell, cards).encode('utf-8'), {}
+        if parsed.path.startswith("/ka/workspace/document/") and uuid:
+            return 200, "text/html; charset=utf-8", self.detail_page(uuid).encode('utf-8'), {}
+        if parsed.path.startswith("/api/documents/") and uuid:
+            filename = quote(f"ბრძანება N {uuid[:8]}.pdf")
+            return 200, "application/pdf", self.pdf(uuid), {
+                'Content-Disposition': f"attachment; filename*=UTF-8''{filename}"
+            }
+
+        return 404, "text/plain", b"not found", {}
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                status, content_type, body, headers = stub.handle(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, name="infohub-stub", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
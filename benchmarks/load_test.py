@@ -0,0 +1,108 @@
+# AsyncGeorgianTaxRAGAgent-ის დატვირთვის ტესტი ლოკალური fake LLM-ით:
+# throughput და latency მომხმარებლების (concurrency) მიხედვით.
+#
+#   python -m benchmarks.load_test --users 1 2 4 8 16 --requests 64
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from rag_agent import AgentOverloadedError, AsyncGeorgianTaxRAGAgent, GeorgianTaxRAGAgent
+from src.agent.fake_llm import FakeAnthropic, FakeAsyncAnthropic
+
+QUESTIONS = [
+    "რა არის დღგ?",
+    "როგორ ხდება დავების განხილვა?",
+    "რა არის საგადასახადო შემოწმება?",
+    "როგორ უნდა გავასაჩივრო გადაწყვეტილება?",
+    "რა არის საგადასახადო მოთხოვნა?",
+    "როდის ეკისრება გადამხდელს ჯარიმა?",
+    "რა ვადაში უნდა წარედგინოს საჩივარი დავების საბჭოს?",
+    "როგორ განისაზღვრება საგადასახადო ვალდებულება არაპირდაპირი მეთოდით?",
+]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def run_level(agent, users, requests):
+    latencies = []
+    rejected = 0
+    queue = asyncio.Queue()
+    for i in range(requests):
+        # განსხვავებული ტექსტი, რომ query cache-მა შედეგი არ დაამახინჯოს
+        queue.put_nowait(f"{QUESTIONS[i % len(QUESTIONS)]} ({i})")
+
+    async def user():
+        nonlocal rejected
+        while not queue.empty():
+            question = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                await agent.answer_question(question)
+                latencies.append(time.perf_counter() - started)
+            except AgentOverloadedError:
+                rejected += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(users)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'users': users,
+        'requests': len(latencies),
+        'rejected': rejected,
+        'seconds': round(elapsed, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+    }
+
+
+async def main_async(args):
+    sync_agent = GeorgianTaxRAGAgent(None, client=FakeAnthropic(), answer_cache=False)
+    agent = AsyncGeorgianTaxRAGAgent(
+        sync_agent,
+        client=FakeAsyncAnthropic(first_token_delay=args.llm_latency, token_delay=args.token_delay),
+        max_concurrency=args.max_concurrency,
+        executor_workers=args.executor_workers,
+        max_pending=args.max_pending
+    )
+
+    results = []
+    try:
+        for users in args.users:
+            result = await run_level(agent, users, args.requests)
+            results.append(result)
+            print(json.dumps(result))
+    finally:
+        await agent.aclose()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="fake LLM-ის პირველი ტოკენის დაყოვნება (წმ)")
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--max-concurrency", type=int, default=16)
+    parser.add_argument("--executor-workers", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# ერთეტაპიანი retrieval (top-5) vs over-fetch + cross-encoder re-rank:
+# end-to-end latency და prompt-ის ზომა (ტოკენები) თითო კითხვაზე.
+#
+#   python -m benchmarks.reranker_benchmark --candidates 10 20 40 --token-budget 800
+#   python -m benchmarks.reranker_benchmark --live   # ნამდვილი Anthropic API (ANTHROPIC_API_KEY)
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+from rag_agent import GeorgianTaxRAGAgent
+from src.agent.fake_llm import FakeAnthropic
+from src.agent.reranker import CrossEncoderReranker
+from src.processing.chunking import estimate_tokens
+
+QUESTIONS = [
+    "რა არის დღგ?",
+    "როგორ ხდება დავების განხილვა?",
+    "რა არის საგადასახადო შემოწმება?",
+    "როგორ უნდა გავასაჩივრო გადაწყვეტილება?",
+    "რა არის საგადასახადო მოთხოვნა?",
+    "როდის ეკისრება გადამხდელს ჯარიმა?",
+    "რა ვადაში უნდა წარედგინოს საჩივარი დავების საბჭოს?",
+    "როგორ განისაზღვრება საგადასახადო ვალდებულება არაპირდაპირი მეთოდით?",
+]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def run(agent, name, max_tokens):
+    latencies = []
+    prompt_tokens = []
+    retrieval_ms = []
+
+    for question in QUESTIONS:
+        started = time.perf_counter()
+        prepared = agent._prepare_answer(question)
+        prepared_at = time.perf_counter()
+
+        response = agent.client.messages.create(**agent._llm_request(prepared, max_tokens))
+        agent._finish_answer(question, prepared, response.content[0].text, response.usage)
+
+        latencies.append(time.perf_counter() - started)
+        prompt_tokens.append(estimate_tokens(prepared['prompt']))
+        retrieval_ms.append((prepared_at - started) * 1000)
+
+    return {
+        'config': name,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'retrieval_p50_ms': round(percentile(retrieval_ms, 50), 1),
+        'avg_prompt_tokens': round(statistics.mean(prompt_tokens), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="cross-encoder/mmarco-mMiniLMv2-L12-H384-v1")
+    parser.add_argument("--candidates", type=int, nargs="+", default=[10, 20, 40])
+    parser.add_argument("--token-budget", type=int, default=None)
+    parser.add_argument("--max-latency-ms", type=float, default=300)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="fake LLM-ის დაყოვნება (წმ)")
+    parser.add_argument("--max-tokens", type=int, default=500)
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    client = None if args.live else FakeAnthropic(first_token_delay=args.llm_latency)
+    api_key = os.environ.get("ANTHROPIC_API_KEY") if args.live else None
+
+    agent = GeorgianTaxRAGAgent(api_key, client=client, answer_cache=False)
+    results = [run(agent, "top5", args.max_tokens)]
+    print(json.dumps(results[0]))
+
+    reranker = CrossEncoderReranker(args.model, max_latency_ms=args.max_latency_ms)
+    reranker.warmup()
+    agent.reranker = reranker
+    agent.context_token_budget = args.token_budget
+
+    for candidates in args.candidates:
+        agent.rerank_candidates = candidates
+        result = run(agent, f"rerank_{candidates}", args.max_tokens)
+        result['prompt_reduction'] = round(1 - result['avg_prompt_tokens'] / results[0]['avg_prompt_tokens'], 3)
+        result['rerank_timeouts'] = reranker.stats()['timeouts']
+        results.append(result)
+        print(json.dumps(result))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
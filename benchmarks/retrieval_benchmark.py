@@ -0,0 +1,211 @@
+# retrieval-ის ხარისხის და სისწრაფის რეგრესიის ტესტი, სრულად offline:
+# დროებით დირექტორიაში იგება ინდექსი extracted_texts.json-იდან, LLM - FakeAnthropic.
+# იზომება: აწყობის სიჩქარე (chunks/s), retrieve_context-ის p50/p95/p99, recall@k
+# მონიშნულ კითხვებზე (benchmarks/fixtures/retrieval_questions.jsonl) და პიკური RSS.
+#
+#   python -m benchmarks.retrieval_benchmark --output retrieval.json
+#   python -m benchmarks.retrieval_benchmark --compare retrieval.json --tolerance 0.2
+
+import argparse
+import json
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from rag_agent import GeorgianTaxRAGAgent
+from src.agent.fake_llm import FakeAnthropic
+from src.processing.embedding_backends import BACKENDS, DEFAULT_MODEL
+from src.processing.embeddings_builder import EmbeddingsBuilder
+from src.processing.text_store import TextStore, iter_json_texts
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# მეტრიკა -> True, თუ მეტი უკეთესია
+METRICS = {
+    'build.chunks_per_s': True,
+    'retrieve_cold_ms.p50': False,
+    'retrieve_cold_ms.p95': False,
+    'retrieve_warm_ms.p50': False,
+    'retrieve_warm_ms.p95': False,
+    'recall.at_1': True,
+    'recall.at_5': True,
+    'peak_rss_mb': False,
+}
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def latency_summary(seconds):
+    return {f"p{q}": round(percentile(seconds, q) * 1000, 2) for q in (50, 95, 99)}
+
+
+def load_corpus(path, replicate=1):
+    path = Path(path)
+    texts = dict(TextStore(path).items()) if path.is_dir() else dict(iter_json_texts(path))
+
+    # --replicate: კორპუსის ასლები სხვა დირექტორიაში, ფაილის სახელი (source) იგივე რჩება
+    corpus = dict(texts)
+    for copy in range(1, replicate):
+        for source, text in texts.items():
+            corpus[f"replica-{copy}/{Path(source).name}"] = text
+
+    return corpus
+
+
+def load_questions(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def peak_rss_mb():
+    # Linux-ზე ru_maxrss KB-შია, macOS-ზე ბაიტებში
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run(args):
+    corpus = load_corpus(args.corpus, args.replicate)
+    questions = load_questions(args.questions)
+    workdir = Path(tempfile.mkdtemp(prefix="rag-bench-"))
+
+    try:
+        builder = EmbeddingsBuilder(
+            args.model,
+            embedding_cache_dir=workdir / "embedding_cache",
+            chunker=args.chunker,
+            lexical_index_dir=workdir / "lexical_index",
+            persist_dir=workdir / "vectordb",
+            embedding_backend=args.backend,
+            workers=args.workers
+        )
+
+        started = time.perf_counter()
+        chunks = builder.build_vector_database(
+            corpus,
+            incremental=False,
+            checkpoint_file=workdir / "checkpoint.jsonl",
+            metadata_file=args.metadata
+        )
+        build_seconds = time.perf_counter() - started
+        builder.close()
+
+        agent = GeorgianTaxRAGAgent(
+            None,
+            client=FakeAnthropic(),
+            answer_cache=False,
+            hybrid=not args.vector_only,
+            lexical_index_dir=workdir / "lexical_index",
+            persist_dir=workdir / "vectordb",
+            embedding_cache_dir=workdir / "embedding_cache",
+            model_name=args.model,
+            embedding_backend=args.backend
+        )
+
+        # პირველი გავლა - query ემბედინგი ითვლება (cold), შემდეგები - query cache-იდან (warm)
+        cold = []
+        warm = []
+        hits = {k: 0 for k in args.k}
+
+        for round_number in range(args.repeats):
+            for item in questions:
+                started = time.perf_counter()
+                results = agent.retrieve_context(item['question'], top_k=max(args.k))
+                (cold if round_number == 0 else warm).append(time.perf_counter() - started)
+
+                if round_number == 0:
+                    sources = [metadata['source'] for metadata in results['metadatas'][0]]
+                    for k in args.k:
+                        hits[k] += any(source in item['sources'] for source in sources[:k])
+
+        return {
+            'config': {
+                'model': args.model,
+                'backend': builder.embedding.backend,
+                'workers': args.workers,
+                'chunker': builder.chunker.signature,
+                'hybrid': not args.vector_only,
+                'documents': len(corpus),
+                'questions': len(questions),
+                'repeats': args.repeats
+            },
+            'build': {
+                'chunks': chunks,
+                'seconds': round(build_seconds, 2),
+                'chunks_per_s': round(chunks / build_seconds, 1) if build_seconds else 0.0
+            },
+            'retrieve_cold_ms': latency_summary(cold),
+            'retrieve_warm_ms': latency_summary(warm) if warm else {},
+            'recall': {f"at_{k}": round(hits[k] / len(questions), 3) for k in args.k},
+            'peak_rss_mb': peak_rss_mb()
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def lookup(results, metric):
+    value = results
+    for part in metric.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+
+    for metric, higher_is_better in METRICS.items():
+        current, previous = lookup(results, metric), lookup(baseline, metric)
+        if current is None or not previous:
+            continue
+
+        change = (current - previous) / previous
+        if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+            regressions.append(f"{metric}: {previous} -> {current} ({change:+.1%})")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default="data/processed/extracted_texts.json")
+    parser.add_argument("--metadata", default="data/raw/metadata.json")
+    parser.add_argument("--questions", default=str(FIXTURES / "retrieval_questions.jsonl"))
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--backend", choices=BACKENDS, default="torch")
+    parser.add_argument("--chunker", default="legal")
+    parser.add_argument("--replicate", type=int, default=1, help="კორპუსის ასლების რაოდენობა (აწყობის დატვირთვისთვის)")
+    parser.add_argument("--workers", type=int, default=1, help="აწყობის ემბედინგის worker პროცესები")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--vector-only", action="store_true")
+    parser.add_argument("--output")
+    parser.add_argument("--compare", help="წინა შედეგების JSON - რეგრესიისას exit code 1")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = run(args)
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# ძიების შედეგების პარსინგი: ძველი parse_document_cards (ყველა div-ის სკანირება) vs search_crawler.iter_cards
+# selenium_page.html-ზე და იმავე გვერდზე --cards შედეგის ბარათით; შემდეგ SearchCrawler-ის სრული გავლა
+# InfoHubStub-ზე (დრო პირველ დოკუმენტამდე და დოკუმენტები/წამში).
+#
+#   python -m benchmarks.search_crawler_benchmark --cards 10 50 --pages 20
+
+import argparse
+import json
+import re
+import statistics
+import time
+import uuid
+from pathlib import Path
+
+import requests
+from bs4 import BeautifulSoup
+
+from benchmarks.infohub_stub import InfoHubStub, search_page
+from src.scraper.search_crawler import PARSERS, SearchCrawler, available_parser, iter_cards
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def legacy_parse_document_cards(html):
+    # InfoScraper.parse_document_cards-ის წინა ვერსია - შედარებისთვის
+    soup = BeautifulSoup(html, 'html.parser')
+    cards = soup.find_all('div', class_=lambda x: x and 'card' in str(x).lower())
+    if not cards:
+        cards = [card for card in soup.find_all('div', recursive=True) if card.find('a')]
+
+    documents = []
+    for card in cards:
+        link = card.find('a', href=True)
+        if not link:
+            continue
+        href = link.get('href')
+        if not href or href.startswith('#') or href.startswith('http'):
+            continue
+
+        title = card.find('h1') or card.find('h2') or card.find('h3')
+        text = card.get_text()
+        match = re.search(r'N\s*(\d+)', text)
+        documents.append({
+            'detail_url': href,
+            'title': (title or link).get_text(strip=True),
+            'doc_number': f"N {match.group(1)}" if match else None
+        })
+
+    return documents
+
+
+def measure(parse, html, repeats):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        documents = list(parse(html))
+        timings.append(time.perf_counter() - started)
+
+    urls = [document['detail_url'] for document in documents]
+    return {
+        'ms': round(statistics.median(timings) * 1000, 2),
+        'documents': len(urls),
+        'unique': len(set(urls))
+    }
+
+
+def parsing(args):
+    shell = (ROOT / "selenium_page.html").read_text(encoding='utf-8')
+    parsers = [name for name in PARSERS if _installed(name)]
+    results = []
+
+    for cards in [0] + args.cards:
+        html = search_page(shell, [(str(uuid.uuid4()), 1000 + i) for i in range(cards)]) if cards else shell
+        row = {'cards': cards, 'bytes': len(html.encode('utf-8')), 'legacy': measure(legacy_parse_document_cards, html, args.repeats)}
+        for name in parsers:
+            row[name] = measure(lambda page: iter_cards(page, name), html, args.repeats)
+        results.append(row)
+
+    return results
+
+
+def _installed(name):
+    try:
+        available_parser(name)
+        return True
+    except ImportError:
+        return False
+
+
+def crawl(args):
+    stub = InfoHubStub(documents=args.pages * args.page_size, page_size=args.page_size, latency_ms=args.latency_ms).start()
+    session = requests.Session()
+
+    try:
+        crawler = SearchCrawler(lambda url: session.get(url, timeout=30).text)
+        started = time.perf_counter()
+        first = None
+        count = 0
+
+        for _ in crawler.iter_documents(f"{stub.base_url}/ka/search?types=1"):
+            count += 1
+            if first is None:
+                first = time.perf_counter() - started
+
+        elapsed = time.perf_counter() - started
+        return {
+            'parser': crawler.parser,
+            'documents': count,
+            'pages': crawler.stats['pages'],
+            'first_document_ms': round((first or 0) * 1000, 1),
+            'seconds': round(elapsed, 2),
+            'docs_per_s': round(count / elapsed, 1),
+            'fetch_s': round(crawler.stats['fetch_s'], 2),
+            'parse_s': round(crawler.stats['parse_s'], 2)
+        }
+    finally:
+        stub.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = {'parsing': parsing(args), 'crawl': crawl(args)}
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,47 @@
+from src.processing.embedding_backends import BACKENDS
 from src.processing.embeddings_builder import EmbeddingsBuilder
+from src.processing.text_store import TextStore
 from pathlib import Path
+import argparse
 
 
 
 
-builder = EmbeddingsBuilder()
+# --workers-ისას worker პროცესები spawn-ით იქმნება და ამ ფაილს თავიდან იმპორტავენ
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--full", action="store_true", help="კოლექციის თავიდან აწყობა")
+    parser.add_argument("--batch-size", type=int, default=256, help="ჩანქები ერთ encode/upsert ნაკადში")
+    parser.add_argument("--workers", type=int, default=1, help="ემბედინგის worker პროცესები (0 - ბირთვების რაოდენობა)")
+    parser.add_argument("--threads-per-worker", type=int, default=None, help="ნაგულისხმევი: ბირთვები / workers")
+    parser.add_argument("--backend", choices=BACKENDS, default=None, help="ემბედინგის backend (ნაგულისხმევი - RAG_EMBEDDING_BACKEND ან torch)")
+    args = parser.parse_args()
 
 
-extracted_texts_file = Path("data/processed/extracted_texts.json")
+    builder = EmbeddingsBuilder(
+        embedding_backend=args.backend,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker
+    )
 
-if not extracted_texts_file.exists():
-    print("Run test text_extraction ")
-else:
-    total_chunks = builder.build_vector_database(extracted_texts_file)
+
+    store = TextStore("data/processed/texts")
+    legacy_file = Path("data/processed/extracted_texts.json")
+
+    # ძველი ფორმატის ერთჯერადი გადმოტანა
+    if not len(store) and legacy_file.exists():
+        store.import_json(legacy_file)
+
+    if not len(store):
+        print("Run test text_extraction ")
+    else:
+        # ნაგულისხმევად მხოლოდ ცვლილებები ინდექსირდება; შეწყვეტილი აწყობა checkpoint-იდან გრძელდება
+        total_chunks = builder.build_vector_database(
+            store,
+            incremental=not args.full,
+            batch_size=args.batch_size
+        )
+
+    builder.close()
+    
     
-    
\ No newline at end of file
@@ -0,0 +1,622 @@
+from src.processing.document_metadata import document_fields, load_document_fields
+from src.processing.embedding_backends import BACKENDS, DEFAULT_BACKEND, DEFAULT_MODEL
+from src.processing.pdf_processor import PDFProcessor
+from src.processing.text_store import TextStore
+from src.scraper.manifest import file_hash
+from itertools import chain
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+
+# scrape -> extract -> chunk / embed / index ერთი ბრძანებით (ყოფილი src/scraper/test.py, test_txt_extra.py, test_emb.py)
+#
+#   python pipeline.py                                  # ყველა ეტაპი, მხოლოდ ცვლილებები
+#   python pipeline.py --root /srv/rag                  # data/ --root-ში (ნაგულისხმევი - ამ ფაილის დირექტორია)
+#   python pipeline.py --stages extract index           # სკრაპინგის გარეშე (უკვე ჩამოტვირთული PDF-ები)
+#   python pipeline.py --max-documents 20 --output run.json
+#
+# ეტაპები ერთდროულად მუშაობს (thread + queue): ჩამოტვირთული PDF მაშინვე გადადის ტექსტის ამოღებაზე,
+# ამოღებული ტექსტი - ინდექსაციაზე. ყოველი არტეფაქტის fingerprint (PDF-ის sha256, ტექსტის ჰეში + ველები +
+# კონფიგურაცია) data/processed/pipeline.sqlite-შია: უცვლელი შესავლის მქონე ეტაპი გამოიტოვება, ჩავარდნილი
+# გაშვება განმეორებისას იქიდან გრძელდება, სადაც გაჩერდა (ინდექსაციის შუაში - build_checkpoint.jsonl-იდან)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent
+STAGES = ("scrape", "extract", "index")
+SEARCH_URL = "https://infohub.rs.ge/ka/search?types=1&types=15&types=16&types=17&types=75&types=76&types=77"
+
+DONE = object()
+
+
+class PipelineState:
+    # artifacts: (ეტაპი, გასაღები) -> fingerprint ბოლო წარმატებული დამუშავებისას; runs: გაშვებების ისტორია და შეჯამება
+
+    def __init__(self, db_path="data/processed/pipeline.sqlite"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        self.db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS artifacts ("
+            "stage TEXT NOT NULL, key TEXT NOT NULL, fingerprint TEXT NOT NULL, updated REAL NOT NULL, "
+            "PRIMARY KEY (stage, key))"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "run_id INTEGER PRIMARY KEY AUTOINCREMENT, started REAL NOT NULL, finished REAL, "
+            "status TEXT NOT NULL, stages TEXT NOT NULL, summary TEXT, error TEXT)"
+        )
+        self.db.commit()
+
+    def fingerprints(self, stage):
+        with self._lock:
+            rows = self.db.execute("SELECT key, fingerprint FROM artifacts WHERE stage = ?", (stage,)).fetchall()
+        return dict(rows)
+
+    def mark(self, stage, items):
+        # items: (key, fingerprint) წყვილები
+        now = time.time()
+        with self._lock:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO artifacts (stage, key, fingerprint, updated) VALUES (?, ?, ?, ?)",
+                [(stage, key, fingerprint, now) for key, fingerprint in items]
+            )
+            self.db.commit()
+
+    def forget(self, stage, keys=None):
+        # keys=None - ეტაპის ყველა ჩანაწერი
+        with self._lock:
+            if keys is None:
+                self.db.execute("DELETE FROM artifacts WHERE stage = ?", (stage,))
+            else:
+                self.db.executemany(
+                    "DELETE FROM artifacts WHERE stage = ? AND key = ?", [(stage, key) for key in keys]
+                )
+            self.db.commit()
+
+    def last_run(self):
+        with self._lock:
+            row = self.db.execute(
+                "SELECT run_id, status, error FROM runs ORDER BY run_id DESC LIMIT 1"
+            ).fetchone()
+        return row
+
+    def start_run(self, stages):
+        with self._lock:
+            cursor = self.db.execute(
+                "INSERT INTO runs (started, status, stages) VALUES (?, 'running', ?)",
+                (time.time(), json.dumps(list(stages)))
+            )
+            self.db.commit()
+        return cursor.lastrowid
+
+    def finish_run(self, run_id, status, summary, error=None):
+        with self._lock:
+            self.db.execute(
+                "UPDATE runs SET finished = ?, status = ?, summary = ?, error = ? WHERE run_id = ?",
+                (time.time(), status, json.dumps(summary, ensure_ascii=False), error, run_id)
+            )
+            self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+class StageStats:
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.skipped = 0
+        self.failed = 0
+        self.extra = {}
+        self.started = None
+        self.finished = None
+        self.status = "pending"
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.status = "running"
+
+    def finish(self, status="done"):
+        self.finished = time.perf_counter()
+        self.status = status
+
+    def summary(self):
+        seconds = (self.finished or time.perf_counter()) - self.started if self.started else 0.0
+        return {
+            'stage': self.name,
+            'status': self.status,
+            'items': self.items,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'seconds': round(seconds, 2),
+            'items_per_s': round(self.items / seconds, 2) if seconds and self.items else 0.0,
+            **self.extra
+        }
+
+
+class Pipeline:
+
+    def __init__(self, stages=STAGES, search_url=SEARCH_URL, base_url="https://infohub.rs.ge",
+                 max_documents=None, max_pages=None, scrape_workers=4, requests_per_minute=60,
+                 extract_workers=None, model_name=DEFAULT_MODEL, embedding_backend=None, chunker="legal",
+                 embedding_workers=1, batch_size=256, force=False, queue_size=64,
+                 root=None, metadata_file=None, texts_dir=None, state_file=None):
+        self.stages = [stage for stage in STAGES if stage in stages]
+        self.search_url = search_url
+        self.base_url = base_url
+        self.max_documents = max_documents
+        self.max_pages = max_pages
+        self.scrape_workers = scrape_workers
+        self.requests_per_minute = requests_per_minute
+        self.extract_workers = extract_workers
+        self.model_name = model_name
+        self.embedding_backend = embedding_backend
+        self.chunker = chunker
+        self.embedding_workers = embedding_workers
+        self.batch_size = batch_size
+        self.force = force
+        self.queue_size = queue_size
+        # ყველა გზა root/data-შია, მიმდინარე დირექტორიისგან დამოუკიდებლად
+        self.root = Path(root).resolve() if root else ROOT
+        self.data_dir = self.root / "data"
+        self.metadata_file = Path(metadata_file) if metadata_file else self.data_dir / "raw" / "metadata.json"
+        self.texts_dir = texts_dir or self.data_dir / "processed" / "texts"
+
+        self.state = PipelineState(state_file or self.data_dir / "processed" / "pipeline.sqlite")
+        self.stats = {stage: StageStats(stage) for stage in self.stages}
+        self.stop = threading.Event()
+        self.errors = {}
+
+        # ფაილის სახელი -> Chroma-ს ველები; სკრაპერი ახალ დოკუმენტებს ჩამოტვირთვისთანავე ამატებს,
+        # რომ ინდექსაციამ metadata.json-ის ხელახლა ჩაწერას არ დაელოდოს
+        self.fields = load_document_fields(self.metadata_file)
+        # ინდექსის კონფიგურაცია fingerprint-ში: chunker-ის / მოდელის შეცვლისას ყველა დოკუმენტი თავიდან ინდექსირდება
+        self.index_config = json.dumps(
+            {'model': model_name, 'backend': embedding_backend or DEFAULT_BACKEND, 'chunker': chunker}, sort_keys=True
+        )
+
+    def _key(self, pdf_path):
+        # fingerprint-ების, TextStore-ისა და Chroma-ს გასაღები root-ის მიმართ ფარდობითი გზაა ("data/raw/pdfs/...")
+        path = Path(pdf_path)
+        if path.is_absolute() and path.is_relative_to(self.root):
+            return str(path.relative_to(self.root))
+        return str(pdf_path)
+
+    def _path(self, key):
+        return self.root / key
+
+    def _put(self, target, item):
+        # შემდეგი ეტაპის ჩავარდნისას რიგი აღარ იცლება - ლოდინი stop-ით წყდება
+        while not self.stop.is_set():
+            try:
+                target.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _iter_queue(self, source):
+        while True:
+            try:
+                item = source.get(timeout=0.5)
+            except queue.Empty:
+                if self.stop.is_set():
+                    return
+                continue
+            if item is DONE:
+                return
+            yield item
+
+    def _run_stage(self, name, target, *args):
+        stats = self.stats[name]
+        stats.start()
+        try:
+            target(*args)
+            stats.finish("skipped" if not stats.items and stats.skipped else "done")
+        except Exception as e:
+            if self.stop.is_set():
+                # სხვა ეტაპის ჩავარდნის გამო შეწყდა
+                stats.finish("stopped")
+                return
+            logger.exception(f"Stage {name} failed: {e}")
+            self.errors[name] = f"{type(e).__name__}: {e}"
+            stats.finish("failed")
+            self.stop.set()
+        finally:
+            output = getattr(self, f"_{name}_output", None)
+            if output is not None:
+                self._put(output, DONE)
+
+    # --- scrape ---
+
+    def scrape(self):
+        # selenium / webdriver_manager მხოლოდ სკრაპინგს სჭირდება
+        from src.scraper.info_scraper import InfoScraper
+
+        stats = self.stats['scrape']
+        scraper = InfoScraper(
+            base_url=self.base_url,
+            max_workers=self.scrape_workers,
+            requests_per_minute=self.requests_per_minute,
+            data_dir=self.data_dir
+        )
+
+        def on_download(doc):
+            if self.stop.is_set():
+                raise RuntimeError("pipeline stopped")
+
+            if doc.get('download_status') != 'success':
+                stats.failed += 1
+                return
+
+            stats.items += 1
+            self.fields[Path(doc['pdf_path']).name] = document_fields(doc)
+            if self._scrape_output is not None:
+                self._put(self._scrape_output, doc)
+
+        try:
+            documents = scraper.scrape_all_documents(
+                self.search_url,
+                max_documents=self.max_documents,
+                max_pages=self.max_pages,
+                on_download=on_download
+            )
+        finally:
+            scraper.downloader.close()
+
+        stats.skipped = len(documents) - stats.items - stats.failed
+        stats.extra['changed'] = len(scraper.changed_documents())
+
+    # --- extract ---
+
+    def _metadata_documents(self):
+        if not self.metadata_file.exists():
+            logger.warning(f"{self.metadata_file} not found, nothing to extract")
+            return []
+
+        with open(self.metadata_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _extract_batch(self, processor, documents, done, seen):
+        stats = self.stats['extract']
+        pending = {}
+
+        for document in documents:
+            if document.get('download_status') != 'success' or not document.get('pdf_path'):
+                continue
+            pdf_path = self._key(document['pdf_path'])
+            if pdf_path in seen:
+                continue
+            seen.add(pdf_path)
+
+            path = self._path(pdf_path)
+            if not path.exists():
+                logger.warning(f"PDF not found: {path}")
+                stats.failed += 1
+                continue
+
+            # fingerprint = PDF-ის შინაარსის ჰეში (მანიფესტიდან; ძველ metadata.json-ში - თავიდან ითვლება)
+            fingerprint = document.get('content_hash') or file_hash(path)
+            if not self.force and done.get(pdf_path) == fingerprint and pdf_path in self.store:
+                stats.skipped += 1
+                continue
+
+            pending[str(path)] = (pdf_path, fingerprint)
+
+        if not pending:
+            return
+
+        extracted = []
+        for path, text in processor.iter_texts(list(pending)):
+            pdf_path, fingerprint = pending[path]
+            self.store.put(pdf_path, text)
+            extracted.append((pdf_path, fingerprint))
+            stats.items += 1
+            if self._extract_output is not None and not self._put(self._extract_output, (pdf_path, text)):
+                break
+
+        # ტექსტის გარეშე ("" ქეშშია) / შეცდომით ან ვადაგადაცილებით დასრულებული (ქეშში არ იწერება) ფაილები
+        # არ აღინიშნება: შემდეგ გაშვებაზე პირველი ქეშიდან მოწმდება, მეორე თავიდან ამოიღება
+        stats.failed += len(pending) - len(extracted)
+        self.store.flush()
+        self.state.mark('extract', extracted)
+
+    def _batches(self, source, size):
+        # რიგიდან რაც უკვე მოვიდა (მინიმუმ ერთი) - ერთ process pool-ში
+        for item in self._iter_queue(source):
+            batch = [item]
+            while len(batch) < size:
+                try:
+                    item = source.get_nowait()
+                except queue.Empty:
+                    break
+                if item is DONE:
+                    yield batch
+                    return
+                batch.append(item)
+            yield batch
+
+    def extract(self, source):
+        # ერთი pool მთელი ეტაპისთვის - worker-ები ყოველ batch-ზე თავიდან არ იქმნება
+        processor = PDFProcessor(
+            workers=self.extract_workers,
+            persistent_pool=True,
+            processed_dir=self.data_dir / "processed"
+        )
+        done = self.state.fingerprints('extract')
+        seen = set()
+
+        try:
+            if source is not None:
+                for batch in self._batches(source, max(processor.workers * 4, 8)):
+                    self._extract_batch(processor, batch, done, seen)
+
+            if self.stop.is_set():
+                return
+
+            # დანარჩენი: ამ გაშვებაში ჩამოუტვირთავი, მაგრამ ჯერ არ დამუშავებული ან შეცვლილი PDF-ები
+            # (ან სკრაპინგის გარეშე გაშვებისას - ყველა metadata.json-იდან)
+            documents = self._metadata_documents()
+            self.fields.update(load_document_fields(self.metadata_file))
+            self._extract_batch(processor, documents, done, seen)
+        finally:
+            processor.close()
+
+    # --- chunk / embed / index ---
+
+    def _index_fingerprint(self, pdf_path, text_hash):
+        fields = json.dumps(self.fields.get(Path(pdf_path).name, {}), sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(f"{self.index_config}\x00{fields}\x00{text_hash}".encode('utf-8')).hexdigest()
+
+    def _live_keys(self):
+        # TextStore-ის ტექსტები, რომელთა PDF ჯერ კიდევ metadata.json-შია; დანარჩენი store-იდან იშლება
+        keys = set(self.store.keys())
+        paths = {
+            self._key(document['pdf_path']) for document in self._metadata_documents()
+            if document.get('download_status') == 'success' and document.get('pdf_path')
+        }
+        if not paths:
+            # metadata.json-ის გარეშე (ძველი TextStore) ყველა ტექსტი რჩება
+            return keys
+
+        removed = keys - paths
+        if removed:
+            for key in removed:
+                self.store.delete(key)
+            self.store.flush()
+            logger.info(f"{len(removed)} documents no longer in {self.metadata_file}, removed from {self.store.root}")
+
+        return keys & paths
+
+    def _index_inputs(self, source, done, marked, scan):
+        stats = self.stats['index']
+        yielded = set()
+
+        def changed(pdf_path, text_hash):
+            fingerprint = self._index_fingerprint(pdf_path, text_hash)
+            if not self.force and done.get(pdf_path) == fingerprint:
+                return False
+            marked.append((pdf_path, fingerprint))
+            yielded.add(pdf_path)
+            stats.items += 1
+            return True
+
+        if source is not None:
+            for pdf_path, text in self._iter_queue(source):
+                if changed(pdf_path, TextStore.text_hash(text)):
+                    yield pdf_path, text
+
+        if self.stop.is_set():
+            return
+
+        # TextStore-ის დანარჩენი ტექსტები: წინა (ჩავარდნილი) გაშვების ან შეცვლილი ველების / კონფიგურაციის გამო
+        live = self._live_keys()
+        for pdf_path in sorted(live - yielded):
+            if changed(pdf_path, self.store.get_hash(pdf_path)):
+                yield pdf_path, self.store[pdf_path]
+
+        if self.stop.is_set():
+            return
+
+        # სრული სია მხოლოდ ბოლომდე გავლისას - მის მიხედვით იშლება ძველი დოკუმენტები ინდექსიდან
+        stats.skipped = len(live - yielded)
+        scan['live'] = live | yielded
+
+    def _create_builder(self):
+        from src.processing.embeddings_builder import EmbeddingsBuilder
+
+        return EmbeddingsBuilder(
+            model_name=self.model_name,
+            chunker=self.chunker,
+            embedding_backend=self.embedding_backend,
+            workers=self.embedding_workers,
+            embedding_cache_dir=self.data_dir / "embedding_cache",
+            lexical_index_dir=self.data_dir / "lexical_index",
+            persist_dir=self.data_dir / "vectordb"
+        )
+
+    def _prune(self, builder, live):
+        stats = self.stats['index']
+        stats.extra['deleted_chunks'] = builder.prune_sources(live)
+
+        removed = [key for key in self.state.fingerprints('index') if key not in live]
+        self.state.forget('index', removed)
+        self.state.forget('extract', [key for key in self.state.fingerprints('extract') if key not in live])
+        stats.extra['removed'] = len(removed)
+
+    def index(self, source):
+        stats = self.stats['index']
+        done = self.state.fingerprints('index')
+        marked = []
+        scan = {'live': None}
+        documents = self._index_inputs(source, done, marked, scan)
+
+        # მოდელი იტვირთება მხოლოდ პირველი შეცვლილი დოკუმენტის მოსვლისას
+        first = next(documents, None)
+        if first is None:
+            live = scan['live']
+            # ცვლილება არ არის, მაგრამ ზოგი დოკუმენტი metadata.json-იდან / TextStore-იდან წაიშალა
+            if live is not None and any(key not in live for key in done):
+                builder = self._create_builder()
+                try:
+                    self._prune(builder, live)
+                finally:
+                    builder.close()
+            return
+
+        builder = self._create_builder()
+        try:
+            mismatch = builder.index_model_mismatch()
+            if mismatch:
+                # სხვა მოდელით / backend-ით აგებული ინდექსი მთლიანად თავიდან იგება: ყველა დოკუმენტი შესავალშია
+                logger.warning(f"Index was built with {mismatch}, re-indexing all documents")
+                self.state.forget('index')
+                done.clear()
+                self.force = True
+
+            builder.build_vector_database(
+                chain([first], documents),
+                incremental=True,
+                batch_size=self.batch_size,
+                metadata_file=self.metadata_file,
+                checkpoint_file=self.data_dir / "processed" / "build_checkpoint.jsonl",
+                document_fields=self.fields,
+                prune=bool(mismatch)
+            )
+
+            # წინა ეტაპის ჩავარდნისას აქ მხოლოდ უკვე მოსული დოკუმენტებია - ისინი ბოლომდე ჩაწერილია
+            self.state.mark('index', marked)
+
+            if scan['live'] is not None:
+                self._prune(builder, scan['live'])
+        finally:
+            builder.close()
+
+        build = builder.build_stats
+        stats.extra.update({
+            'chunks': build['chunks'],
+            'new_chunks': build['new'],
+            'embedded': builder.encoder.misses,
+            'chunks_per_s': round(build['chunks'] / (time.perf_counter() - stats.started), 1)
+        })
+
+    def run(self):
+        previous = self.state.last_run()
+        if previous and previous[1] != 'done':
+            logger.info(f"Run {previous[0]} ended with status {previous[1]} ({previous[2]}), resuming")
+
+        run_id = self.state.start_run(self.stages)
+        started = time.perf_counter()
+        self.store = TextStore(self.texts_dir)
+
+        # ეტაპებს შორის რიგები; ეტაპი, რომელიც ამ გაშვებაში არ არის, რიგს არ იღებს
+        self._scrape_output = queue.Queue(self.queue_size) if 'scrape' in self.stages and 'extract' in self.stages else None
+        self._extract_output = queue.Queue(self.queue_size) if 'extract' in self.stages and 'index' in self.stages else None
+
+        threads = []
+        if 'scrape' in self.stages:
+            threads.append(threading.Thread(target=self._run_stage, args=("scrape", self.scrape), name="scrape"))
+        if 'extract' in self.stages:
+            threads.append(threading.Thread(
+                target=self._run_stage, args=("extract", self.extract, self._scrape_output), name="extract"
+            ))
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            # Chroma და ემბედინგის worker-ები - მთავარ thread-ში
+            if 'index' in self.stages:
+                self._run_stage("index", self.index, self._extract_output)
+        except KeyboardInterrupt:
+            self.errors['interrupted'] = "KeyboardInterrupt"
+            self.stop.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+
+            self.store.close()
+            summary = {
+                'run_id': run_id,
+                'seconds': round(time.perf_counter() - started, 2),
+                'stages': [self.stats[stage].summary() for stage in self.stages]
+            }
+            status = "failed" if self.errors else "done"
+            error = "; ".join(f"{stage}: {message}" for stage, message in self.errors.items()) or None
+            self.state.finish_run(run_id, status, summary, error)
+            self.state.close()
+
+        summary['status'] = status
+        return summary
+
+
+def log_summary(summary):
+    logger.info(f"Run {summary['run_id']}: {summary['status']} in {summary['seconds']}s")
+    for stage in summary['stages']:
+        extra = ", ".join(f"{key}: {value}" for key, value in stage.items() if key not in (
+            'stage', 'status', 'items', 'skipped', 'failed', 'seconds', 'items_per_s'
+        ))
+        logger.info(
+            f"  {stage['stage']:<8} {stage['status']:<8} {stage['items']} processed, {stage['skipped']} unchanged, "
+            f"{stage['failed']} failed, {stage['seconds']}s ({stage['items_per_s']}/s){', ' + extra if extra else ''}"
+        )
+
+
+# ემბედინგის worker პროცესები spawn-ით იქმნება და ამ ფაილს თავიდან იმპორტავენ
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--search-url", default=SEARCH_URL)
+    parser.add_argument("--base-url", default="https://infohub.rs.ge")
+    parser.add_argument("--max-documents", type=int, default=None)
+    parser.add_argument("--max-pages", type=int, default=None)
+    parser.add_argument("--scrape-workers", type=int, default=4, help="პარალელური ჩამოტვირთვები")
+    parser.add_argument("--rpm", type=int, default=60, help="მოთხოვნები წუთში infohub-ზე")
+    parser.add_argument("--extract-workers", type=int, default=None, help="ნაგულისხმევი: ბირთვების რაოდენობა")
+    parser.add_argument("--backend", choices=BACKENDS, default=None, help="ემბედინგის backend")
+    parser.add_argument("--chunker", default="legal")
+    parser.add_argument("--workers", type=int, default=1, help="ემბედინგის worker პროცესები (0 - ბირთვების რაოდენობა)")
+    parser.add_argument("--batch-size", type=int, default=256, help="ჩანქები ერთ encode/upsert ნაკადში")
+    parser.add_argument("--force", action="store_true", help="fingerprint-ების იგნორირება, ყველაფრის თავიდან დამუშავება")
+    parser.add_argument("--output", help="გაშვების შეჯამება JSON-ად")
+    parser.add_argument("--root", default=None, help="დირექტორია, რომლის data/-შიც ინახება ყველაფერი (ნაგულისხმევი: ამ ფაილის დირექტორია)")
+    args = parser.parse_args()
+
+    pipeline = Pipeline(
+        stages=args.stages,
+        search_url=args.search_url,
+        base_url=args.base_url,
+        max_documents=args.max_documents,
+        max_pages=args.max_pages,
+        scrape_workers=args.scrape_workers,
+        requests_per_minute=args.rpm,
+        extract_workers=args.extract_workers,
+        embedding_backend=args.backend,
+        chunker=args.chunker,
+        embedding_workers=args.workers,
+        batch_size=args.batch_size,
+        force=args.force,
+        root=args.root
+    )
+    summary = pipeline.run()
+    log_summary(summary)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    if summary['status'] != 'done':
+        raise SystemExit(1)
@@ -1,95 +1,660 @@
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import chromadb
-from sentence_transformers import SentenceTransformer
 import logging
+import time
 from pathlib import Path
 
+from src.agent.answer_cache import SemanticAnswerCache
+from src.agent.context_builder import build_context
+from src.agent.embedding_batcher import EmbeddingBatcher
+from src.agent.metrics import MetricsRegistry, Trace
+from src.agent.prompts import SYSTEM_PROMPT
+from src.agent.query_cache import QueryEmbeddingCache
+from src.agent.rate_limiter import RateLimiter
+from src.processing.chunking import estimate_tokens
+from src.processing.document_metadata import build_where
+from src.processing.embedding_backends import DEFAULT_MODEL, EmbeddingBackend
+from src.processing.embedding_cache import CachedEncoder, EmbeddingCache
+from src.processing.lexical_index import LexicalIndex, is_identifier_query, reciprocal_rank_fusion
+
 logger = logging.getLogger(__name__)
 
 
 class GeorgianTaxRAGAgent:
-    def __init__(self, api_key):
+    llm_model = "claude-sonnet-4-20250514"
+    
+    # ყველა მოთხოვნაში უცვლელია - cache_control-ით provider-ის prompt cache-ში ინახება (src.agent.prompts)
+    system_prompt = SYSTEM_PROMPT
+    # provider-ი ამაზე მოკლე პრეფიქსს არ ქეშირებს (Sonnet - 1024, Haiku - 2048)
+    min_cacheable_tokens = 1024
+    
+    def __init__(self, api_key, query_cache_size=1024, warmup=True, answer_cache=True,
+                 answer_cache_threshold=0.95, answer_cache_ttl=24 * 3600, client=None,
+                 micro_batch_window_ms=None, hybrid=True, lexical_index_dir="data/lexical_index",
+                 reranker=None, rerank_candidates=20, context_token_budget=2000, persist_dir="data/vectordb",
+                 collection_name="georgian_tax_docs", embedding_cache_dir="data/embedding_cache", metrics=None,
+                 model_name=DEFAULT_MODEL, embedding_backend=None, index_version_ttl=30):
       
-       
-        self.client = Anthropic(api_key=api_key)
+        # client - ტესტებისთვის შეიძლება src.agent.fake_llm.FakeAnthropic გადაეცეს
+        self.client = client or Anthropic(api_key=api_key)
         
-        self.embedder = SentenceTransformer('paraphrase-multilingual-mpnet-base-v2')
+        if estimate_tokens(self.system_prompt) < self.min_cacheable_tokens:
+            logger.warning(f"System prompt is shorter than {self.min_cacheable_tokens} tokens and will not be cached")
+        
+        # embedding_backend: torch / onnx / onnx-int8; ნაგულისხმევი - RAG_EMBEDDING_BACKEND
+        self.embedding = EmbeddingBackend(model_name, embedding_backend)
+        self.embedder = self.embedding.model
+        self.encoder = CachedEncoder(
+            self.embedder,
+            self.embedding.cache_name,
+            EmbeddingCache(self.embedding.cache_name, cache_dir=embedding_cache_dir)
+        )
+        self.query_cache = QueryEmbeddingCache(maxsize=query_cache_size)
+        
+        # ბევრი ერთდროული მომხმარებლისას query-ები ერთ batch-ად ერთიანდება
+        self.batcher = EmbeddingBatcher(self.encoder, window_ms=micro_batch_window_ms) if micro_batch_window_ms else None
         
        
-        self.chroma_client = chromadb.PersistentClient(path="data/vectordb")
+        self.chroma_client = chromadb.PersistentClient(path=str(persist_dir))
+        
+        self.collection = self.chroma_client.get_collection(collection_name)
+        
+        index_model = (self.collection.metadata or {}).get('embedding_model')
+        # ძველ ინდექსებში უცნობია (None) - strip_overlap მხოლოდ გრძელ დამთხვევას ჭრის
+        self.chunk_overlap = (self.collection.metadata or {}).get('chunk_overlap')
+        if index_model and index_model != self.embedding.cache_name:
+            logger.warning(f"Index was built with {index_model}, queries use {self.embedding.cache_name}")
         
-        self.collection = self.chroma_client.get_collection("georgian_tax_docs")
+        # BM25 ინდექსი build_vector_db-ს მიერ იქმნება; mmap-ით იტვირთება, ამიტომ გაშვებას არ ანელებს
+        self.lexical_index = LexicalIndex(lexical_index_dir) if hybrid else None
+        if self.lexical_index and not self.lexical_index.available:
+            logger.warning(f"Lexical index not found in {lexical_index_dir}, using vector search only")
+        
+        self.answer_cache = SemanticAnswerCache(
+            threshold=answer_cache_threshold,
+            ttl=answer_cache_ttl
+        ) if answer_cache else None
+        
+        # index_version Chroma-დან ყოველ მოთხოვნაზე არ იკითხება: ახლდება index_version_ttl წამში ერთხელ
+        # ან როცა build_vector_db BM25 ინდექსს (meta.json) გადაწერს
+        self.index_version_ttl = index_version_ttl
+        self._lexical_meta = Path(lexical_index_dir) / "meta.json"
+        self._index_version = None
+        
+        # ეტაპების დრო, ტოკენები და ქეშების hit rate; ჰუკები/ექსპორტი - src.agent.metrics
+        self.metrics = metrics or MetricsRegistry()
+        self.metrics.add_collector(self._cache_gauges)
+        
+        # reranker - src.agent.reranker.CrossEncoderReranker; None-ის შემთხვევაში retrieval ერთეტაპიანია
+        self.reranker = reranker
+        self.rerank_candidates = rerank_candidates
+        self.context_token_budget = context_token_budget
+        
+        if warmup:
+            self.warmup()
     
+    def warmup(self, batch_size=8):
+        # პირველი encode-ის ინიციალიზაციის ხარჯი აქ იხდება და არა პირველ მომხმარებელზე.
+        # პირდაპირ მოდელს გადაეცემა, რომ ქეშებში ცრუ ჩანაწერები არ მოხვდეს
+        embeddings = self.embedder.encode(["საგადასახადო კოდექსი"] * batch_size, batch_size=batch_size)
+        if self.reranker:
+            self.reranker.warmup()
+        
+        # Chroma-ს პირველი query HNSW ინდექსს დისკიდან ტვირთავს (ასობით ms)
+        if self.collection.count():
+            self.collection.query(query_embeddings=[embeddings[0].tolist()], n_results=1)
     
-    def retrieve_context(self, query, top_k=5):
-     
+    def embed_query(self, query):
+        
+        embedding = self.query_cache.get(query)
+        
+        if embedding is None:
+            if self.batcher:
+                embedding = self.batcher.encode(query)
+            else:
+                embedding = self.encoder.encode([query])[0]
+            self.query_cache.put(query, embedding)
+        
+        return embedding
     
-        query_embedding = self.embedder.encode([query])[0]
+    def embed_queries(self, queries):
+        # ყველა query-ს, რომელიც ქეშში არ არის, ერთი encode გამოძახება
+        embeddings = [self.query_cache.get(query) for query in queries]
+        missing = list(dict.fromkeys(query for query, embedding in zip(queries, embeddings) if embedding is None))
+        
+        if missing:
+            encoded = dict(zip(missing, self.encoder.encode(missing, batch_size=len(missing))))
+            for query, embedding in encoded.items():
+                self.query_cache.put(query, embedding)
+            embeddings = [encoded[query] if embedding is None else embedding for query, embedding in zip(queries, embeddings)]
+        
+        return embeddings
+    
+    def _lexical_mtime(self):
+        try:
+            return self._lexical_meta.stat().st_mtime_ns
+        except OSError:
+            return None
+    
+    def index_version(self):
+        # build_vector_db ყოველ ცვლილებაზე index_version-ს ანახლებს; ძველ ბაზებში count-ია
+        now = time.monotonic()
+        mtime = self._lexical_mtime()
+        
+        if self._index_version is not None:
+            version, checked_at, checked_mtime = self._index_version
+            if now - checked_at < self.index_version_ttl and mtime == checked_mtime:
+                return version
+        
+        collection = self.chroma_client.get_collection(self.collection.name)
+        version = (collection.metadata or {}).get('index_version') or f"count:{collection.count()}"
+        self._index_version = (version, now, mtime)
+        
+        return version
+    
+    def cache_stats(self):
+        
+        stats = {
+            'query_cache': self.query_cache.stats(),
+            'embedding_cache': {'hits': self.encoder.hits, 'misses': self.encoder.misses}
+        }
+        if self.answer_cache:
+            stats['answer_cache'] = self.answer_cache.stats()
+        if self.batcher:
+            stats['embedding_batcher'] = self.batcher.stats()
+        if self.reranker:
+            stats['reranker'] = self.reranker.stats()
+        
+        return stats
+    
+    
+    def _cache_gauges(self):
+        
+        hit_rates = {}
+        for name, stats in self.cache_stats().items():
+            if 'hits' in stats:
+                total = stats['hits'] + stats['misses']
+                hit_rates[name] = stats['hits'] / total if total else 0.0
+        
+        return {'cache_hit_rate': hit_rates}
+    
+    def _lexical(self):
+        
+        if self.lexical_index is None:
+            return None
         
+        self.lexical_index.reload_if_changed()
+        return self.lexical_index if self.lexical_index.available else None
+    
+    def _get_by_ids(self, ids, distances=None):
+        # collection.get-ის შედეგი collection.query-ის ფორმატში, ids-ის რიგით
+        found = self.collection.get(ids=ids, include=['documents', 'metadatas'])
+        by_id = {
+            chunk_id: (document, metadata)
+            for chunk_id, document, metadata in zip(found['ids'], found['documents'], found['metadatas'])
+        }
+        ids = [chunk_id for chunk_id in ids if chunk_id in by_id]
+        distances = distances or {}
+        
+        return {
+            'ids': [ids],
+            'documents': [[by_id[chunk_id][0] for chunk_id in ids]],
+            'metadatas': [[by_id[chunk_id][1] for chunk_id in ids]],
+            'distances': [[distances.get(chunk_id) for chunk_id in ids]]
+        }
+    
+    def _filter_ids(self, ids, where):
+        # BM25 კანდიდატებზე იგივე where, რაც ვექტორულ ძებნაზე
+        if not where or not ids:
+            return ids
+        
+        allowed = set(self.collection.get(ids=ids, where=where, include=[])['ids'])
+        return [chunk_id for chunk_id in ids if chunk_id in allowed]
+    
+    def exact_lookup(self, query, top_k=5, filters=None):
+        # "№25852/2/2025", "N 2823" - ნომრით ძებნა inverted index-ით, ენკოდერის გარეშე
+        lexical = self._lexical()
+        if lexical is None or not is_identifier_query(query):
+            return None
+        
+        hits = lexical.exact_matches(query, top_k if not filters else top_k * 4)
+        ids = self._filter_ids([chunk_id for chunk_id, _ in hits], build_where(filters))[:top_k]
+        if not ids:
+            return None
+        
+        return self._get_by_ids(ids)
+    
+    def retrieve_context(self, query, top_k=5, query_embedding=None, candidates=3, filters=None):
+        # filters: {'doc_type', 'status', 'decision_number', 'source', 'date_from', 'date_to'} -> Chroma where
+        exact = self.exact_lookup(query, top_k, filters)
+        if exact and exact['ids'][0]:
+            return exact
+        
+        where = build_where(filters)
+        
+        if query_embedding is None:
+            query_embedding = self.embed_query(query)
+        
+        lexical = self._lexical()
     
         results = self.collection.query(
             query_embeddings=[query_embedding.tolist()],
-            n_results=top_k
+            n_results=top_k * candidates if lexical else top_k,
+            where=where
+        )
+        
+        if lexical is None:
+            return results
+        
+        return self._fuse(query, results, top_k, lexical, where, candidates)
+    
+    def retrieve_contexts(self, queries, top_k=5, query_embeddings=None, candidates=3, filters=None):
+        # retrieve_context რამდენიმე query-ზე: ერთი multi-query collection.query
+        contexts = [self.exact_lookup(query, top_k, filters) for query in queries]
+        pending = [i for i, context in enumerate(contexts) if not (context and context['ids'][0])]
+        
+        if not pending:
+            return contexts
+        
+        # query_embeddings - queries-ის პარალელური სია (None - ჯერ არ არის დათვლილი);
+        # ადგილზე ივსება, რომ გამომძახებელმა fallback-ის ემბედინგებიც მიიღოს
+        if query_embeddings is None:
+            query_embeddings = [None] * len(queries)
+        missing = [i for i in pending if query_embeddings[i] is None]
+        if missing:
+            for i, embedding in zip(missing, self.embed_queries([queries[i] for i in missing])):
+                query_embeddings[i] = embedding
+        
+        where = build_where(filters)
+        lexical = self._lexical()
+        
+        results = self.collection.query(
+            query_embeddings=[query_embeddings[i].tolist() for i in pending],
+            n_results=top_k * candidates if lexical else top_k,
+            where=where
         )
         
-        return results
+        for j, i in enumerate(pending):
+            single = {key: [results[key][j]] for key in ('ids', 'documents', 'metadatas', 'distances')}
+            contexts[i] = self._fuse(queries[i], single, top_k, lexical, where, candidates) if lexical else single
+        
+        return contexts
+    
+    def _fuse(self, query, results, top_k, lexical, where, candidates):
+        # vector + BM25, Reciprocal Rank Fusion
+        vector_ids = results['ids'][0]
+        lexical_ids = self._filter_ids([chunk_id for chunk_id, _ in lexical.search(query, top_k * candidates)], where)
+        fused_ids = [chunk_id for chunk_id, _ in reciprocal_rank_fusion([vector_ids, lexical_ids], top_k=top_k)]
+        
+        distances = dict(zip(vector_ids, results['distances'][0]))
+        known = {
+            chunk_id: (document, metadata)
+            for chunk_id, document, metadata in zip(vector_ids, results['documents'][0], results['metadatas'][0])
+        }
+        
+        missing = [chunk_id for chunk_id in fused_ids if chunk_id not in known]
+        if missing:
+            extra = self._get_by_ids(missing)
+            known.update(zip(extra['ids'][0], zip(extra['documents'][0], extra['metadatas'][0])))
+        
+        fused_ids = [chunk_id for chunk_id in fused_ids if chunk_id in known]
+        
+        return {
+            'ids': [fused_ids],
+            'documents': [[known[chunk_id][0] for chunk_id in fused_ids]],
+            'metadatas': [[known[chunk_id][1] for chunk_id in fused_ids]],
+            'distances': [[distances.get(chunk_id) for chunk_id in fused_ids]]
+        }
     
     def format_context(self, results):
-       
-        context = ""
+        # დუბლიკატების გარეშე, მეზობელი ჩანქები გაერთიანებული, context_token_budget-ის ფარგლებში
+        return build_context(results, self.context_token_budget, overlap=self.chunk_overlap)
+    
+    def _retrieve_for_answer(self, question, filters=None, trace=None):
         
-        for i in range(len(results['documents'][0])):
-            doc_text = results['documents'][0][i]
-            metadata = results['metadatas'][0][i]
-            
-            context += f"\n--- დოკუმენტი {i+1} ---\n"
-            context += f"წყარო: {metadata['source']}\n"
-            context += f"ნაწილი: {metadata['chunk_id'] + 1}/{metadata['total_chunks']}\n"
-            context += f"{doc_text}\n"
+        trace = trace or Trace()
+        
+        # re-ranker-ით მეტი კანდიდატი მოგვაქვს და საუკეთესო 5 რჩება
+        fetch_k = self.rerank_candidates if self.reranker else 5
+        
+        # ნომრით ნაპოვნი კითხვა ენკოდერს საერთოდ არ გადის (პასუხების ქეში მას ტექსტით ეძებს)
+        with trace.span('exact_lookup'):
+            exact = self.exact_lookup(question, top_k=fetch_k, filters=filters)
+        
+        query_embedding = None
+        if exact:
+            results = exact
+        else:
+            with trace.span('embed'):
+                query_embedding = self.embed_query(question)
+            with trace.span('retrieve'):
+                results = self.retrieve_context(question, top_k=fetch_k, query_embedding=query_embedding, filters=filters)
+        
+        if self.reranker:
+            with trace.span('rerank'):
+                results = self.reranker.rerank(question, results, top_k=5, token_budget=self.context_token_budget)
         
-        return context
+        return query_embedding, results
     
-    def answer_question(self, question, max_tokens=2000):
+    def _prepare_answer(self, question, filters=None, retrieved=None, trace=None):
       
         logger.info(f"Question: {question}")
         
+        trace = trace or Trace()
+        query_embedding, results = retrieved or self._retrieve_for_answer(question, filters, trace)
+        sources = [meta['source'] for meta in results['metadatas'][0]]
+        
+        prepared = {
+            'query_embedding': query_embedding,
+            'results': results,
+            'sources': sources,
+            'cached': None,
+            'trace': trace
+        }
+        
+        if self.answer_cache:
+            with trace.span('answer_cache'):
+                self.answer_cache.check_version(self.index_version())
+                cached = self.answer_cache.lookup(query_embedding, results['ids'][0], question=question)
+            
+            if cached:
+                logger.info(f"Answer cache hit ({cached['similarity']:.3f}): {cached['cached_question']}")
+                usage = self._usage_dict(None)
+                trace.set(cached=True, usage=usage)
+                self.metrics.record(trace)
+                
+                prepared['cached'] = {
+                    'answer': cached['answer'],
+                    'sources': cached['sources'],
+                    'context_used': len(results['documents'][0]),
+                    'usage': usage,
+                    'cached': True,
+                    'timings': trace.timings_ms()
+                }
+                return prepared
         
-        results = self.retrieve_context(question, top_k=5)
-        context = self.format_context(results)
+        with trace.span('format_context'):
+            context = self.format_context(results)
         
        
-        prompt = f"""შენ ხარ ასისტენტი საქართველოს საგადასახადო და საბაჟო ადმინისტრირების თემაზე.
-
-კონტექსტი დოკუმენტებიდან:
+        # სტატიკური ინსტრუქციები system_prompt-შია (ქეშირდება), აქ მხოლოდ ცვლადი ნაწილი
+        prompt = f"""კონტექსტი დოკუმენტებიდან:
 {context}
 
-კითხვა: {question}
-
-გთხოვთ უპასუხოთ კითხვას ქართულად და ᲧᲝᲕᲔᲚᲗᲕᲘᲡ მიუთითოთ წყარო. 
-
-მნიშვნელოვანი:
-- პასუხი უნდა იყოს ზუსტი და დაფუძნებული მხოლოდ მოწოდებულ დოკუმენტებზე
-- თითოეული ფაქტის შემდეგ მიუთითეთ წყარო: [წყარო: დოკუმენტის სახელი]
-- თუ პასუხი არ არის დოკუმენტებში, გამოაცხადეთ ეს მკაფიოდ
-- პასუხი უნდა იყოს მკაფიო და გასაგები"""
-        
+კითხვა: {question}"""
         
+        prepared['prompt'] = prompt
+        return prepared
+    
+    def _llm_request(self, prepared, max_tokens):
         
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=max_tokens,
-            messages=[
-                {"role": "user", "content": prompt}
+        return {
+            'model': self.llm_model,
+            'max_tokens': max_tokens,
+            'system': [
+                {"type": "text", "text": self.system_prompt, "cache_control": {"type": "ephemeral"}}
+            ],
+            'messages': [
+                {"role": "user", "content": prepared['prompt']}
             ]
-        )
+        }
+    
+    @staticmethod
+    def _usage_dict(usage):
         
-        answer = response.content[0].text
+        # input_tokens ქეშის გარეშე დამუშავებული ნაწილია; ქეშიდან წაკითხული/ჩაწერილი ცალკე მოდის
+        return {
+            'input_tokens': getattr(usage, 'input_tokens', 0) or 0,
+            'output_tokens': getattr(usage, 'output_tokens', 0) or 0,
+            'cache_read_input_tokens': getattr(usage, 'cache_read_input_tokens', 0) or 0,
+            'cache_creation_input_tokens': getattr(usage, 'cache_creation_input_tokens', 0) or 0
+        }
+    
+    def _finish_answer(self, question, prepared, answer, usage):
+        
+        results = prepared['results']
+        trace = prepared['trace']
         
+        if self.answer_cache:
+            with trace.span('answer_cache'):
+                self.answer_cache.put(question, prepared['query_embedding'], results['ids'][0], answer, prepared['sources'])
         
+        usage = self._usage_dict(usage)
+        trace.set(cached=False, usage=usage)
+        self.metrics.record(trace)
         
         return {
             'answer': answer,
-            'sources': [meta['source'] for meta in results['metadatas'][0]],
-            'context_used': len(results['documents'][0])
+            'sources': prepared['sources'],
+            'context_used': len(results['documents'][0]),
+            'usage': usage,
+            'cached': False,
+            'timings': trace.timings_ms()
         }
+    
+    def answer_question(self, question, max_tokens=2000, filters=None):
+        
+        prepared = self._prepare_answer(question, filters)
+        if prepared['cached']:
+            return prepared['cached']
+        
+        with prepared['trace'].span('llm'):
+            response = self.client.messages.create(**self._llm_request(prepared, max_tokens))
+        
+        answer = response.content[0].text
+        
+        return self._finish_answer(question, prepared, answer, response.usage)
+    
+    def answer_question_stream(self, question, max_tokens=2000, filters=None):
+        # {'type': 'text', 'text': ...} ნაწილები გენერაციისთანავე, ბოლოს
+        # {'type': 'done', 'answer', 'sources', 'context_used', 'usage', 'cached', 'timings'}
+        prepared = self._prepare_answer(question, filters)
+        
+        if prepared['cached']:
+            yield {'type': 'text', 'text': prepared['cached']['answer']}
+            yield {'type': 'done', **prepared['cached']}
+            return
+        
+        parts = []
+        trace = prepared['trace']
+        started = time.perf_counter()
+        
+        with self.client.messages.stream(**self._llm_request(prepared, max_tokens)) as stream:
+            for text in stream.text_stream:
+                if not parts:
+                    trace.add_span('llm_first_token', time.perf_counter() - started)
+                parts.append(text)
+                yield {'type': 'text', 'text': text}
+            
+            final_message = stream.get_final_message()
+        
+        # მომხმარებლის მხარეს რენდერის დროც შედის (generator-ი yield-ზე ჩერდება)
+        trace.add_span('llm', time.perf_counter() - started)
+        
+        yield {'type': 'done', **self._finish_answer(question, prepared, ''.join(parts), final_message.usage)}
+    
+    def answer_questions(self, questions, max_tokens=2000, filters=None, max_workers=8, requests_per_minute=None,
+                         rate_limiter=None):
+        # batch: ყველა კითხვის ემბედინგი ერთი encode-ით, ერთი multi-query collection.query,
+        # LLM გამოძახებები პარალელურად (requests_per_minute-ის ლიმიტით).
+        # შედეგები questions-ის რიგით; შეცდომისას ელემენტი {'error': ...}-ია
+        questions = list(questions)
+        if not questions:
+            return []
+        
+        fetch_k = self.rerank_candidates if self.reranker else 5
+        started = time.perf_counter()
+        
+        embeddings = [None] * len(questions)
+        need = [i for i, question in enumerate(questions) if not is_identifier_query(question)]
+        for i, embedding in zip(need, self.embed_queries([questions[i] for i in need])):
+            embeddings[i] = embedding
+        embedded = time.perf_counter()
+        
+        contexts = self.retrieve_contexts(questions, top_k=fetch_k, query_embeddings=embeddings, filters=filters)
+        retrieved = time.perf_counter()
+        
+        # საერთო ეტაპები მთელ batch-ზე ერთხელ სრულდება
+        batch_timings = {
+            'embed_batch': round((embedded - started) * 1000, 1),
+            'retrieve_batch': round((retrieved - embedded) * 1000, 1)
+        }
+        
+        # rate_limiter რამდენიმე batch-ს შორის საერთო ლიმიტისთვის გადაეცემა
+        limiter = rate_limiter or (RateLimiter(requests_per_minute) if requests_per_minute else None)
+        
+        def answer_one(i):
+            question = questions[i]
+            trace = Trace()
+            trace.set(batch_size=len(questions))
+            
+            try:
+                results = contexts[i]
+                if self.reranker:
+                    with trace.span('rerank'):
+                        results = self.reranker.rerank(question, results, top_k=5, token_budget=self.context_token_budget)
+                
+                prepared = self._prepare_answer(question, filters, retrieved=(embeddings[i], results), trace=trace)
+                
+                if prepared['cached']:
+                    result = prepared['cached']
+                else:
+                    if limiter:
+                        with trace.span('rate_limit_wait'):
+                            limiter.acquire()
+                    
+                    with trace.span('llm'):
+                        response = self.client.messages.create(**self._llm_request(prepared, max_tokens))
+                    
+                    result = self._finish_answer(question, prepared, response.content[0].text, response.usage)
+                
+                return {**result, 'timings': {**batch_timings, **result['timings']}}
+            except Exception as e:
+                logger.error(f"Batch question {i} failed: {e}")
+                return {'error': str(e), 'timings': {**batch_timings, **trace.timings_ms()}}
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rag-batch") as pool:
+            return list(pool.map(answer_one, range(len(questions))))
+
+
+class AgentOverloadedError(RuntimeError):
+    pass
 
+
+class AsyncGeorgianTaxRAGAgent:
+    # asyncio ვერსია: embedding/Chroma/ქეშები (CPU) შეზღუდულ thread pool-ში, LLM - AsyncAnthropic-ით.
+    # max_concurrency - ერთდროულად დამუშავებული კითხვები, max_pending - რიგის ლიმიტი,
+    # რომლის გადაჭარბებისას ახალი მოთხოვნა მაშინვე AgentOverloadedError-ით უარყოფილია
+    
+    def __init__(self, agent, api_key=None, client=None, max_concurrency=8, executor_workers=4, max_pending=64):
+        
+        self.agent = agent
+        self.client = client or AsyncAnthropic(api_key=api_key)
+        self.executor = ThreadPoolExecutor(max_workers=executor_workers, thread_name_prefix="rag-cpu")
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pending = 0
+    
+    @property
+    def pending(self):
+        return self._pending
+    
+    def _admit(self, count=1):
+        # batch ერთიანად მიიღება ან უარყოფილია - ნაწილობრივ არა
+        if self._pending + count > self.max_pending:
+            raise AgentOverloadedError(
+                f"Too many pending requests ({self._pending} pending, {count} requested, limit {self.max_pending})"
+            )
+        self._pending += count
+    
+    async def _run_cpu(self, func, *args):
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+    
+    async def retrieve_context(self, query, top_k=5, filters=None):
+        
+        return await self._run_cpu(partial(self.agent.retrieve_context, query, top_k, filters=filters))
+    
+    async def _answer(self, question, max_tokens, filters):
+        # უკვე მიღებული (_admit) მოთხოვნა; pending-ს გამომძახებელი ამცირებს
+        async with self._semaphore:
+            prepared = await self._run_cpu(self.agent._prepare_answer, question, filters)
+            if prepared['cached']:
+                return prepared['cached']
+            
+            with prepared['trace'].span('llm'):
+                response = await self.client.messages.create(**self.agent._llm_request(prepared, max_tokens))
+            answer = response.content[0].text
+            
+            return await self._run_cpu(self.agent._finish_answer, question, prepared, answer, response.usage)
+    
+    async def answer_question(self, question, max_tokens=2000, filters=None):
+        
+        self._admit()
+        try:
+            return await self._answer(question, max_tokens, filters)
+        finally:
+            self._pending -= 1
+    
+    async def answer_question_stream(self, question, max_tokens=2000, filters=None):
+        
+        self._admit()
+        try:
+            async with self._semaphore:
+                prepared = await self._run_cpu(self.agent._prepare_answer, question, filters)
+                
+                if prepared['cached']:
+                    yield {'type': 'text', 'text': prepared['cached']['answer']}
+                    yield {'type': 'done', **prepared['cached']}
+                    return
+                
+                parts = []
+                trace = prepared['trace']
+                started = time.perf_counter()
+                
+                async with self.client.messages.stream(**self.agent._llm_request(prepared, max_tokens)) as stream:
+                    async for text in stream.text_stream:
+                        if not parts:
+                            trace.add_span('llm_first_token', time.perf_counter() - started)
+                        parts.append(text)
+                        yield {'type': 'text', 'text': text}
+                    
+                    final_message = await stream.get_final_message()
+                
+                trace.add_span('llm', time.perf_counter() - started)
+                
+                result = await self._run_cpu(
+                    self.agent._finish_answer, question, prepared, ''.join(parts), final_message.usage
+                )
+                yield {'type': 'done', **result}
+        finally:
+            self._pending -= 1
+    
+    async def answer_questions(self, questions, max_tokens=2000, filters=None):
+        # batch ერთ მოთხოვნად მიიღება (max_pending-ზე დიდი batch - AgentOverloadedError), შემდეგ
+        # semaphore-ით max_concurrency-ის ფარგლებში. შედეგები questions-ის რიგით; შეცდომისას
+        # ელემენტი {'error': ...}-ია, როგორც სინქრონულ answer_questions-ში
+        questions = list(questions)
+        self._admit(len(questions))
+        
+        async def answer_one(i, question):
+            try:
+                return await self._answer(question, max_tokens, filters)
+            except Exception as e:
+                logger.error(f"Batch question {i} failed: {e}")
+                return {'error': str(e)}
+        
+        try:
+            return await asyncio.gather(*(answer_one(i, question) for i, question in enumerate(questions)))
+        finally:
+            self._pending -= len(questions)
+    
+    async def aclose(self):
+        
+        self.executor.shutdown(wait=False)
+        await self.client.close()
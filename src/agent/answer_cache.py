@@ -0,0 +1,192 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticAnswerCache:
+    # პასუხების ქეში კითხვის ემბედინგით: უახლოესი მეზობელი similarity >= threshold
+    # და იგივე მოძიებული ჩანქები -> შენახული პასუხი LLM-ის გამოძახების გარეშე.
+    # ნომრით ძებნის კითხვებს ემბედინგი არ აქვს (embedding=None) - ისინი კითხვის ტექსტით ემთხვევა.
+    # SQLite-ში ინახება, ამიტომ გადატვირთვის შემდეგაც მუშაობს
+
+    def __init__(self, db_path="data/answer_cache.sqlite", threshold=0.95, ttl=24 * 3600, max_entries=2000):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            "id INTEGER PRIMARY KEY, question TEXT, embedding BLOB NOT NULL, chunk_ids TEXT NOT NULL, "
+            "answer TEXT NOT NULL, sources TEXT NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self.db.commit()
+
+        self._load()
+
+    def _load(self):
+        rows = self.db.execute(
+            "SELECT id, embedding, chunk_ids, created_at FROM answers WHERE length(embedding) > 0"
+        ).fetchall()
+
+        self._ids = [row[0] for row in rows]
+        self._chunk_ids = [row[2] for row in rows]
+        self._created = [row[3] for row in rows]
+        self._matrix = (
+            np.vstack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+            if rows else None
+        )
+
+    @staticmethod
+    def _normalize(embedding):
+        embedding = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else embedding
+
+    @staticmethod
+    def _chunk_key(chunk_ids):
+        return json.dumps(sorted(chunk_ids))
+
+    def check_version(self, index_version):
+        # კოლექცია შეიცვალა (ახალი build) - ძველი პასუხები აღარ არის ვალიდური
+        index_version = str(index_version)
+
+        with self._lock:
+            row = self.db.execute("SELECT value FROM meta WHERE name = 'index_version'").fetchone()
+
+            if row and row[0] == index_version:
+                return
+
+            if row:
+                logger.info(f"Collection changed ({row[0]} -> {index_version}), clearing answer cache")
+
+            self.db.execute("DELETE FROM answers")
+            self.db.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('index_version', ?)", (index_version,)
+            )
+            self.db.commit()
+            self._load()
+
+    def _hit(self, answer_id, now):
+        row = self.db.execute("SELECT answer, sources, question FROM answers WHERE id = ?", (answer_id,)).fetchone()
+        if not row:
+            return None
+
+        self.db.execute("UPDATE answers SET last_used = ? WHERE id = ?", (now, answer_id))
+        self.db.commit()
+        self.hits += 1
+
+        return {'answer': row[0], 'sources': json.loads(row[1]), 'cached_question': row[2]}
+
+    def _lookup_question(self, question, chunk_ids):
+        now = time.time()
+
+        with self._lock:
+            row = self.db.execute(
+                "SELECT id FROM answers WHERE question = ? AND chunk_ids = ? AND created_at >= ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (question, self._chunk_key(chunk_ids), now - self.ttl)
+            ).fetchone()
+
+            cached = self._hit(row[0], now) if row else None
+            if cached is None:
+                self.misses += 1
+                return None
+
+            cached['similarity'] = 1.0
+            return cached
+
+    def lookup(self, embedding, chunk_ids, question=None):
+        if embedding is None:
+            return self._lookup_question(question, chunk_ids)
+
+        with self._lock:
+            if self._matrix is None:
+                self.misses += 1
+                return None
+
+            similarities = self._matrix @ self._normalize(embedding)
+            chunk_key = self._chunk_key(chunk_ids)
+            now = time.time()
+
+            for i in np.argsort(-similarities):
+                if similarities[i] < self.threshold:
+                    break
+
+                if self._chunk_ids[i] != chunk_key or now - self._created[i] > self.ttl:
+                    continue
+
+                cached = self._hit(self._ids[i], now)
+                if cached is None:
+                    continue
+
+                cached['similarity'] = float(similarities[i])
+                return cached
+
+            self.misses += 1
+            return None
+
+    def put(self, question, embedding, chunk_ids, answer, sources):
+        now = time.time()
+
+        vector = self._normalize(embedding) if embedding is not None else None
+        chunk_key = self._chunk_key(chunk_ids)
+
+        with self._lock:
+            cursor = self.db.execute(
+                "INSERT INTO answers (question, embedding, chunk_ids, answer, sources, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    question,
+                    vector.tobytes() if vector is not None else b'',
+                    chunk_key,
+                    answer,
+                    json.dumps(sources, ensure_ascii=False),
+                    now,
+                    now
+                )
+            )
+
+            evicted = self.db.execute("DELETE FROM answers WHERE created_at < ?", (now - self.ttl,)).rowcount
+            evicted += self.db.execute(
+                "DELETE FROM answers WHERE id NOT IN "
+                "(SELECT id FROM answers ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,)
+            ).rowcount
+            self.db.commit()
+
+            # მატრიცა თავიდან მხოლოდ წაშლის შემდეგ იტვირთება, ჩვეულებრივ ახალი სტრიქონი ბოლოში ემატება
+            if evicted:
+                self._load()
+            elif vector is not None:
+                self._ids.append(cursor.lastrowid)
+                self._chunk_ids.append(chunk_key)
+                self._created.append(now)
+                self._matrix = vector[None, :] if self._matrix is None else np.vstack([self._matrix, vector])
+
+    def clear(self):
+        with self._lock:
+            self.db.execute("DELETE FROM answers")
+            self.db.commit()
+            self._load()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._ids),
+            'hit_rate': self.hits / total if total else 0.0
+        }
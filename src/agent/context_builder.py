@@ -0,0 +1,102 @@
+from src.processing.chunking import estimate_tokens
+
+
+def strip_overlap(previous, text, overlap=None, max_overlap=300, min_overlap=20):
+    # FixedWindowChunker-ის მეზობელი ჩანქები overlap სიმბოლოთი ფარავს ერთმანეთს -
+    # text-ის დასაწყისი, რომელიც previous-ის ბოლოს ემთხვევა, იჭრება.
+    # overlap ცნობილია (ინდექსის მეტადატიდან) - იჭრება ზუსტად იმდენი; 0 - chunker-ს გადაფარვა არ აქვს.
+    # უცნობისას - მხოლოდ min_overlap-ზე გრძელი დამთხვევა (მოკლე დამთხვევა შემთხვევითია: "foo bar" + "r baz")
+    if overlap is not None:
+        if overlap and previous.endswith(text[:overlap]):
+            return text[overlap:]
+        return text
+
+    for size in range(min(max_overlap, len(previous), len(text)), min_overlap - 1, -1):
+        if previous.endswith(text[:size]):
+            return text[size:]
+
+    return text
+
+
+def _truncate(text, token_budget):
+    words = text.split()
+    kept = []
+    used = 0
+
+    for word in words:
+        used += estimate_tokens(word)
+        if used > token_budget:
+            break
+        kept.append(word)
+
+    return ' '.join(kept) + ' ...'
+
+
+def build_context(results, token_budget=None, max_overlap=300, overlap=None):
+    # collection.query-ის შედეგიდან prompt-ის კონტექსტი: დუბლიკატები იშლება, ერთი დოკუმენტის
+    # მეზობელი ჩანქები ერთდება overlap-ის გარეშე, ჯამი token_budget-ს არ აჭარბებს.
+    # დოკუმენტები საუკეთესო ჩანქის რანგის მიხედვით ლაგდება
+    selected = []
+    seen_ids = set()
+    seen_texts = set()
+    used = 0
+
+    for chunk_id, document, metadata in zip(results['ids'][0], results['documents'][0], results['metadatas'][0]):
+        normalized = ' '.join(document.split())
+        if chunk_id in seen_ids or normalized in seen_texts:
+            continue
+
+        tokens = estimate_tokens(document)
+        if token_budget and used + tokens > token_budget:
+            if selected:
+                continue
+            # პირველი ჩანქიც კი არ ეტევა - შემოკლებული სახით მაინც მიდის
+            document = _truncate(document, token_budget)
+            tokens = token_budget
+
+        seen_ids.add(chunk_id)
+        seen_texts.add(normalized)
+        selected.append((document, metadata))
+        used += tokens
+
+    groups = {}
+    for document, metadata in selected:
+        key = metadata.get('source_path') or metadata['source']
+        groups.setdefault(key, []).append((metadata['chunk_id'], document, metadata))
+
+    parts = []
+    for i, chunks in enumerate(groups.values(), 1):
+        chunks.sort(key=lambda chunk: chunk[0])
+        metadata = chunks[0][2]
+
+        pieces = []
+        spans = []
+        previous_id = None
+        previous_text = None
+
+        for chunk_id, document, _ in chunks:
+            if previous_id is not None and chunk_id == previous_id + 1:
+                stripped = strip_overlap(previous_text, document, overlap, max_overlap)
+                pieces.append(stripped if stripped != document else ' ' + document)
+                spans[-1][1] = chunk_id
+            else:
+                if pieces:
+                    pieces.append("\n...\n")
+                pieces.append(document)
+                spans.append([chunk_id, chunk_id])
+
+            previous_id = chunk_id
+            previous_text = document
+
+        span_text = ', '.join(
+            f"{start + 1}" if start == end else f"{start + 1}-{end + 1}" for start, end in spans
+        )
+
+        parts.append(
+            f"\n--- დოკუმენტი {i} ---\n"
+            f"წყარო: {metadata['source']}\n"
+            f"ნაწილი: {span_text}/{metadata['total_chunks']}\n"
+            f"{''.join(pieces)}\n"
+        )
+
+    return ''.join(parts)
@@ -0,0 +1,138 @@
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    # ერთდროული query-encode მოთხოვნები window_ms-ის განმავლობაში გროვდება და
+    # ერთ batched encode-ად სრულდება; შედეგები თითოეულ მომთხოვნს Future-ით უბრუნდება
+
+    def __init__(self, encoder, window_ms=5, max_batch_size=64):
+        self.encoder = encoder
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.requests = 0
+        self.batches = 0
+        self.max_queue_depth = 0
+        self.batch_sizes = Counter()
+
+        self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, text):
+        future = Future()
+
+        # შემოწმება და რიგში ჩაყენება ერთად: close()-ის შემდეგ None-ის უკან არაფერი ხვდება
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("EmbeddingBatcher is closed")
+
+            self._queue.put((text, future))
+            self.requests += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+
+        return future
+
+    def encode(self, text, timeout=None):
+        return self.submit(text).result(timeout)
+
+    def _collect(self):
+        item = self._queue.get()
+        if item is None:
+            return None
+
+        batch = [item]
+        deadline = time.monotonic() + self.window
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+            if item is None:
+                self._queue.put(None)
+                break
+
+            batch.append(item)
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+
+            texts = [text for text, _ in batch]
+
+            try:
+                embeddings = self.encoder.encode(texts, batch_size=len(texts))
+            except Exception as e:
+                logger.error(f"Batched encode of {len(texts)} queries failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), embedding in zip(batch, embeddings):
+                future.set_result(embedding)
+
+            with self._lock:
+                self.batches += 1
+                self.batch_sizes[len(batch)] += 1
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+
+        self._worker.join(timeout=5)
+
+        # worker გაჩერდა (ან ვერ მოესწრო) - დარჩენილი მოთხოვნები შეცდომით სრულდება, რომ არავინ დაელოდოს უსასრულოდ
+        if not self._worker.is_alive():
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None and item[1].set_running_or_notify_cancel():
+                    item[1].set_exception(RuntimeError("EmbeddingBatcher is closed"))
+
+    def stats(self):
+        with self._lock:
+            # ჰისტოგრამა 2-ის ხარისხების მიხედვით: "1", "2", "3-4", "5-8", ...
+            histogram = Counter()
+            for size, count in self.batch_sizes.items():
+                upper = 1
+                while upper < size:
+                    upper *= 2
+                lower = upper // 2 + 1 if upper > 2 else upper
+                histogram[f"{lower}-{upper}" if lower != upper else str(upper)] += count
+
+            return {
+                'requests': self.requests,
+                'batches': self.batches,
+                'avg_batch_size': (
+                    sum(size * count for size, count in self.batch_sizes.items()) / self.batches
+                    if self.batches else 0.0
+                ),
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self.max_queue_depth,
+                'batch_size_histogram': dict(sorted(histogram.items(), key=lambda item: int(item[0].split('-')[0])))
+            }
@@ -0,0 +1,258 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from src.processing.chunking import estimate_tokens
+
+# Anthropic კლიენტის ლოკალური იმიტაცია (messages.create / messages.stream) ტესტებისა
+# და ბენჩმარკებისთვის - ქსელი და API key არ სჭირდება. ყველა მოთხოვნა requests-ში ინახება.
+# prompt caching-იც იმიტირდება: cache_control-მდე პრეფიქსი min_cacheable_tokens-ზე
+# მოკლე არ უნდა იყოს, პირველ ჯერზე cache_creation, შემდეგ cache_read ტოკენებად ითვლება.
+# stream_error_after=N - სტრიმი N ნაწილის შემდეგ stream_error-ით წყდება (კავშირის გაწყვეტის იმიტაცია)
+
+
+class FakeStreamError(RuntimeError):
+    pass
+
+
+def default_answer(request):
+    question = ""
+    for line in _prompt_text(request).splitlines():
+        if line.startswith("კითხვა:"):
+            question = line[len("კითხვა:"):].strip()
+
+    return f"ეს არის სატესტო პასუხი კითხვაზე: {question} [წყარო: fake]"
+
+
+def _blocks(request):
+    blocks = []
+
+    system = request.get('system')
+    if isinstance(system, str):
+        blocks.append({'type': 'text', 'text': system})
+    elif system:
+        blocks.extend(system)
+
+    for message in request.get('messages', []):
+        content = message['content']
+        if isinstance(content, str):
+            blocks.append({'type': 'text', 'text': content})
+        else:
+            blocks.extend(content)
+
+    return blocks
+
+
+def _prompt_text(request):
+    return "\n".join(block.get('text', '') for block in _blocks(request))
+
+
+def _message(text, request, output_tokens, cache=(0, 0)):
+    cache_creation, cache_read = cache
+    return SimpleNamespace(
+        id="msg_fake",
+        type="message",
+        role="assistant",
+        model=request.get('model'),
+        content=[SimpleNamespace(type="text", text=text)],
+        stop_reason="end_turn",
+        usage=SimpleNamespace(
+            input_tokens=estimate_tokens(_prompt_text(request)) - cache_creation - cache_read,
+            output_tokens=output_tokens,
+            cache_creation_input_tokens=cache_creation,
+            cache_read_input_tokens=cache_read
+        )
+    )
+
+
+class FakeMessageStream:
+
+    def __init__(self, client, request, cache=(0, 0)):
+        self.client = client
+        self.request = request
+        self.cache = cache
+        self.deltas = client.split_deltas(client.answer_fn(request))
+        self._final = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        time.sleep(self.client.first_token_delay)
+
+        for i, delta in enumerate(self.deltas):
+            self.client.check_stream(i)
+            if i:
+                time.sleep(self.client.token_delay)
+            yield delta
+
+        self._final = _message(''.join(self.deltas), self.request, len(self.deltas), self.cache)
+
+    def get_final_message(self):
+        if self._final is None:
+            for _ in self.text_stream:
+                pass
+        return self._final
+
+
+class FakeMessages:
+
+    def __init__(self, client):
+        self.client = client
+
+    def create(self, **request):
+        cache = self.client.record(request)
+        deltas = self.client.split_deltas(self.client.answer_fn(request))
+        time.sleep(self.client.first_token_delay + self.client.token_delay * max(len(deltas) - 1, 0))
+        return _message(''.join(deltas), request, len(deltas), cache)
+
+    def stream(self, **request):
+        cache = self.client.record(request)
+        return FakeMessageStream(self.client, request, cache)
+
+
+class FakeAnthropic:
+
+    def __init__(self, answer_fn=default_answer, first_token_delay=0.0, token_delay=0.0,
+                 min_cacheable_tokens=1024, require_cache_control=False, stream_error_after=None, stream_error=None):
+        self.answer_fn = answer_fn
+        self.stream_error_after = stream_error_after
+        self.stream_error = stream_error
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.min_cacheable_tokens = min_cacheable_tokens
+        self.require_cache_control = require_cache_control
+        self.requests = []
+        self._cached_prefixes = set()
+        self._lock = threading.Lock()
+        self.messages = FakeMessages(self)
+
+    def validate(self, request):
+        if 'model' not in request or 'max_tokens' not in request or not request.get('messages'):
+            raise ValueError(f"Invalid messages request: {sorted(request)}")
+
+        system = request.get('system')
+        if system is not None and not isinstance(system, (str, list)):
+            raise ValueError(f"system must be a string or a list of blocks, got {type(system).__name__}")
+
+        for message in request['messages']:
+            if message.get('role') not in ('user', 'assistant'):
+                raise ValueError(f"Invalid message role: {message.get('role')}")
+
+        blocks = _blocks(request)
+        breakpoints = [i for i, block in enumerate(blocks) if block.get('cache_control')]
+
+        for block in blocks:
+            if block.get('type') != 'text' or not isinstance(block.get('text'), str):
+                raise ValueError(f"Invalid content block: {block}")
+            if block.get('cache_control') and block['cache_control'].get('type') != 'ephemeral':
+                raise ValueError(f"Unsupported cache_control: {block['cache_control']}")
+
+        if len(breakpoints) > 4:
+            raise ValueError(f"At most 4 cache_control blocks are allowed, got {len(breakpoints)}")
+        if self.require_cache_control and not breakpoints:
+            raise ValueError("Request has no cache_control breakpoint")
+
+        return blocks, breakpoints
+
+    def record(self, request):
+        # აბრუნებს (cache_creation_input_tokens, cache_read_input_tokens)
+        blocks, breakpoints = self.validate(request)
+        cache = (0, 0)
+
+        with self._lock:
+            self.requests.append(request)
+
+            if breakpoints:
+                prefix = "\n".join(block['text'] for block in blocks[:breakpoints[-1] + 1])
+                prefix_tokens = estimate_tokens(prefix)
+
+                # მინიმალურზე მოკლე პრეფიქსი, როგორც API-ში, უბრალოდ არ ქეშირდება
+                if prefix_tokens >= self.min_cacheable_tokens:
+                    key = (request['model'], prefix)
+                    if key in self._cached_prefixes:
+                        cache = (0, prefix_tokens)
+                    else:
+                        self._cached_prefixes.add(key)
+                        cache = (prefix_tokens, 0)
+
+        return cache
+
+    def check_stream(self, position):
+        if self.stream_error_after is not None and position >= self.stream_error_after:
+            raise self.stream_error or FakeStreamError(f"Stream interrupted after {position} deltas")
+
+    @staticmethod
+    def split_deltas(text):
+        # სიტყვა-სიტყვით, როგორც რეალური text_delta მოვლენები
+        words = text.split(' ')
+        return [word if i == 0 else ' ' + word for i, word in enumerate(words)]
+
+
+class FakeAsyncMessageStream:
+
+    def __init__(self, client, request, cache=(0, 0)):
+        self.client = client
+        self.request = request
+        self.cache = cache
+        self.deltas = client.split_deltas(client.answer_fn(request))
+        self._final = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    async def text_stream(self):
+        await asyncio.sleep(self.client.first_token_delay)
+
+        for i, delta in enumerate(self.deltas):
+            self.client.check_stream(i)
+            if i:
+                await asyncio.sleep(self.client.token_delay)
+            yield delta
+
+        self._final = _message(''.join(self.deltas), self.request, len(self.deltas), self.cache)
+
+    async def get_final_message(self):
+        if self._final is None:
+            async for _ in self.text_stream:
+                pass
+        return self._final
+
+
+class FakeAsyncMessages:
+
+    def __init__(self, client):
+        self.client = client
+
+    async def create(self, **request):
+        cache = self.client.record(request)
+        deltas = self.client.split_deltas(self.client.answer_fn(request))
+        await asyncio.sleep(self.client.first_token_delay + self.client.token_delay * max(len(deltas) - 1, 0))
+        return _message(''.join(deltas), request, len(deltas), cache)
+
+    def stream(self, **request):
+        cache = self.client.record(request)
+        return FakeAsyncMessageStream(self.client, request, cache)
+
+
+class FakeAsyncAnthropic(FakeAnthropic):
+
+    def __init__(self, answer_fn=default_answer, first_token_delay=0.0, token_delay=0.0,
+                 min_cacheable_tokens=1024, require_cache_control=False, stream_error_after=None, stream_error=None):
+        super().__init__(
+            answer_fn, first_token_delay, token_delay, min_cacheable_tokens, require_cache_control,
+            stream_error_after, stream_error
+        )
+        self.messages = FakeAsyncMessages(self)
+
+    async def close(self):
+        pass
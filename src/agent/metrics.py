@@ -0,0 +1,225 @@
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# წამებში; LLM-ის გამოძახებები რამდენიმე წამი გრძელდება, retrieval - მილიწამები
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Trace:
+    # ერთი კითხვის დამუშავება: ეტაპების ხანგრძლივობა (span-ები), ტოკენები და ატრიბუტები
+
+    def __init__(self, name="answer"):
+        self.name = name
+        self.started = time.perf_counter()
+        self.spans = {}
+        self.attributes = {}
+        self.duration = None
+
+    @contextmanager
+    def span(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            # ერთი და იგივე ეტაპი რამდენჯერმე - დრო ჯამდება
+            self.spans[name] = self.spans.get(name, 0.0) + time.perf_counter() - started
+
+    def add_span(self, name, seconds):
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def finish(self):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self.started
+        return self
+
+    def timings_ms(self):
+        timings = {name: round(seconds * 1000, 1) for name, seconds in self.spans.items()}
+        if self.duration is not None:
+            timings['total'] = round(self.duration * 1000, 1)
+        return timings
+
+
+class TraceHook:
+    # ჰუკის ინტერფეისი: MetricsRegistry.add_hook-ით ემატება, on_trace ყოველი
+    # დასრულებული Trace-ისთვის გამოიძახება (მაგ. OpenTelemetry-ში ან ლოგში გადასაგზავნად)
+
+    def on_trace(self, trace):
+        # ნაგულისხმევად არაფერს აკეთებს - ქვეკლასი მხოლოდ საჭირო მეთოდს გადაფარავს
+        pass
+
+
+class LoggingHook(TraceHook):
+
+    def __init__(self, level=logging.INFO):
+        self.level = level
+
+    def on_trace(self, trace):
+        spans = ', '.join(f"{name}={ms}ms" for name, ms in trace.timings_ms().items())
+        logger.log(self.level, f"{trace.name}: {spans} {trace.attributes}")
+
+
+class Histogram:
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class MetricsRegistry:
+    # Trace-ებიდან დაგროვილი მეტრიკები: ეტაპების ჰისტოგრამები, ტოკენების და მოთხოვნების მრიცხველები.
+    # gauge-ები (მაგ. ქეშების hit rate) collector-ებიდან render-ის დროს იკითხება
+
+    def __init__(self, prefix="rag", buckets=DEFAULT_BUCKETS):
+        self.prefix = prefix
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._hooks = []
+        self._collectors = []
+        self.stage_seconds = defaultdict(lambda: Histogram(self.buckets))
+        self.counters = defaultdict(float)
+
+    def add_hook(self, hook):
+        self._hooks.append(hook)
+
+    def add_collector(self, collector):
+        # collector() -> {metric_name: value} ან {metric_name: {label_value: value}}
+        self._collectors.append(collector)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] += value
+
+    def record(self, trace):
+        trace.finish()
+
+        with self._lock:
+            for name, seconds in trace.spans.items():
+                self.stage_seconds[name].observe(seconds)
+            self.stage_seconds['total'].observe(trace.duration)
+
+        self.inc('requests_total', cached=str(bool(trace.attributes.get('cached'))).lower())
+
+        for kind, count in (trace.attributes.get('usage') or {}).items():
+            if count:
+                self.inc('tokens_total', count, type=kind)
+
+        for hook in self._hooks:
+            try:
+                hook.on_trace(trace)
+            except Exception as e:
+                logger.warning(f"Trace hook {type(hook).__name__} failed: {e}")
+
+    def render(self):
+        # Prometheus text exposition format (0.0.4)
+        lines = []
+        stage_metric = f"{self.prefix}_stage_seconds"
+
+        with self._lock:
+            lines.append(f"# HELP {stage_metric} Time spent per pipeline stage")
+            lines.append(f"# TYPE {stage_metric} histogram")
+            for stage, histogram in sorted(self.stage_seconds.items()):
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'{stage_metric}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{stage_metric}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{stage_metric}_sum{{stage="{stage}"}} {histogram.total}')
+                lines.append(f'{stage_metric}_count{{stage="{stage}"}} {histogram.count}')
+
+            declared = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = f"{self.prefix}_{name}"
+                if metric not in declared:
+                    lines.append(f"# TYPE {metric} counter")
+                    declared.add(metric)
+                lines.append(f"{metric}{self._labels(labels)} {value:g}")
+
+        for collector in self._collectors:
+            try:
+                values = collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+                continue
+
+            for name, value in values.items():
+                metric = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {metric} gauge")
+                if isinstance(value, dict):
+                    for label, item in value.items():
+                        lines.append(f'{metric}{{name="{label}"}} {item:g}')
+                else:
+                    lines.append(f"{metric} {value:g}")
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(labels):
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+class PrometheusExporter:
+    # /metrics HTTP endpoint (serve) ან textfile collector-ისთვის ფაილი (write_file)
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.server = None
+
+    def write_file(self, path):
+        # ატომური ჩაწერა, რომ node_exporter-მა ნახევრად ჩაწერილი ფაილი არ წაიკითხოს
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(path.name + ".tmp")
+        temp.write_text(self.registry.render(), encoding='utf-8')
+        os.replace(temp, path)
+
+    def serve(self, port=9108, host="0.0.0.0"):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path.split('?')[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self.server.serve_forever, name="metrics-exporter", daemon=True).start()
+        logger.info(f"Metrics endpoint: http://{host}:{self.server.server_port}/metrics")
+        return self.server
+
+    def close(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,56 @@
+import threading
+from collections import OrderedDict
+
+from src.processing.embedding_cache import normalize_text
+
+
+class QueryEmbeddingCache:
+    # პროცესის შიგნით LRU: ნორმალიზებული კითხვა -> ემბედინგი
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query):
+        return normalize_text(query)
+
+    def get(self, query):
+        key = self.key(query)
+
+        with self._lock:
+            embedding = self._entries.get(key)
+
+            if embedding is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, query, embedding):
+        key = self.key(query)
+
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / total if total else 0.0
+        }
@@ -0,0 +1,31 @@
+import threading
+import time
+
+
+class RateLimiter:
+    # token bucket: საშუალოდ requests_per_minute მოთხოვნა წუთში, burst-მდე ერთბაშად.
+    # acquire() ბლოკავს, სანამ ახალი მოთხოვნის გაგზავნა შეიძლება (thread-safe)
+
+    def __init__(self, requests_per_minute, burst=None):
+        self.rate = requests_per_minute / 60
+        self.capacity = burst or max(1, int(self.rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+                self.waited += wait
+
+            time.sleep(wait)
@@ -0,0 +1,133 @@
+import logging
+import time
+
+from sentence_transformers import CrossEncoder
+
+from src.processing.chunking import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+def slice_results(results, order, scores=None):
+    # collection.query-ის ფორმატის შედეგიდან order-ის ინდექსების ამორჩევა
+    sliced = {
+        key: [[results[key][0][i] for i in order]]
+        for key in ('ids', 'documents', 'metadatas', 'distances')
+        if results.get(key)
+    }
+    if scores is not None:
+        sliced['rerank_scores'] = [[scores.get(i) for i in order]]
+
+    return sliced
+
+
+class CrossEncoderReranker:
+    # მეორე ეტაპი: retrieve_context-ის (vector + BM25) over-fetch-ით მიღებული კანდიდატები
+    # cross-encoder-ით ფასდება batch-ებად CPU-ზე. პირველი ეტაპის რიგით მიდის, ამიტომ
+    # max_latency_ms-ის ამოწურვისას შეუფასებელი კანდიდატები საწყისი რიგით რჩება ბოლოში
+
+    def __init__(self, model_name="cross-encoder/mmarco-mMiniLMv2-L12-H384-v1", batch_size=16,
+                 max_latency_ms=300, max_length=256, device="cpu", model=None, min_batch=2):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        # ყოველ გამოძახებაზე მინიმუმ ამდენი წყვილი ფასდება, რომ pair_seconds-ის შეფასება განახლდეს
+        self.min_batch = min_batch
+        self.max_latency = max_latency_ms / 1000 if max_latency_ms else None
+        self.model = model or CrossEncoder(model_name, max_length=max_length, device=device)
+
+        self.calls = 0
+        self.scored = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+        # ერთი წყვილის შეფასების საშუალო დრო (წამი) - batch-ის ზომა ლიმიტის დარჩენილ დროზე ითვლება
+        self.pair_seconds = None
+
+    def _measure(self, pairs, seconds):
+        cost = seconds / pairs
+        self.pair_seconds = cost if self.pair_seconds is None else 0.8 * self.pair_seconds + 0.2 * cost
+
+    def warmup(self):
+        pairs = [("საგადასახადო კოდექსი", "დამატებული ღირებულების გადასახადი")] * self.min_batch
+
+        # პირველი გამოძახება (ინიციალიზაცია, მეხსიერების გამოყოფა) არ იზომება - მხოლოდ მეორე
+        self.model.predict(pairs[:1])
+        started = time.perf_counter()
+        self.model.predict(pairs, batch_size=len(pairs))
+        self._measure(len(pairs), time.perf_counter() - started)
+
+    def score(self, query, documents):
+        # [(ინდექსი, ქულა), ...] - ლიმიტის ამოწურვამდე შეფასებული კანდიდატები
+        started = time.perf_counter()
+        scores = []
+
+        start = 0
+
+        while start < len(documents):
+            size = self.batch_size
+
+            # პირველი batch-იც: რამდენი წყვილი ეტევა დარჩენილ დროში (გაზომვამდე - სრული batch).
+            # პირველი batch min_batch-ზე ნაკლები არ არის - ცუდი შეფასება re-ranking-ს სამუდამოდ არ თიშავს
+            if self.max_latency:
+                remaining = self.max_latency - (time.perf_counter() - started)
+                if self.pair_seconds:
+                    size = min(size, int(remaining / self.pair_seconds))
+                if not scores:
+                    size = max(size, self.min_batch)
+
+                if scores and (remaining <= 0 or size <= 0):
+                    self.timeouts += 1
+                    logger.warning(
+                        f"Re-rank latency cap hit after {len(scores)}/{len(documents)} candidates"
+                    )
+                    break
+
+            batch = documents[start:start + size]
+            batch_started = time.perf_counter()
+            predicted = self.model.predict([(query, document) for document in batch], batch_size=len(batch))
+            self._measure(len(batch), time.perf_counter() - batch_started)
+
+            scores.extend(zip(range(start, start + len(batch)), (float(value) for value in predicted)))
+            start += len(batch)
+
+        elapsed = time.perf_counter() - started
+        self.calls += 1
+        self.scored += len(scores)
+        self.total_seconds += elapsed
+
+        return scores
+
+    def rerank(self, query, results, top_k=5, token_budget=None):
+        documents = results['documents'][0]
+        if not documents:
+            return results
+
+        scored = self.score(query, documents)
+        scores = dict(scored)
+
+        order = [i for i, _ in sorted(scored, key=lambda item: item[1], reverse=True)]
+        order.extend(i for i in range(len(documents)) if i not in scores)
+
+        # top_k, თან token_budget-ში უნდა ჩაეტიოს (პირველი ჩანქი ყოველთვის რჩება)
+        kept = []
+        used = 0
+        for i in order:
+            if len(kept) >= top_k:
+                break
+
+            tokens = estimate_tokens(documents[i])
+            if token_budget and kept and used + tokens > token_budget:
+                continue
+
+            kept.append(i)
+            used += tokens
+
+        return slice_results(results, kept, scores)
+
+    def stats(self):
+        return {
+            'calls': self.calls,
+            'scored': self.scored,
+            'timeouts': self.timeouts,
+            'pair_ms': self.pair_seconds * 1000 if self.pair_seconds else None,
+            'avg_ms': self.total_seconds / self.calls * 1000 if self.calls else 0.0
+        }
@@ -0,0 +1,255 @@
+import math
+import re
+
+# დავების გადაწყვეტილებების ტიპური სათაურები (ხაზის დასაწყისში, ხშირად ':'-ით)
+SECTION_HEADINGS = [
+    "დავის საგანი",
+    "გასაჩივრებული გადაწყვეტილება",
+    "გასაჩივრებული აქტი",
+    "დარიცხული თანხა",
+    "პროცედურული გარემოებები",
+    "საქმის გარემოებები",
+    "დადგენილი გარემოებები",
+    "მომჩივნის პოზიცია",
+    "მომჩივნის მოთხოვნა",
+    "მომჩივნის არგუმენტები",
+    "მოპასუხის პოზიცია",
+    "საბჭოს მოტივაცია",
+    "საბჭოს დასაბუთება",
+    "სამოტივაციო ნაწილი",
+    "სარეზოლუციო ნაწილი",
+    "სამართლებრივი საფუძველი",
+    "დასკვნა",
+    "გადაწყვიტა",
+    "ბრძანება",
+]
+
+HEADING_RE = re.compile(
+    r'^[ \t]*(?P<heading>' + '|'.join(re.escape(h) for h in SECTION_HEADINGS) + r')[ \t]*(?::|$)',
+    re.MULTILINE
+)
+# "1.", "1.2)", "მუხლი 5", "- " - ნუმერირებული პუნქტები ახალ ერთეულს იწყებს
+CLAUSE_RE = re.compile(r'^\s*(?:\d+(?:\.\d+)*[.)]\s|მუხლი\s+\d+|[-•]\s)', re.MULTILINE)
+SENTENCE_END_RE = re.compile(r'[.!?;](?=\s)')
+# "1." ან "გ." ტიპის აბრევიატურები წინადადებას არ ამთავრებს
+ABBREVIATION_RE = re.compile(r'(?:^|\s)(?:\d{1,3}|[ა-ჰ]|ს/ნ|პ/ნ|შპს|სს|მუხ|პუნქ|ქ)\.$')
+WORD_RE = re.compile(r'\w+|[^\w\s]')
+
+
+class TokenCounter:
+    # tokenizer-ის (მაგ. SentenceTransformer.tokenizer) არსებობისას ზუსტი რაოდენობა,
+    # თორემ შეფასება: ~4 სიმბოლო ერთ ტოკენზე სიტყვაში + პუნქტუაცია
+
+    def __init__(self, tokenizer=None):
+        self.tokenizer = tokenizer
+
+    def count_many(self, texts):
+        if not texts:
+            return []
+
+        if self.tokenizer is not None:
+            encoded = self.tokenizer(list(texts), add_special_tokens=False)['input_ids']
+            return [len(ids) for ids in encoded]
+
+        return [estimate_tokens(text) for text in texts]
+
+    def count(self, text):
+        return self.count_many([text])[0]
+
+
+def estimate_tokens(text):
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in WORD_RE.findall(text))
+
+
+def sentence_boundaries(text):
+    # წინადადებების დასასრულების პოზიციები (ერთხელ ითვლება დოკუმენტზე)
+    boundaries = []
+
+    for match in SENTENCE_END_RE.finditer(text):
+        end = match.end()
+        line_start = text.rfind('\n', 0, end) + 1
+        if ABBREVIATION_RE.search(text[max(line_start, end - 8):end]):
+            continue
+        boundaries.append(end)
+
+    for match in CLAUSE_RE.finditer(text):
+        if match.start() > 0:
+            boundaries.append(match.start())
+
+    if not boundaries or boundaries[-1] != len(text):
+        boundaries.append(len(text))
+
+    return sorted(set(boundaries))
+
+
+class FixedWindowChunker:
+    name = "fixed"
+
+    def __init__(self, chunk_size=500, overlap=100):
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+
+    @property
+    def signature(self):
+        return f"fixed:{self.chunk_size}:{self.overlap}"
+
+    def chunk(self, text):
+
+        chunks = []
+        start = 0
+
+        while start < len(text):
+            end = start + self.chunk_size
+            chunk = text[start:end]
+
+            if chunk.strip():
+                chunks.append(chunk)
+
+            start += self.chunk_size - self.overlap
+
+        return chunks
+
+
+class LegalStructureChunker:
+    # სექცია (სათაური) -> წინადადებები/პუნქტები -> ჩანქები max_tokens-მდე,
+    # გადაფარვის გარეშე. სექციის სათაური თითოეულ ჩანქს წინ ერთვის
+
+    name = "legal"
+
+    def __init__(self, max_tokens=192, min_tokens=32, token_counter=None):
+        self.max_tokens = max_tokens
+        self.min_tokens = min_tokens
+        self.token_counter = token_counter or TokenCounter()
+
+    @property
+    def signature(self):
+        tokenizer = "tokenizer" if self.token_counter.tokenizer is not None else "estimate"
+        return f"legal:{self.max_tokens}:{self.min_tokens}:{tokenizer}"
+
+    @staticmethod
+    def _clean(text):
+        return ' '.join(text.split())
+
+    def split_sections(self, text):
+        sections = []
+        heading = None
+        start = 0
+
+        for match in HEADING_RE.finditer(text):
+            body = text[start:match.start()]
+            if body.strip() or heading:
+                sections.append((heading, body))
+            heading = match.group('heading')
+            start = match.end()
+
+        sections.append((heading, text[start:]))
+        return sections
+
+    def split_units(self, body):
+        units = []
+        start = 0
+
+        for end in sentence_boundaries(body):
+            unit = self._clean(body[start:end])
+            if unit:
+                units.append(unit)
+            start = end
+
+        return units
+
+    def _split_long_unit(self, unit, tokens, budget):
+        # წინადადება ლიმიტზე გრძელია - სიტყვების მიხედვით იყოფა
+        words = unit.split()
+        parts = max(2, math.ceil(tokens / budget))
+        size = math.ceil(len(words) / parts)
+        return [' '.join(words[i:i + size]) for i in range(0, len(words), size)]
+
+    def _pack_section(self, heading, units):
+        prefix = f"{heading}: " if heading else ""
+        prefix_tokens = self.token_counter.count(prefix) if prefix else 0
+        budget = max(self.max_tokens - prefix_tokens, self.max_tokens // 2)
+
+        expanded = []
+        for unit, tokens in zip(units, self.token_counter.count_many(units)):
+            if tokens > budget:
+                pieces = self._split_long_unit(unit, tokens, budget)
+                expanded.extend(zip(pieces, self.token_counter.count_many(pieces)))
+            else:
+                expanded.append((unit, tokens))
+
+        packed = []
+        current = []
+        current_tokens = 0
+
+        for unit, tokens in expanded:
+            if current and current_tokens + tokens > budget:
+                packed.append((current, current_tokens))
+                current = []
+                current_tokens = 0
+
+            current.append(unit)
+            current_tokens += tokens
+
+        if current:
+            # პატარა ბოლო ნაწილი წინა ჩანქს ერწყმის, თუ ლიმიტი იძლევა
+            if packed and current_tokens < self.min_tokens and packed[-1][1] + current_tokens <= budget:
+                previous, previous_tokens = packed.pop()
+                current = previous + current
+                current_tokens += previous_tokens
+            packed.append((current, current_tokens))
+
+        return [(prefix + ' '.join(part), prefix_tokens + tokens) for part, tokens in packed]
+
+    def chunk(self, text):
+        chunks = []
+        carry = None
+
+        for heading, body in self.split_sections(text):
+            units = self.split_units(body)
+            if not units:
+                units = [heading] if heading else []
+                heading = None
+
+            section_chunks = self._pack_section(heading, units)
+            if not section_chunks:
+                continue
+
+            # ძალიან მოკლე სექცია (მაგ. მხოლოდ ნომერი და თარიღი) მეზობელ ჩანქს უერთდება
+            if carry:
+                first, first_tokens = section_chunks[0]
+                if carry[1] + first_tokens <= self.max_tokens:
+                    section_chunks[0] = (carry[0] + ' ' + first, carry[1] + first_tokens)
+                else:
+                    chunks.append(carry)
+                carry = None
+
+            if len(section_chunks) == 1 and section_chunks[0][1] < self.min_tokens:
+                if chunks and chunks[-1][1] + section_chunks[0][1] <= self.max_tokens:
+                    previous, previous_tokens = chunks.pop()
+                    chunks.append((previous + ' ' + section_chunks[0][0], previous_tokens + section_chunks[0][1]))
+                else:
+                    carry = section_chunks[0]
+                continue
+
+            chunks.extend(section_chunks)
+
+        if carry:
+            chunks.append(carry)
+
+        return [chunk for chunk, _ in chunks]
+
+
+CHUNKERS = {
+    FixedWindowChunker.name: FixedWindowChunker,
+    LegalStructureChunker.name: LegalStructureChunker,
+}
+
+
+def get_chunker(chunker="legal", **kwargs):
+    if not isinstance(chunker, str):
+        return chunker
+
+    if chunker not in CHUNKERS:
+        raise ValueError(f"Unknown chunker '{chunker}', expected one of: {', '.join(CHUNKERS)}")
+
+    return CHUNKERS[chunker](**kwargs)
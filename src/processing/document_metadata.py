@@ -0,0 +1,145 @@
+import json
+import logging
+import re
+from datetime import date
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+GEORGIAN_MONTHS = {
+    "იანვარი": 1,
+    "თებერვალი": 2,
+    "მარტი": 3,
+    "აპრილი": 4,
+    "მაისი": 5,
+    "ივნისი": 6,
+    "ივლისი": 7,
+    "აგვისტო": 8,
+    "სექტემბერი": 9,
+    "ოქტომბერი": 10,
+    "ნოემბერი": 11,
+    "დეკემბერი": 12,
+}
+
+DATE_RE = re.compile(r'(\d{1,2})\s+([ა-ჰ]+)\s+(\d{4})')
+
+# InfoHub-ის ბარათის სათაური ერთ ხაზად მოდის:
+# "დოკუმენტის #:25852/2/2025სტატუსი:მოქმედიდოკუმენტის ტიპი:...მიღების თარიღი:10 თებერვალი 2026გადაწყვეტილება №25852/2/2025"
+TITLE_RE = re.compile(
+    r'დოკუმენტის #:\s*(?P<decision_number>.*?)\s*'
+    r'სტატუსი:\s*(?P<status>.*?)\s*'
+    r'დოკუმენტის ტიპი:\s*(?P<doc_type>.*?)\s*'
+    r'მიღების თარიღი:\s*(?P<date>\d{1,2}\s+[ა-ჰ]+\s+\d{4})\s*'
+    r'(?P<name>.*)$',
+    re.DOTALL
+)
+
+
+def parse_georgian_date(text):
+    # "10 თებერვალი 2026" -> date(2026, 2, 10)
+    if not text:
+        return None
+
+    match = DATE_RE.search(text)
+    if not match:
+        return None
+
+    month = GEORGIAN_MONTHS.get(match.group(2))
+    if not month:
+        return None
+
+    try:
+        return date(int(match.group(3)), month, int(match.group(1)))
+    except ValueError:
+        return None
+
+
+def parse_title(title):
+    match = TITLE_RE.search(title or "")
+    if not match:
+        return {}
+
+    return {key: value.strip() for key, value in match.groupdict().items() if value and value.strip()}
+
+
+def document_fields(entry):
+    # metadata.json-ის ჩანაწერიდან Chroma-ს ტიპიზებული ველები. Chroma None-ს არ იღებს,
+    # ამიტომ უცნობი ველი საერთოდ არ ემატება
+    parsed = parse_title(entry.get('title'))
+    fields = {}
+
+    decision_number = parsed.get('decision_number') or entry.get('doc_number')
+    if decision_number:
+        fields['decision_number'] = decision_number.replace('N ', '').strip()
+
+    if parsed.get('status'):
+        fields['status'] = parsed['status']
+    if parsed.get('doc_type'):
+        fields['doc_type'] = parsed['doc_type']
+    if parsed.get('name'):
+        fields['title'] = parsed['name']
+
+    issued = parse_georgian_date(parsed.get('date') or entry.get('date'))
+    if issued:
+        # ISO სტრიქონი საჩვენებლად, მთელი რიცხვი $gte/$lte ფილტრებისთვის
+        fields['date'] = issued.isoformat()
+        fields['date_int'] = int(issued.strftime('%Y%m%d'))
+
+    return fields
+
+
+def load_document_fields(metadata_file="data/raw/metadata.json"):
+    # ფაილის სახელი -> ველები (pdf_path სხვა მანქანის აბსოლუტური გზა შეიძლება იყოს)
+    metadata_file = Path(metadata_file)
+
+    if not metadata_file.exists():
+        logger.warning(f"{metadata_file} not found, documents will be indexed without attributes")
+        return {}
+
+    with open(metadata_file, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    fields = {}
+    for entry in entries:
+        if entry.get('pdf_path'):
+            fields[Path(entry['pdf_path']).name] = document_fields(entry)
+
+    return fields
+
+
+def _date_int(value):
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return int(value.strftime('%Y%m%d'))
+
+
+def build_where(filters):
+    # {'doc_type': ..., 'status': ..., 'decision_number': ..., 'date_from': ..., 'date_to': ...}
+    # -> Chroma where. სიის მნიშვნელობა $in-ად გადაიქცევა
+    if not filters:
+        return None
+
+    conditions = []
+
+    for key, value in filters.items():
+        if value is None:
+            continue
+
+        if key == 'date_from':
+            conditions.append({'date_int': {'$gte': _date_int(value)}})
+        elif key == 'date_to':
+            conditions.append({'date_int': {'$lte': _date_int(value)}})
+        elif key in ('doc_type', 'status', 'decision_number', 'source'):
+            if isinstance(value, (list, tuple, set)):
+                conditions.append({key: {'$in': list(value)}})
+            else:
+                conditions.append({key: value})
+        else:
+            raise ValueError(f"Unknown filter '{key}'")
+
+    if not conditions:
+        return None
+
+    return conditions[0] if len(conditions) == 1 else {'$and': conditions}
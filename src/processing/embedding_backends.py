@@ -0,0 +1,165 @@
+import json
+import logging
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+# ემბედინგის მოდელი ერთ ადგილას: ინდექსის აწყობაც (EmbeddingsBuilder) და ძებნაც (GeorgianTaxRAGAgent) ამას იყენებს
+DEFAULT_MODEL = 'paraphrase-multilingual-mpnet-base-v2'
+
+# RAG_EMBEDDING_BACKEND=onnx-int8 -> ყველგან, სადაც backend პირდაპირ არ არის მითითებული
+DEFAULT_BACKEND = os.getenv("RAG_EMBEDDING_BACKEND", "torch")
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# fidelity check-ის ნიმუში: ტიპური კითხვები და დოკუმენტების ფრაგმენტები
+FIDELITY_SAMPLE = [
+    "რა არის დღგ?",
+    "როგორ ხდება დავების განხილვა?",
+    "რა არის საგადასახადო შემოწმება?",
+    "როგორ უნდა გავასაჩივრო გადაწყვეტილება?",
+    "გადაწყვეტილება №25852/2/2025",
+    "საქართველოს საგადასახადო კოდექსის 168-ე მუხლის პირველი ნაწილის თანახმად, დღგ-ით არ იბეგრება",
+    "დავების განხილვის საბჭომ განიხილა მომჩივნის საჩივარი და მიიჩნია, რომ საჩივარი არ უნდა დაკმაყოფილდეს",
+    "საბაჟო დეკლარაციის წარდგენის ვადის დარღვევისთვის პირს ეკისრება ჯარიმა",
+    "საგადასახადო ორგანოს მიერ გამოცემული საგადასახადო მოთხოვნა ძალაში დარჩა",
+    "ქონების გადასახადის გადახდის ვალდებულება წარმოიშობა საკუთრების უფლების რეგისტრაციის მომენტიდან",
+]
+
+
+def cache_name(model_name, backend):
+    # ემბედინგის ქეშში სხვადასხვა backend-ის ვექტორები ერთმანეთში არ უნდა აირიოს
+    return model_name if backend == "torch" else f"{model_name}@{backend}"
+
+
+def _export_dir(model_name, export_dir):
+    return Path(export_dir) / re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+
+
+def _onnx_kwargs(threads):
+    if not threads:
+        return {}
+
+    import onnxruntime
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = threads
+    options.inter_op_num_threads = 1
+    return {"session_options": options}
+
+
+def _load_int8(model_name, export_dir, quantization_config, threads=None):
+    from sentence_transformers import export_dynamic_quantized_onnx_model
+
+    target = _export_dir(model_name, export_dir)
+    file_name = f"onnx/model_qint8_{quantization_config}.onnx"
+
+    # ექსპორტი და კვანტიზაცია ერთხელ ხდება, შემდეგ ფაილიდან იტვირთება
+    if not (target / file_name).exists():
+        logger.info(f"ONNX int8 ექსპორტი: {model_name} -> {target}")
+        model = SentenceTransformer(model_name, backend="onnx", device="cpu")
+        model.save_pretrained(str(target))
+        export_dynamic_quantized_onnx_model(model, quantization_config, str(target))
+
+    return SentenceTransformer(str(target), backend="onnx", device="cpu", model_kwargs={"file_name": file_name, **_onnx_kwargs(threads)})
+
+
+def load_model(model_name=DEFAULT_MODEL, backend=None, device=None, export_dir="data/models",
+               quantization_config="avx2", threads=None):
+    # ყველა backend აბრუნებს SentenceTransformer-ს - encode/tokenizer/max_seq_length ერთნაირია.
+    # threads - ONNX Runtime-ის intra-op ნაკადები (torch-ისთვის torch.set_num_threads)
+    backend = backend or DEFAULT_BACKEND
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}', expected one of {BACKENDS}")
+
+    logger.info(f"მოდელის ჩატვირთვა: {model_name} ({backend})")
+
+    if backend == "torch":
+        return SentenceTransformer(model_name, device=device)
+
+    # onnx / onnx-int8 - requirements.txt-ის არასავალდებულო ნაწილი
+    try:
+        if backend == "onnx":
+            return SentenceTransformer(model_name, backend="onnx", device=device or "cpu", model_kwargs=_onnx_kwargs(threads))
+
+        return _load_int8(model_name, export_dir, quantization_config, threads)
+    except ImportError as e:
+        raise ImportError(f"Embedding backend {backend} needs optimum[onnxruntime] and onnxruntime: {e}") from e
+
+
+def fidelity(reference, candidate, texts=FIDELITY_SAMPLE, batch_size=32):
+    # cosine similarity ერთი და იგივე ტექსტების fp32 და სხვა backend-ის ემბედინგებს შორის
+    expected = np.asarray(reference.encode(texts, batch_size=batch_size), dtype=np.float32)
+    actual = np.asarray(candidate.encode(texts, batch_size=batch_size), dtype=np.float32)
+
+    expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+    actual /= np.linalg.norm(actual, axis=1, keepdims=True)
+    similarities = (expected * actual).sum(axis=1)
+
+    return {
+        'mean_cosine': round(float(similarities.mean()), 4),
+        'min_cosine': round(float(similarities.min()), 4),
+        'samples': len(texts)
+    }
+
+
+class EmbeddingBackend:
+    # ემბედინგის მოდელი არჩეული backend-ით. არა-torch backend-ი პირველ ჩატვირთვაზე fp32 მოდელს
+    # ედარება; თუ min cosine ზღვარზე დაბალია, torch-ზე ბრუნდება. შედეგი fidelity.json-ში ინახება
+
+    def __init__(self, model_name=DEFAULT_MODEL, backend=None, device=None, export_dir="data/models",
+                 min_cosine=0.98, check_fidelity=True):
+        self.model_name = model_name
+        self.requested_backend = backend or DEFAULT_BACKEND
+        self.backend = self.requested_backend
+        self.export_dir = Path(export_dir)
+        self.min_cosine = min_cosine
+        self.fidelity = None
+
+        self.model = load_model(model_name, self.backend, device, export_dir)
+
+        if self.backend != "torch" and check_fidelity:
+            self.fidelity = self._checked_fidelity(device)
+
+            if self.fidelity['min_cosine'] < min_cosine:
+                logger.error(
+                    f"Embedding backend {self.backend} failed fidelity check "
+                    f"(min cosine {self.fidelity['min_cosine']} < {min_cosine}), falling back to torch"
+                )
+                self.backend = "torch"
+                self.model = load_model(model_name, "torch", device)
+
+        logger.info(f"Embedding backend: {self.backend} (cache: {self.cache_name})")
+
+    @property
+    def cache_name(self):
+        return cache_name(self.model_name, self.backend)
+
+    def _fidelity_file(self):
+        return _export_dir(self.model_name, self.export_dir) / "fidelity.json"
+
+    def _checked_fidelity(self, device):
+        path = self._fidelity_file()
+        results = {}
+
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                results = json.load(f)
+            if self.backend in results:
+                return results[self.backend]
+
+        reference = load_model(self.model_name, "torch", device)
+        results[self.backend] = fidelity(reference, self.model)
+        del reference
+        logger.info(f"Embedding fidelity {self.backend} vs torch: {results[self.backend]}")
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+        return results[self.backend]
@@ -0,0 +1,303 @@
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text):
+    text = unicodedata.normalize('NFC', text)
+    return ' '.join(text.split())
+
+
+class EmbeddingCache:
+    # ვექტორები ინახება memory-mapped მატრიცაში (vectors.bin), ხოლო
+    # key -> row ინდექსი და LRU დროები SQLite-ში (index.sqlite)
+
+    def __init__(self, model_name, cache_dir="data/embedding_cache", max_entries=200_000, dtype='float16',
+                 touch_batch=256, touch_interval=30):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.dtype = np.dtype(dtype)
+        self._lock = threading.Lock()
+
+        # წაკითხვისას last_used მეხსიერებაში გროვდება და SQLite-ში ჯგუფურად იწერება
+        self.touch_batch = touch_batch
+        self.touch_interval = touch_interval
+        self._touched = {}
+        self._touched_at = time.monotonic()
+
+        slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+        self.cache_dir = Path(cache_dir) / slug
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self.vectors_file = self.cache_dir / "vectors.bin"
+
+        self.db = sqlite3.connect(str(self.cache_dir / "index.sqlite"), check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, row INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries(last_used)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self.db.commit()
+
+        self.dim = self._get_meta('dim', int)
+        self.capacity = self._get_meta('capacity', int) or 0
+        self.next_row = self._get_meta('next_row', int) or 0
+        self.vectors = None
+
+        stored_dtype = self._get_meta('dtype', str)
+        if stored_dtype and stored_dtype != self.dtype.name:
+            logger.warning(f"Embedding cache dtype changed ({stored_dtype} -> {self.dtype.name}), clearing")
+            self.clear()
+
+        if self.dim and self.capacity:
+            self._open_vectors()
+
+    def _get_meta(self, name, cast):
+        row = self.db.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return cast(row[0]) if row else None
+
+    def _set_meta(self, name, value):
+        self.db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, str(value)))
+
+    def _sync(self):
+        # dim / capacity / next_row სხვა პროცესსაც შეუძლია შეცვალოს (აგენტი და builder ერთ ქეშს იყენებენ):
+        # ყოველთვის SQLite-დან, memmap თავიდან იხსნება, თუ ფაილი სხვამ გაზარდა
+        self.dim = self._get_meta('dim', int)
+        self.next_row = self._get_meta('next_row', int) or 0
+        capacity = self._get_meta('capacity', int) or 0
+
+        if capacity != self.capacity or (self.vectors is None and self.dim and capacity):
+            self.capacity = capacity
+            self.vectors = None
+            if self.dim and self.capacity:
+                self._open_vectors()
+
+    def _open_vectors(self):
+        self.vectors = np.memmap(self.vectors_file, dtype=self.dtype, mode='r+', shape=(self.capacity, self.dim))
+
+    def _grow(self, rows_needed):
+        new_capacity = max(1024, self.capacity)
+        while new_capacity < rows_needed:
+            new_capacity *= 2
+        new_capacity = min(new_capacity, self.max_entries)
+
+        if new_capacity <= self.capacity:
+            return
+
+        if self.vectors is not None:
+            self.vectors.flush()
+            self.vectors = None
+
+        with open(self.vectors_file, 'ab') as f:
+            f.truncate(new_capacity * self.dim * self.dtype.itemsize)
+
+        self.capacity = new_capacity
+        self._set_meta('capacity', self.capacity)
+        self._open_vectors()
+
+    def key(self, text):
+        return hashlib.sha1(f"{self.model_name}\x00{normalize_text(text)}".encode('utf-8')).hexdigest()
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _lookup_rows(self, keys):
+        rows = {}
+        keys = list(keys)
+
+        # SQLite-ის პარამეტრების ლიმიტის გამო ნაწილ-ნაწილ
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            placeholders = ','.join('?' * len(part))
+            rows.update(self.db.execute(
+                f"SELECT key, row FROM entries WHERE key IN ({placeholders})", part
+            ).fetchall())
+
+        return rows
+
+    def _touch(self, keys):
+        now = time.time()
+        self.db.executemany("UPDATE entries SET last_used = ? WHERE key = ?", [(now, key) for key in keys])
+
+    def _write_touched(self):
+        self.db.executemany(
+            "UPDATE entries SET last_used = ? WHERE key = ?",
+            [(used, key) for key, used in self._touched.items()]
+        )
+        self._touched = {}
+        self._touched_at = time.monotonic()
+
+    def _flush_touched(self):
+        # builder-ი BEGIN IMMEDIATE-ს რომ ფლობს, წაკითხვა არ უნდა დაელოდოს ან ჩავარდეს:
+        # busy_timeout 0-ით ვცდილობთ და ვერ ჩაწერის შემთხვევაში შემდეგ ჯერზე ვიმეორებთ
+        touched = self._touched
+        self.db.execute("PRAGMA busy_timeout = 0")
+        try:
+            self._write_touched()
+            self.db.commit()
+        except sqlite3.OperationalError as e:
+            self.db.rollback()
+            self._touched = touched
+            logger.debug(f"Embedding cache is locked, postponing {len(touched)} LRU updates: {e}")
+        finally:
+            self.db.execute("PRAGMA busy_timeout = 5000")
+    def get_many(self, keys):
+        if not keys:
+            return []
+
+        with self._lock:
+            self._sync()
+            if self.vectors is None:
+                return [None] * len(keys)
+
+            rows = self._lookup_rows(keys)
+
+            now = time.time()
+            self._touched.update((key, now) for key in rows)
+            if self._touched and (
+                len(self._touched) >= self.touch_batch
+                or time.monotonic() - self._touched_at >= self.touch_interval
+            ):
+                self._flush_touched()
+
+            return [
+                np.asarray(self.vectors[rows[key]], dtype=np.float32) if key in rows else None
+                for key in keys
+            ]
+
+    def _allocate_rows(self, count):
+        rows = []
+
+        free = min(count, self.max_entries - self.next_row)
+        if free > 0:
+            self._grow(self.next_row + free)
+            rows.extend(range(self.next_row, self.next_row + free))
+            self.next_row += free
+            self._set_meta('next_row', self.next_row)
+
+        missing = count - len(rows)
+        if missing > 0:
+            # LRU: ყველაზე დიდი ხნის წინ გამოყენებული ჩანაწერების ადგილი
+            evicted = self.db.execute(
+                "SELECT key, row FROM entries ORDER BY last_used LIMIT ?", (missing,)
+            ).fetchall()
+            self.db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in evicted])
+            rows.extend(row for _, row in evicted)
+
+        return rows
+
+    def put_many(self, keys, embeddings):
+        if not keys:
+            return
+
+        embeddings = np.asarray(embeddings)
+
+        with self._lock:
+            # BEGIN IMMEDIATE: row-ების გამოყოფა და ჩაწერა პროცესებს შორის რიგრიგობით
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                self._put_many(keys, embeddings)
+                self.db.commit()
+            except BaseException:
+                self.db.rollback()
+                raise
+
+    def _put_many(self, keys, embeddings):
+        self._sync()
+
+        if self.dim is None:
+            self.dim = int(embeddings.shape[1])
+            self._set_meta('dim', self.dim)
+            self._set_meta('dtype', self.dtype.name)
+
+        # ერთი batch-ის შიგნით გამეორებული ტექსტები ერთხელ ინახება
+        unique = {}
+        for key, embedding in zip(keys, embeddings):
+            unique[key] = embedding
+
+        # ჩაწერის ტრანზაქცია უკვე ჩვენია - დაგროვილი LRU განახლებებიც აქ იწერება
+        if self._touched:
+            self._write_touched()
+
+        existing = self._lookup_rows(unique)
+        self._touch(existing)
+
+        new_keys = [key for key in unique if key not in existing]
+        rows = self._allocate_rows(min(len(new_keys), self.max_entries))
+        assigned = dict(existing)
+        assigned.update(zip(new_keys, rows))
+
+        now = time.time()
+        for key, row in assigned.items():
+            self.vectors[row] = unique[key]
+
+        self.db.executemany(
+            "INSERT OR REPLACE INTO entries (key, row, last_used) VALUES (?, ?, ?)",
+            [(key, row, now) for key, row in assigned.items()]
+        )
+        self.vectors.flush()
+
+    def clear(self):
+        with self._lock:
+            self.db.execute("DELETE FROM entries")
+            self.db.execute("DELETE FROM meta")
+            self.db.commit()
+            self._touched = {}
+
+            self.vectors = None
+            self.vectors_file.unlink(missing_ok=True)
+            self.dim = None
+            self.capacity = 0
+            self.next_row = 0
+
+
+class CachedEncoder:
+    # SentenceTransformer-ის გარსი: ქეშში არსებული ტექსტები მოდელს აღარ გადაეცემა
+
+    def __init__(self, model, model_name, cache=None):
+        self.model = model
+        self.model_name = model_name
+        self.cache = cache if cache is not None else EmbeddingCache(model_name)
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False):
+        keys = [self.cache.key(text) for text in texts]
+        cached = self.cache.get_many(keys)
+
+        # ნორმალიზაციის შემდეგ ერთნაირი ტექსტები მოდელს ერთხელ გადაეცემა
+        missing = {}
+        for i, vector in enumerate(cached):
+            if vector is None:
+                missing.setdefault(keys[i], []).append(i)
+
+        self.misses += len(missing)
+        self.hits += len(texts) - sum(len(positions) for positions in missing.values())
+
+        if missing:
+            missing_keys = list(missing)
+            encoded = self.model.encode(
+                [texts[missing[key][0]] for key in missing_keys],
+                batch_size=batch_size,
+                show_progress_bar=show_progress_bar
+            )
+            self.cache.put_many(missing_keys, encoded)
+
+            for key, vector in zip(missing_keys, encoded):
+                for i in missing[key]:
+                    cached[i] = np.asarray(vector, dtype=np.float32)
+
+        if not cached:
+            return np.zeros((0, self.cache.dim or 0), dtype=np.float32)
+
+        return np.vstack(cached)
@@ -1,22 +1,73 @@
 import chromadb
 from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
+import hashlib
 import json
 import logging
+import time
 from pathlib import Path
 from tqdm import tqdm
 
+try:
+    from src.processing.chunking import FixedWindowChunker, LegalStructureChunker, TokenCounter, get_chunker
+    from src.processing.document_metadata import load_document_fields
+    from src.processing.embedding_backends import DEFAULT_MODEL, EmbeddingBackend
+    from src.processing.embedding_cache import CachedEncoder, EmbeddingCache
+    from src.processing.lexical_index import LexicalIndex
+    from src.processing.parallel_encoder import ParallelEncoder
+    from src.processing.text_store import TextStore, iter_json_texts
+except ImportError:
+    from chunking import FixedWindowChunker, LegalStructureChunker, TokenCounter, get_chunker
+    from document_metadata import load_document_fields
+    from embedding_backends import DEFAULT_MODEL, EmbeddingBackend
+    from embedding_cache import CachedEncoder, EmbeddingCache
+    from lexical_index import LexicalIndex
+    from parallel_encoder import ParallelEncoder
+    from text_store import TextStore, iter_json_texts
+
 logger = logging.getLogger(__name__)
 
 
 class EmbeddingsBuilder:
-    def __init__(self, model_name='paraphrase-multilingual-mpnet-base-v2'):
+    # ChromaDB-ს ერთ ჩაწერაში შეზღუდული რაოდენობის ჩანაწერი შეუძლია
+    write_batch_size = 1000
+    encode_batch_size = 32
+
+    def __init__(self, model_name=DEFAULT_MODEL, embedding_cache_dir="data/embedding_cache",
+                 chunker="legal", lexical_index_dir="data/lexical_index", persist_dir="data/vectordb",
+                 collection_name="georgian_tax_docs", embedding_backend=None, workers=1,
+                 threads_per_worker=None, encode_batch_size=None):
        
-        logger.info(f"მოდელის ჩატვირთვა: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        # embedding_backend: torch / onnx / onnx-int8 (src.processing.embedding_backends)
+        self.embedding = EmbeddingBackend(model_name, embedding_backend)
+        self.model = self.embedding.model
+        self.encoder = CachedEncoder(
+            self.model,
+            self.embedding.cache_name,
+            EmbeddingCache(self.embedding.cache_name, cache_dir=embedding_cache_dir)
+        )
+        self.chunker = self._make_chunker(chunker)
+        
+        if encode_batch_size:
+            self.encode_batch_size = encode_batch_size
         
+        # workers > 1: ემბედინგი worker პროცესებში (თითოეულში მოდელი ერთხელ იტვირთება), ქეში და ჩაწერა - აქ
+        self.parallel_encoder = None
+        if workers != 1:
+            self.parallel_encoder = ParallelEncoder(
+                model_name,
+                self.embedding.backend,
+                workers=workers,
+                threads_per_worker=threads_per_worker,
+                max_seq_length=self.model.max_seq_length
+            )
+            self.encoder.model = self.parallel_encoder
+        self.lexical_index_dir = Path(lexical_index_dir)
+        # ბოლო BM25 განახლების შემდეგ დამატებული / წაშლილი ჩანქები - ინდექსი მხოლოდ მათზე ახლდება
+        self._lexical_added = set()
+        self._lexical_removed = set()
         
-        persist_dir = Path("data/vectordb")
+        
+        persist_dir = Path(persist_dir)
         persist_dir.mkdir(parents=True, exist_ok=True)
         
       
@@ -25,65 +76,378 @@ class EmbeddingsBuilder:
         
        
         self.collection = self.chroma_client.get_or_create_collection(
-            name="georgian_tax_docs",
+            name=collection_name,
             metadata={"description": "Georgian tax and customs documents"}
         )
         
     
+    def close(self):
+        if self.parallel_encoder:
+            self.parallel_encoder.close()
+            self.parallel_encoder = None
+
+    def _make_chunker(self, chunker):
+        if chunker == LegalStructureChunker.name:
+            chunker = LegalStructureChunker(token_counter=TokenCounter(getattr(self.model, 'tokenizer', None)))
+        else:
+            chunker = get_chunker(chunker)
+
+        # ჩანქი მოდელის max_seq_length-ზე გრძელი არ უნდა იყოს, თორემ ბოლო ნაწილი ემბედინგში არ მოხვდება
+        max_tokens = getattr(chunker, 'max_tokens', None)
+        if max_tokens and self.model.max_seq_length < max_tokens + 2:
+            model_limit = getattr(self.model.tokenizer, 'model_max_length', max_tokens + 2)
+            self.model.max_seq_length = min(max_tokens + 2, model_limit)
+
+        logger.info(f"Chunker: {chunker.signature}")
+        return chunker
+
     def chunk_text(self, text, chunk_size=500, overlap=100):
         
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = start + chunk_size
-            chunk = text[start:end]
-            
-            if chunk.strip():
-                chunks.append(chunk)
-            
-            start += chunk_size - overlap
-        
-        return chunks
+        return FixedWindowChunker(chunk_size, overlap).chunk(text)
     
-    def build_vector_database(self, extracted_texts_file):
-       
-        # ტექსტების ჩატვირთვა
-        with open(extracted_texts_file, 'r', encoding='utf-8') as f:
-            extracted_texts = json.load(f)
-        
-        
-        all_chunks = []
-        all_metadata = []
-        
-        for pdf_path, text in tqdm(extracted_texts.items(), desc="Processing documents"):
+    @staticmethod
+    def text_hash(text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def make_chunk_ids(self, doc_name, chunks):
+        # id = hash(დოკუმენტი + ჩანქის შინაარსი), ასე რომ ახალი PDF-ის დამატება
+        # არსებული ჩანქების id-ებს აღარ ცვლის
+        ids = []
+        seen = {}
+
+        for chunk in chunks:
+            base = self.text_hash(f"{doc_name}\x00{chunk}")
+            occurrence = seen.get(base, 0)
+            seen[base] = occurrence + 1
+
+            ids.append(base if occurrence == 0 else f"{base}-{occurrence}")
+
+        return ids
+
+    def _existing_sources(self, page_size=1000):
+        # source_path -> {doc_hash, count, total}; თავად ჩანქები მეხსიერებაში არ იტვირთება
+        sources = {}
+        offset = 0
+
+        while True:
+            page = self.collection.get(include=['metadatas'], limit=page_size, offset=offset)
+
+            if not page['ids']:
+                break
+
+            for metadata in page['metadatas']:
+                metadata = metadata or {}
+                source_path = metadata.get('source_path')
+                doc_hash = metadata.get('doc_hash')
+
+                entry = sources.setdefault(source_path, {
+                    'doc_hash': doc_hash,
+                    'count': 0,
+                    'total': metadata.get('total_chunks')
+                })
+                entry['count'] += 1
+
+                # ნაწილობრივ ჩაწერილი / შერეული დოკუმენტი შეცვლილად ითვლება
+                if entry['doc_hash'] != doc_hash:
+                    entry['doc_hash'] = None
+
+            offset += len(page['ids'])
+
+        return sources
+
+    def _source_chunk_ids(self, source_path):
+        return set(self.collection.get(where={'source_path': source_path}, include=[])['ids'])
+
+    def _delete_sources(self, existing, keep):
+        deleted = 0
+
+        for source_path, entry in existing.items():
+            if source_path in keep:
+                continue
+
+            if source_path is None:
+                logger.warning(f"{entry['count']} chunks without source_path left untouched")
+                continue
+
+            self._lexical_removed.update(self._source_chunk_ids(source_path))
+            self.collection.delete(where={'source_path': source_path})
+            deleted += entry['count']
+
+        return deleted
+
+    def prune_sources(self, keep):
+        # keep-ში არმყოფი დოკუმენტების ჩანქები იშლება (build_vector_database(prune=False)-ის შემდეგ,
+        # როცა სრული სია ცნობილია); აბრუნებს წაშლილი ჩანქების რაოდენობას
+        deleted = self._delete_sources(self._existing_sources(), set(keep))
+
+        if deleted:
+            previous_version = self._bump_index_version()
+            self.update_lexical_index(previous_version)
+            logger.info(f"წაშლილი: {deleted}")
+
+        return deleted
+
+    def _reset_collection(self):
+
+        name = self.collection.name
+        # embedding_model მაშინვე - შეწყვეტილი აწყობა checkpoint-იდან იმავე backend-ით გაგრძელდება
+        metadata = dict(self.collection.metadata or {}, embedding_model=self.embedding.cache_name)
+
+        self.chroma_client.delete_collection(name)
+        self.collection = self.chroma_client.get_or_create_collection(name=name, metadata=metadata)
+
+    def index_model_mismatch(self):
+        # კოლექციის embedding_model, თუ ის მიმდინარე მოდელს / backend-ს არ ემთხვევა (ვექტორები შეუთავსებელია)
+        index_model = (self.collection.metadata or {}).get('embedding_model')
+        if index_model and index_model != self.embedding.cache_name:
+            return index_model
+        return None
+
+    def _bump_index_version(self):
+        # აგენტის პასუხების ქეში ამ მნიშვნელობის შეცვლისას სუფთავდება; აბრუნებს წინა ვერსიას
+        metadata = dict(self.collection.metadata or {})
+        previous_version = metadata.get('index_version')
+        metadata['index_version'] = str(time.time_ns())
+        # აგენტი ამოწმებს, რომ query-ები იმავე მოდელით/backend-ით იკოდირება
+        metadata['embedding_model'] = self.embedding.cache_name
+        # მეზობელი ჩანქების გადაფარვა (სიმბოლოები) - კონტექსტის აწყობისას ზუსტად ამდენი იჭრება
+        metadata['chunk_overlap'] = getattr(self.chunker, 'overlap', 0)
+        self.collection.modify(metadata=metadata)
+        return previous_version
+
+    @staticmethod
+    def _lexical_texts(page):
+        # ფაილის სახელიც ინდექსირდება - იქ არის გადაწყვეტილების ნომერი (№25852_2_2025.pdf)
+        for chunk_id, document, metadata in zip(page['ids'], page['documents'], page['metadatas']):
+            yield chunk_id, f"{(metadata or {}).get('source', '')}\n{document or ''}"
+
+    def _iter_collection_texts(self, page_size=1000, ids=None):
+        if ids is not None:
+            ids = sorted(ids)
+            for start in range(0, len(ids), page_size):
+                page = self.collection.get(ids=ids[start:start + page_size], include=['documents', 'metadatas'])
+                yield from self._lexical_texts(page)
+            return
+
+        offset = 0
+
+        while True:
+            page = self.collection.get(include=['documents', 'metadatas'], limit=page_size, offset=offset)
+
+            if not page['ids']:
+                break
+
+            yield from self._lexical_texts(page)
+            offset += len(page['ids'])
+
+    def build_lexical_index(self):
+        self._lexical_added.clear()
+        self._lexical_removed.clear()
+        index_version = (self.collection.metadata or {}).get('index_version')
+        return LexicalIndex.build(self._iter_collection_texts(), self.lexical_index_dir, index_version)
+
+    def update_lexical_index(self, previous_version, full=False):
+        # BM25 მხოლოდ ბოლო განახლების შემდეგ დამატებულ / წაშლილ ჩანქებზე. სრული აწყობა, თუ ინდექსი
+        # არ არსებობს, კოლექციის წინა ვერსიას არ შეესაბამება ან შედეგი კოლექციას არ ემთხვევა
+        index = LexicalIndex(self.lexical_index_dir)
+        if full or not index.available or index.meta.get('index_version') != previous_version:
+            return self.build_lexical_index()
+
+        added = self._iter_collection_texts(ids=self._lexical_added) if self._lexical_added else []
+        index = index.update(added, self._lexical_removed, (self.collection.metadata or {}).get('index_version'))
+        self._lexical_added.clear()
+        self._lexical_removed.clear()
+
+        if len(index.chunk_ids) != self.collection.count():
+            logger.warning("Lexical index is out of sync with the collection, rebuilding")
+            return self.build_lexical_index()
+
+        return index
+
+    def iter_documents(self, documents):
+        if isinstance(documents, TextStore):
+            return documents.items()
+
+        if isinstance(documents, (str, Path)):
+            if Path(documents).is_dir():
+                return TextStore(documents).items()
+            return iter_json_texts(documents)
+
+        if isinstance(documents, dict):
+            return iter(documents.items())
+
+        return iter(documents)
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_file):
+        if not checkpoint_file.exists():
+            return set()
+
+        with open(checkpoint_file, 'r', encoding='utf-8') as f:
+            return {json.loads(line) for line in f if line.strip()}
+
+    def _flush(self, pending, checkpoint_file):
+
+        for start in range(0, len(pending['stale_ids']), self.write_batch_size):
+            self.collection.delete(ids=pending['stale_ids'][start:start + self.write_batch_size])
+        self._lexical_removed.update(pending['stale_ids'])
+        self._lexical_added.update(pending['ids'])
+
+        for start in range(0, len(pending['update_ids']), self.write_batch_size):
+            end = start + self.write_batch_size
+            self.collection.update(
+                ids=pending['update_ids'][start:end],
+                metadatas=pending['update_metadatas'][start:end]
+            )
+
+        if pending['ids']:
+            embeddings = self.encoder.encode(pending['chunks'], batch_size=self.encode_batch_size)
+
+            for start in range(0, len(pending['ids']), self.write_batch_size):
+                end = start + self.write_batch_size
+                self.collection.upsert(
+                    embeddings=embeddings[start:end].tolist(),
+                    documents=pending['chunks'][start:end],
+                    metadatas=pending['metadatas'][start:end],
+                    ids=pending['ids'][start:end]
+                )
+
+        # checkpoint-ში მხოლოდ ბოლომდე ჩაწერილი დოკუმენტები ხვდება
+        if pending['docs']:
+            checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(checkpoint_file, 'a', encoding='utf-8') as f:
+                for pdf_path in pending['docs']:
+                    f.write(json.dumps(pdf_path, ensure_ascii=False) + "\n")
+
+        for values in pending.values():
+            values.clear()
+
+    def build_vector_database(self, documents, incremental=True, batch_size=256,
+                              checkpoint_file="data/processed/build_checkpoint.jsonl",
+                              metadata_file="data/raw/metadata.json", document_fields=None, prune=True):
+
+        # documents: TextStore, მისი დირექტორია, extracted_texts.json-ის გზა, dict ან (pdf_path, text) წყვილების iterator.
+        # მეხსიერებაში ერთდროულად მაქსიმუმ batch_size ჩანქი და მისი ემბედინგებია
+        checkpoint_file = Path(checkpoint_file)
+
+        # სხვა მოდელით / backend-ით აწყობილ კოლექციაში ძველი ვექტორები ახლებს არ ერევა - სრული აწყობა
+        index_model = self.index_model_mismatch()
+        if index_model:
+            if not prune:
+                # ნაწილობრივი შესავლით სრული აწყობა შეუძლებელია
+                raise ValueError(
+                    f"Index was built with {index_model}, a full build is needed for {self.embedding.cache_name}"
+                )
+            logger.warning(f"Index was built with {index_model}, rebuilding with {self.embedding.cache_name}")
+            checkpoint_file.unlink(missing_ok=True)
+            incremental = False
+
+        completed = self._load_checkpoint(checkpoint_file)
+        # სკრაპერის ატრიბუტები (ნომერი, სტატუსი, ტიპი, თარიღი) ფილტრებისთვის; document_fields - ფაილის
+        # სახელი -> ველები, თუ გამომძახებელი მათ თავად აგროვებს (pipeline.py სკრაპინგის პარალელურად)
+        if document_fields is None:
+            document_fields = load_document_fields(metadata_file)
+
+        if completed:
+            logger.info(f"წინა აწყობის გაგრძელება checkpoint-იდან: {len(completed)} დოკუმენტი უკვე მზადაა")
+        elif not incremental:
+            self._reset_collection()
+
+        existing = self._existing_sources()
+        seen = set()
+
+        pending = {
+            'ids': [], 'chunks': [], 'metadatas': [],
+            'update_ids': [], 'update_metadatas': [],
+            'stale_ids': [], 'docs': []
+        }
+        stats = {'new': 0, 'updated': 0, 'deleted': 0, 'unchanged_docs': 0}
+        total_chunks = 0
+
+        for pdf_path, text in tqdm(self.iter_documents(documents), desc="Processing documents"):
+            seen.add(pdf_path)
+
+            if pdf_path in completed:
+                continue
+
             doc_name = Path(pdf_path).name
-            chunks = self.chunk_text(text)
-            
-            for i, chunk in enumerate(chunks):
-                all_chunks.append(chunk)
-                all_metadata.append({
+            fields = document_fields.get(doc_name, {})
+            # chunker-ის შეცვლისას დოკუმენტი შეცვლილად ითვლება და თავიდან იჭრება;
+            # ატრიბუტების შეცვლისას ჩანქები იგივეა და მხოლოდ მეტადატა ახლდება
+            doc_hash = self.text_hash(
+                f"{self.chunker.signature}\x00{json.dumps(fields, sort_keys=True, ensure_ascii=False)}\x00{text}"
+            )
+            chunks = self.chunker.chunk(text)
+            total_chunks += len(chunks)
+
+            previous = existing.get(pdf_path)
+
+            if previous and previous['doc_hash'] == doc_hash and previous['count'] == previous['total']:
+                stats['unchanged_docs'] += 1
+                pending['docs'].append(pdf_path)
+                continue
+
+            previous_ids = self._source_chunk_ids(pdf_path) if previous else set()
+            chunk_ids = self.make_chunk_ids(doc_name, chunks)
+
+            for i, (chunk_id, chunk) in enumerate(zip(chunk_ids, chunks)):
+                metadata = {
                     'source': doc_name,
                     'source_path': pdf_path,
                     'chunk_id': i,
-                    'total_chunks': len(chunks)
-                })
-        
-        
-    
-        logger.info("ემბედინგის გენერრირება: ")
-        embeddings = self.model.encode(all_chunks, show_progress_bar=True, batch_size=32)
-        
+                    'total_chunks': len(chunks),
+                    'doc_hash': doc_hash,
+                    **fields
+                }
 
-        self.collection.add(
-            embeddings=embeddings.tolist(),
-            documents=all_chunks,
-            metadatas=all_metadata,
-            ids=[f"chunk_{i}" for i in range(len(all_chunks))]
+                # შინაარსი არ შეცვლილა - ემბედინგი რჩება, ახლდება მხოლოდ მეტადატა
+                if chunk_id in previous_ids:
+                    pending['update_ids'].append(chunk_id)
+                    pending['update_metadatas'].append(metadata)
+                    stats['updated'] += 1
+                else:
+                    pending['ids'].append(chunk_id)
+                    pending['chunks'].append(chunk)
+                    pending['metadatas'].append(metadata)
+                    stats['new'] += 1
+
+                if len(pending['ids']) >= batch_size:
+                    self._flush(pending, checkpoint_file)
+
+            stale_ids = previous_ids - set(chunk_ids)
+            pending['stale_ids'].extend(stale_ids)
+            stats['deleted'] += len(stale_ids)
+            pending['docs'].append(pdf_path)
+
+            if len(pending['update_ids']) + len(pending['stale_ids']) >= self.write_batch_size:
+                self._flush(pending, checkpoint_file)
+
+        self._flush(pending, checkpoint_file)
+
+        # დოკუმენტები, რომლებიც აღარ არის შესავალ მონაცემებში; prune=False - შესავალი მხოლოდ ცვლილებებია
+        if prune:
+            stats['deleted'] += self._delete_sources(existing, seen)
+
+        # checkpoint-იდან გაგრძელებისას წინა (შეწყვეტილი) გაშვების ჩანქები უკვე Chroma-შია, მაგრამ ვერსია
+        # არ შეცვლილა და BM25-ში არ არის - ამ გაშვებაში ცვლილება რომც არ იყოს, ვერსია და BM25 ახლდება
+        if completed or stats['new'] or stats['updated'] or stats['deleted']:
+            previous_version = self._bump_index_version()
+            self.update_lexical_index(previous_version, full=bool(completed) or not incremental)
+        elif not (self.lexical_index_dir / "meta.json").exists():
+            self.build_lexical_index()
+
+        # მხოლოდ ვერსიის / BM25-ის განახლების შემდეგ - მანამდე ავარიისას შემდეგი გაშვება ისევ სრულად ააგებს
+        checkpoint_file.unlink(missing_ok=True)
+
+        logger.info(
+            f"ახალი: {stats['new']}, განახლებული: {stats['updated']}, წაშლილი: {stats['deleted']}, "
+            f"უცვლელი დოკუმენტები: {stats['unchanged_docs']}"
         )
-    
 
         count = self.collection.count()
-        logger.info("შენახულია!")
-        
-        return len(all_chunks)
\ No newline at end of file
+        logger.info(f"შენახულია! ჩანქები ბაზაში: {count}")
+        logger.info(f"Embedding cache: {self.encoder.hits} hits, {self.encoder.misses} misses")
+
+        self.build_stats = dict(stats, chunks=total_chunks, documents=len(seen))
+        return total_chunks
+
@@ -0,0 +1,309 @@
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# "№25852/2/2025", "N 2823", "№ 006-266", ფაილის სახელებში "№25852_2_2025"
+IDENTIFIER_RE = re.compile(r'(?:№|\bN)\s*(\d+(?:[/_-]\d+)*)')
+TOKEN_RE = re.compile(r'[ა-ჰa-z]+|\d+')
+
+# ქართული ბრუნვის/მრავლობითის დაბოლოებები, გრძლიდან მოკლისკენ
+SUFFIXES = sorted([
+    "ებისთვის", "ისთვის", "ებიდან", "იდან", "ებით", "ებში", "ებზე", "ებმა", "ების", "ებს", "ები", "ებ",
+    "ით", "ის", "ად", "ში", "ზე", "თან", "მა", "ს", "ა", "ი", "ო", "ე",
+], key=len, reverse=True)
+
+
+def stem(word):
+    # მსუბუქი stemmer: მაქსიმუმ სამი დაბოლოება, ფუძე >= 3 სიმბოლო
+    if len(word) < 5 or not ('ა' <= word[0] <= 'ჰ'):
+        return word
+
+    for _ in range(3):
+        for suffix in SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[:-len(suffix)]
+                break
+        else:
+            break
+
+    return word
+
+
+def identifiers(text):
+    return ['#' + re.sub(r'[_-]', '/', match) for match in IDENTIFIER_RE.findall(text)]
+
+
+def tokenize(text):
+    text = unicodedata.normalize('NFC', text)
+
+    tokens = identifiers(text)
+    tokens.extend(stem(token) for token in TOKEN_RE.findall(text.lower()) if len(token) > 1)
+
+    return tokens
+
+
+def is_identifier_query(query):
+    return bool(IDENTIFIER_RE.search(query))
+
+
+class LexicalIndex:
+    # BM25 inverted index დისკზე:
+    #   vocab.json        term -> [df, offset]
+    #   postings_docs.npy ყველა posting list-ის დოკუმენტის ნომრები (int32), ერთ მასივში
+    #   postings_tf.npy   term frequency (uint16)
+    #   doc_len.npy       ჩანქების სიგრძეები ტოკენებში
+    #   chunk_ids.json    ჩანქის ნომერი -> Chroma id
+    # მასივები np.load(mmap_mode='r')-ით იტვირთება, ამიტომ აგენტის გაშვება იაფია
+
+    def __init__(self, index_dir="data/lexical_index", k1=1.5, b=0.75):
+        self.index_dir = Path(index_dir)
+        self.k1 = k1
+        self.b = b
+        self._loaded_mtime = None
+        self.load()
+
+    @property
+    def available(self):
+        return self._loaded_mtime is not None
+
+    def load(self):
+        meta_file = self.index_dir / "meta.json"
+
+        if not meta_file.exists():
+            self._loaded_mtime = None
+            return False
+
+        with open(meta_file, 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        with open(self.index_dir / "vocab.json", 'r', encoding='utf-8') as f:
+            self.vocab = json.load(f)
+        with open(self.index_dir / "chunk_ids.json", 'r', encoding='utf-8') as f:
+            self.chunk_ids = json.load(f)
+
+        self.postings_docs = np.load(self.index_dir / "postings_docs.npy", mmap_mode='r')
+        self.postings_tf = np.load(self.index_dir / "postings_tf.npy", mmap_mode='r')
+        self.doc_len = np.load(self.index_dir / "doc_len.npy", mmap_mode='r')
+
+        self._loaded_mtime = meta_file.stat().st_mtime_ns
+        return True
+
+    def reload_if_changed(self):
+        meta_file = self.index_dir / "meta.json"
+
+        try:
+            mtime = meta_file.stat().st_mtime_ns
+        except OSError:
+            return False
+
+        if mtime != self._loaded_mtime:
+            return self.load()
+
+        return False
+
+    @staticmethod
+    def _count_terms(chunks, first_doc, chunk_ids, doc_len):
+        # chunks: (chunk_id, text) წყვილები; ნომრები first_doc-იდან
+        postings = defaultdict(list)
+
+        for doc, (chunk_id, text) in enumerate(chunks, first_doc):
+            counts = Counter(tokenize(text))
+            chunk_ids.append(chunk_id)
+            doc_len.append(sum(counts.values()))
+
+            for term, tf in counts.items():
+                postings[term].append((doc, min(tf, 65535)))
+
+        return postings
+
+    @classmethod
+    def build(cls, chunks, index_dir="data/lexical_index", index_version=None):
+        # chunks: (chunk_id, text) წყვილების iterator
+        chunk_ids = []
+        doc_len = []
+        postings = cls._count_terms(chunks, 0, chunk_ids, doc_len)
+
+        vocab = {}
+        docs = []
+        tfs = []
+        offset = 0
+
+        for term in sorted(postings):
+            entries = postings[term]
+            vocab[term] = [len(entries), offset]
+            docs.extend(doc for doc, _ in entries)
+            tfs.extend(tf for _, tf in entries)
+            offset += len(entries)
+
+        return cls._write(
+            index_dir, vocab, np.asarray(docs, dtype=np.int32), np.asarray(tfs, dtype=np.uint16),
+            np.asarray(doc_len, dtype=np.int32), chunk_ids, index_version
+        )
+
+    def update(self, added, removed, index_version=None):
+        # added: ახალი / შეცვლილი ჩანქები (chunk_id, text); removed: წაშლილი id-ები.
+        # ძველი posting-ები ფილტრდება და ნომრები გადაინომრება, თავიდან მხოლოდ added-ის ტექსტები ტოკენიზდება
+        added = list(added)
+        drop = set(removed) | {chunk_id for chunk_id, _ in added}
+
+        keep = np.fromiter((chunk_id not in drop for chunk_id in self.chunk_ids), dtype=bool, count=len(self.chunk_ids))
+        renumber = (np.cumsum(keep) - 1).astype(np.int32)
+
+        chunk_ids = [chunk_id for chunk_id, kept in zip(self.chunk_ids, keep) if kept]
+        doc_len = list(np.asarray(self.doc_len)[keep])
+        postings = self._count_terms(added, len(chunk_ids), chunk_ids, doc_len)
+
+        old_docs = np.asarray(self.postings_docs)
+        old_tfs = np.asarray(self.postings_tf)
+        kept_postings = keep[old_docs] if len(old_docs) else np.zeros(0, dtype=bool)
+
+        vocab = {}
+        docs = []
+        tfs = []
+        offset = 0
+
+        for term in sorted(set(self.vocab) | set(postings)):
+            parts_docs = []
+            parts_tfs = []
+
+            if term in self.vocab:
+                df, start = self.vocab[term]
+                mask = kept_postings[start:start + df]
+                parts_docs.append(renumber[old_docs[start:start + df][mask]])
+                parts_tfs.append(old_tfs[start:start + df][mask])
+
+            if term in postings:
+                parts_docs.append(np.asarray([doc for doc, _ in postings[term]], dtype=np.int32))
+                parts_tfs.append(np.asarray([tf for _, tf in postings[term]], dtype=np.uint16))
+
+            term_docs = np.concatenate(parts_docs)
+            if not len(term_docs):
+                continue
+
+            vocab[term] = [len(term_docs), offset]
+            docs.append(term_docs)
+            tfs.append(np.concatenate(parts_tfs))
+            offset += len(term_docs)
+
+        logger.info(f"Lexical index update: +{len(added)} chunks, -{len(self.chunk_ids) - int(keep.sum())} chunks")
+        return self._write(
+            self.index_dir, vocab,
+            np.concatenate(docs).astype(np.int32) if docs else np.zeros(0, dtype=np.int32),
+            np.concatenate(tfs).astype(np.uint16) if tfs else np.zeros(0, dtype=np.uint16),
+            np.asarray(doc_len, dtype=np.int32), chunk_ids, index_version
+        )
+
+    @classmethod
+    def _write(cls, index_dir, vocab, docs, tfs, doc_len, chunk_ids, index_version):
+        # ჯერ დროებით დირექტორიაში, მერე ატომური ჩანაცვლება - აგენტი ნახევრად ჩაწერილ ინდექსს ვერ წაიკითხავს
+        index_dir = Path(index_dir)
+        staging = index_dir.with_name(index_dir.name + ".tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        np.save(staging / "postings_docs.npy", docs)
+        np.save(staging / "postings_tf.npy", tfs)
+        np.save(staging / "doc_len.npy", doc_len)
+
+        with open(staging / "vocab.json", 'w', encoding='utf-8') as f:
+            json.dump(vocab, f, ensure_ascii=False)
+        with open(staging / "chunk_ids.json", 'w', encoding='utf-8') as f:
+            json.dump(chunk_ids, f)
+        with open(staging / "meta.json", 'w', encoding='utf-8') as f:
+            json.dump({
+                'documents': len(chunk_ids),
+                'terms': len(vocab),
+                'avg_doc_len': float(doc_len.sum()) / len(doc_len) if len(doc_len) else 0.0,
+                'index_version': index_version
+            }, f)
+
+        previous = index_dir.with_name(index_dir.name + ".old")
+        shutil.rmtree(previous, ignore_errors=True)
+        if index_dir.exists():
+            os.replace(index_dir, previous)
+        os.replace(staging, index_dir)
+        shutil.rmtree(previous, ignore_errors=True)
+
+        logger.info(f"Lexical index: {len(chunk_ids)} chunks, {len(vocab)} terms -> {index_dir}")
+        return cls(index_dir)
+
+    def _scores(self, query):
+        n_docs = len(self.chunk_ids)
+        avg_doc_len = self.meta['avg_doc_len'] or 1.0
+        scores = np.zeros(n_docs, dtype=np.float32)
+        matched = False
+
+        for term in set(tokenize(query)):
+            entry = self.vocab.get(term)
+            if not entry:
+                continue
+
+            df, offset = entry
+            docs = self.postings_docs[offset:offset + df]
+            tf = self.postings_tf[offset:offset + df].astype(np.float32)
+
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * self.doc_len[docs] / avg_doc_len)
+            scores[docs] += idf * tf * (self.k1 + 1) / (tf + norm)
+            matched = True
+
+        return scores if matched else None
+
+    def _top(self, scores, top_k, candidates=None):
+        if candidates is None:
+            candidates = np.flatnonzero(scores)
+
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k)[:top_k]]
+
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(self.chunk_ids[i], float(scores[i])) for i in ranked]
+
+    def search(self, query, top_k=10):
+        if not self.available or not self.chunk_ids:
+            return []
+
+        scores = self._scores(query)
+        return self._top(scores, top_k) if scores is not None else []
+
+    def exact_matches(self, query, top_k=10):
+        # ჩანქები, რომლებიც კითხვაში მოცემულ ყველა ნომერს შეიცავს (posting list-ების თანაკვეთა)
+        terms = set(identifiers(unicodedata.normalize('NFC', query)))
+        if not terms or not self.available:
+            return []
+
+        docs = None
+        for term in terms:
+            entry = self.vocab.get(term)
+            if not entry:
+                return []
+
+            df, offset = entry
+            postings = self.postings_docs[offset:offset + df]
+            docs = postings if docs is None else np.intersect1d(docs, postings, assume_unique=True)
+
+        if not len(docs):
+            return []
+
+        return self._top(self._scores(query), top_k, np.asarray(docs))
+
+
+def reciprocal_rank_fusion(rankings, k=60, top_k=None):
+    # rankings: id-ების რანჟირებული სიები (vector, BM25, ...)
+    scores = defaultdict(float)
+
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking):
+            scores[chunk_id] += 1 / (k + rank + 1)
+
+    fused = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    return fused[:top_k] if top_k else fused
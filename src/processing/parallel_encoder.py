@@ -0,0 +1,101 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# worker პროცესის მოდელი - initializer-ში ერთხელ იტვირთება
+_model = None
+
+THREAD_VARIABLES = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+@contextmanager
+def _thread_limits(threads):
+    # BLAS/OpenMP ნაკადების რაოდენობა numpy / torch-ის იმპორტისას იკითხება, spawn-ით შექმნილი პროცესი კი
+    # __main__-ს და ამ მოდულს initializer-მდე იმპორტავს. ამიტომ ლიმიტი მშობლის გარემოდან მოდის:
+    # os.environ დროებით იცვლება worker-ების გაშვებისას (Popen-ის მომენტში კოპირდება)
+    previous = {variable: os.environ.get(variable) for variable in THREAD_VARIABLES}
+    os.environ.update({variable: str(threads) for variable in THREAD_VARIABLES})
+
+    try:
+        yield
+    finally:
+        for variable, value in previous.items():
+            if value is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = value
+
+
+def _worker_ready():
+    return os.getpid()
+
+
+def _init_worker(model_name, backend, threads, max_seq_length, export_dir):
+    global _model
+
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    try:
+        from src.processing.embedding_backends import load_model
+    except ImportError:
+        from embedding_backends import load_model
+
+    _model = load_model(model_name, backend, export_dir=export_dir, threads=threads)
+    if max_seq_length:
+        _model.max_seq_length = max_seq_length
+
+
+def _encode_shard(texts, batch_size):
+    return np.asarray(_model.encode(texts, batch_size=batch_size, show_progress_bar=False), dtype=np.float32)
+
+
+class ParallelEncoder:
+    # SentenceTransformer-ის encode-ის ჩანაცვლება: ტექსტები shard-ებად ნაწილდება worker პროცესებზე.
+    # ჩაწერა ChromaDB-ში ისევ მთავარ პროცესში რჩება (ერთი writer), worker-ები მხოლოდ ემბედინგს ითვლიან
+
+    def __init__(self, model_name, backend="torch", workers=None, threads_per_worker=None,
+                 max_seq_length=None, export_dir="data/models", shard_size=64):
+        self.workers = workers or os.cpu_count() or 1
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+        self.shard_size = shard_size
+
+        logger.info(f"Parallel encoding: {self.workers} workers x {self.threads_per_worker} threads ({backend})")
+
+        # spawn - fork-ი torch/onnxruntime-ის ნაკადებთან ერთად შეიძლება გაიჭედოს
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, backend, self.threads_per_worker, max_seq_length, export_dir)
+        )
+
+        # spawn-ის დროს ProcessPoolExecutor ახალ პროცესს ყოველ submit-ზე იწყებს, თუ თავისუფალი worker არ არის:
+        # workers ცალი ამოცანა ყველა worker-ს (და მოდელის ჩატვირთვას) ახლავე, ლიმიტირებულ გარემოში უშვებს,
+        # პირველი batch-ის დაჭრის პარალელურად. თითოეული initializer-ის დასრულებამდე ვერ თავისუფლდება
+        with _thread_limits(self.threads_per_worker):
+            for _ in range(self.workers):
+                self.pool.submit(_worker_ready)
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False):
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        # shard-ები worker-ებზე თანაბრად, მაგრამ batch_size-ზე არანაკლები
+        shard_size = max(batch_size, min(self.shard_size, -(-len(texts) // self.workers)))
+        shards = [texts[start:start + shard_size] for start in range(0, len(texts), shard_size)]
+
+        results = self.pool.map(_encode_shard, shards, [batch_size] * len(shards))
+        return np.concatenate(list(results))
+
+    def close(self):
+        self.pool.shutdown()
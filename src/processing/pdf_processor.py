@@ -1,62 +1,235 @@
-
-
 import PyPDF2
 import logging
+import multiprocessing
+import os
+import queue
+import sqlite3
+import time
 from pathlib import Path
 from tqdm import tqdm
 
+try:
+    from src.processing.chunking import FixedWindowChunker
+    from src.processing.text_store import TextStore
+except ImportError:
+    from chunking import FixedWindowChunker
+    from text_store import TextStore
+
 logger = logging.getLogger(__name__)
 
 
+def _extract_worker(pdf_path):
+    # process pool-ის worker; PDFProcessor-ის ინსტანცია აქ არ გადაეცემა
+    return pdf_path, extract_text(pdf_path)
+
+
+def extract_text(pdf_path):
+    
+    try:
+        with open(pdf_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            
+            pages = [page.extract_text() or "" for page in pdf_reader.pages]
+            
+            return "\n\n".join(pages).strip()
+            
+    except Exception as e:
+        # None - წარუმატებელი ამოღება (ქეშში არ იწერება და შემდეგ ჯერზე თავიდან ცდება), "" - PDF-ში ტექსტი არ არის
+        logger.error(f"Error extracting text from {pdf_path}: {e}")
+        return None
+
+
+class ExtractionCache:
+    # ამოღებული ტექსტი ფაილზე: path + size + mtime თუ არ შეცვლილა, PDF თავიდან არ იკითხება
+    
+    def __init__(self, cache_file="data/processed/extraction_cache.sqlite"):
+        Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+        
+        self.db = sqlite3.connect(str(cache_file))
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, text TEXT)"
+        )
+        self.db.commit()
+    
+    @staticmethod
+    def _stat(pdf_path):
+        stat = os.stat(pdf_path)
+        return str(Path(pdf_path).resolve()), stat.st_size, stat.st_mtime_ns
+    
+    def get(self, pdf_path):
+        try:
+            path, size, mtime_ns = self._stat(pdf_path)
+        except OSError:
+            return None
+        
+        row = self.db.execute(
+            "SELECT text FROM files WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (path, size, mtime_ns)
+        ).fetchone()
+        
+        return row[0] if row else None
+    
+    def put(self, pdf_path, text):
+        try:
+            path, size, mtime_ns = self._stat(pdf_path)
+        except OSError:
+            return
+        
+        self.db.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, text) VALUES (?, ?, ?, ?)",
+            (path, size, mtime_ns, text)
+        )
+        self.db.commit()
+
+
 class PDFProcessor:
-    def __init__(self):
-        self.processed_dir = Path("data/processed")
+    def __init__(self, workers=None, timeout=120, use_cache=True, persistent_pool=False, processed_dir="data/processed"):
+        self.processed_dir = Path(processed_dir)
         self.processed_dir.mkdir(parents=True, exist_ok=True)
+        
+        # workers=1 - თანმიმდევრული ამოღება (ერთ worker პროცესში, timeout-ით)
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.cache = ExtractionCache(self.processed_dir / "extraction_cache.sqlite") if use_cache else None
+        
+        # persistent_pool - ერთი pool ყველა iter_texts გამოძახებისთვის (pipeline.py ფაილებს ნაწილ-ნაწილ
+        # გადასცემს), იხურება close()-ით
+        self.persistent_pool = persistent_pool
+        self._pool = None
+    
+    def _get_pool(self, workers):
+        if self._pool is None:
+            size = self.workers if self.persistent_pool else workers
+            self._pool = multiprocessing.Pool(size)
+        return self._pool
+    
+    def _close_pool(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+    
+    def close(self):
+        self._close_pool()
     
     def extract_text_from_pdf(self, pdf_path):
         
+        return extract_text(pdf_path)
+    
+    def _iter_parallel(self, pdf_paths, workers, timeout):
+        # in-flight ამოცანები <= workers, ამიტომ თითოეული გაგზავნისთანავე იწყება
+        # და დროის ლიმიტი გაგზავნიდან ითვლება. ვადაგადაცილებისას pool მთლიანად
+        # ჩერდება (ცალკე worker-ის მოკვლა შეუძლებელია) და დანარჩენები თავიდან იგზავნება
+        pending = list(reversed(pdf_paths))
+        results = queue.Queue()
+        if self.persistent_pool:
+            workers = min(workers, self.workers)
+        generation = 0
+        
+        def submit(pool, pdf_path):
+            started = time.monotonic()
+            current = generation
+            pool.apply_async(
+                _extract_worker, (pdf_path,),
+                callback=lambda result: results.put((current, result)),
+                error_callback=lambda error: results.put((current, (pdf_path, None)))
+            )
+            return started
+        
+        pool = self._get_pool(workers)
+        in_flight = {}
+        
         try:
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
+            while pending or in_flight:
+                while pending and len(in_flight) < workers:
+                    pdf_path = pending.pop()
+                    in_flight[pdf_path] = submit(pool, pdf_path)
                 
-                text = ""
-                for page_num, page in enumerate(pdf_reader.pages):
-                    page_text = page.extract_text()
-                    text += page_text + "\n\n"
+                deadline = min(in_flight.values()) + timeout
                 
-                return text.strip()
+                try:
+                    result_generation, (pdf_path, text) = results.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    now = time.monotonic()
+                    expired = [path for path, started in in_flight.items() if now - started >= timeout]
+                    
+                    for pdf_path in expired:
+                        logger.error(f"Timed out after {timeout}s extracting text from {pdf_path}")
+                        del in_flight[pdf_path]
+                        yield pdf_path, None
+                    
+                    self._close_pool()
+                    generation += 1
+                    pool = self._get_pool(workers)
+                    
+                    pending.extend(in_flight)
+                    in_flight = {}
+                    continue
                 
-        except Exception as e:
-            logger.error(f"Error extracting text from {pdf_path}: {e}")
-            return ""
-    
-    def process_all_pdfs(self, pdf_paths):
-       
-        results = {}
+                if result_generation != generation or pdf_path not in in_flight:
+                    continue
+                
+                del in_flight[pdf_path]
+                yield pdf_path, text
+        
+        finally:
+            # შეწყვეტილი generator-ის დაუსრულებელი ამოცანები pool-ს არ უნდა დარჩეს
+            if not self.persistent_pool or in_flight:
+                self._close_pool()
     
-        for pdf_path in tqdm(pdf_paths, desc="Extracting text from PDFs"):
-            text = self.extract_text_from_pdf(pdf_path)
+    def iter_texts(self, pdf_paths, workers=None, timeout=None):
+        # (pdf_path, text) წყვილები სათითაოდ - მთელი კორპუსი მეხსიერებაში არ გროვდება.
+        # ქეშირებული ფაილები პირდაპირ ბრუნდება, დანარჩენი process pool-ში მუშავდება
+        workers = workers or self.workers
+        timeout = self.timeout if timeout is None else timeout
+        to_extract = []
+        
+        for pdf_path in dict.fromkeys(pdf_paths):
+            text = self.cache.get(pdf_path) if self.cache else None
+            
+            if text is None:
+                to_extract.append(pdf_path)
+            elif text:
+                yield pdf_path, text
+        
+        # დროის ლიმიტი მხოლოდ ცალკე პროცესში მუშაობს, ამიტომ ერთი ფაილიც / workers=1-იც pool-ით მუშავდება;
+        # timeout=0 (PDFProcessor-ში ან აქ გადაცემული) - ამოღება ამავე პროცესში, ლიმიტის გარეშე
+        if timeout and to_extract:
+            extracted = self._iter_parallel(to_extract, min(workers, len(to_extract)), timeout)
+        else:
+            extracted = ((pdf_path, self.extract_text_from_pdf(pdf_path)) for pdf_path in to_extract)
+        
+        for pdf_path, text in tqdm(extracted, total=len(to_extract), desc="Extracting text from PDFs"):
+            # ვადაგადაცილებული ან შეცდომით დასრულებული ფაილი (None) ქეშში არ იწერება და შემდეგ ჯერზე თავიდან ცდება
+            if self.cache and text is not None:
+                self.cache.put(pdf_path, text)
             
             if text:
-                results[pdf_path] = text
+                yield pdf_path, text
             else:
-                logger.warning(f"No t text extracted from {pdf_path}")
+                logger.warning(f"No text extracted from {pdf_path}")
+    
+    def process_all_pdfs(self, pdf_paths, workers=None, timeout=None):
+       
+        results = {}
+    
+        for pdf_path, text in self.iter_texts(pdf_paths, workers=workers, timeout=timeout):
+            results[pdf_path] = text
         
     
         return results
     
-    def chunk_text(self, text, chunk_size=1000, overlap=200):
-      
-        chunks = []
-        start = 0
+    def extract_to_store(self, pdf_paths, store=None, workers=None, timeout=None):
+        # ტექსტები TextStore-ში იწერება ამოღებისთანავე; უცვლელი ტექსტი თავიდან არ იწერება
+        if store is None:
+            store = TextStore(self.processed_dir / "texts")
         
-        while start < len(text):
-            end = start + chunk_size
-            chunk = text[start:end]
-            
-            if chunk:
-                chunks.append(chunk)
-            
-            start += chunk_size - overlap
+        changed = store.update(self.iter_texts(pdf_paths, workers=workers, timeout=timeout))
+        logger.info(f"Text store {store.root}: {changed} new or changed documents, {len(store)} total")
         
-        return chunks
\ No newline at end of file
+        return store
+    
+    def chunk_text(self, text, chunk_size=1000, overlap=200):
+      
+        return FixedWindowChunker(chunk_size, overlap).chunk(text)
@@ -0,0 +1,288 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import zlib
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class TextStore:
+    # ამოღებული ტექსტების საცავი: JSONL შარდები (texts-00000.jsonl, ...) და
+    # SQLite ინდექსი key -> (shard, offset, length). ერთი დოკუმენტის წაკითხვა
+    # ერთი seek-ია, ჩაწერა მხოლოდ ფაილის ბოლოში ემატება.
+    # ჩანაწერი: {"key": ..., "text": ...} ან შეკუმშვისას {"key": ..., "z": base64(zlib(text))}
+
+    def __init__(self, root="data/processed/texts", compress=False, max_shard_bytes=64 * 1024 * 1024):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.compress = compress
+        self.max_shard_bytes = max_shard_bytes
+
+        self._writer = None
+        self._uncommitted = 0
+        self._open_index()
+
+    def _open_index(self):
+        self.db = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            "key TEXT PRIMARY KEY, shard INTEGER NOT NULL, offset INTEGER NOT NULL, "
+            "length INTEGER NOT NULL, text_hash TEXT NOT NULL, seq INTEGER NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS docs_position ON docs(shard, offset)")
+        self.db.commit()
+
+        shards = sorted(self.root.glob("texts-*.jsonl"))
+        self.shard = int(shards[-1].stem.split('-')[1]) if shards else 0
+        self.seq = self.db.execute("SELECT COALESCE(MAX(seq), 0) FROM docs").fetchone()[0]
+
+    def _shard_path(self, shard):
+        return self.root / f"texts-{shard:05d}.jsonl"
+
+    @staticmethod
+    def text_hash(text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def _encode(self, key, text):
+        if self.compress:
+            payload = base64.b64encode(zlib.compress(text.encode('utf-8'))).decode('ascii')
+            record = {'key': key, 'z': payload}
+        else:
+            record = {'key': key, 'text': text}
+
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+
+    @staticmethod
+    def _decode(line):
+        record = json.loads(line)
+
+        if 'z' in record:
+            return record['key'], zlib.decompress(base64.b64decode(record['z'])).decode('utf-8')
+
+        return record['key'], record['text']
+
+    def _open_writer(self, size):
+        if self._writer is None:
+            self._writer = open(self._shard_path(self.shard), 'ab')
+
+        # tell() ბუფერში დარჩენილ ბაიტებსაც ითვლის (stat() მხოლოდ დისკზე ჩაწერილს ხედავს)
+        position = self._writer.tell()
+        if position > 0 and position + size > self.max_shard_bytes:
+            self.close_writer()
+            self.shard += 1
+            self._writer = open(self._shard_path(self.shard), 'ab')
+
+        return self._writer
+
+    def put(self, key, text):
+        text_hash = self.text_hash(text)
+
+        row = self.db.execute("SELECT text_hash FROM docs WHERE key = ?", (key,)).fetchone()
+        if row and row[0] == text_hash:
+            return False
+
+        data = self._encode(key, text)
+        writer = self._open_writer(len(data))
+        offset = writer.tell()
+        writer.write(data)
+
+        self.seq += 1
+        self.db.execute(
+            "INSERT OR REPLACE INTO docs (key, shard, offset, length, text_hash, seq) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, self.shard, offset, len(data), text_hash, self.seq)
+        )
+
+        self._uncommitted += 1
+        if self._uncommitted >= 100:
+            self.flush()
+
+        return True
+
+    def update(self, items):
+        changed = 0
+
+        for key, text in items:
+            changed += self.put(key, text)
+
+        self.flush()
+        return changed
+
+    def flush(self):
+        # ჯერ მონაცემები, მერე ინდექსი - ავარიისას მაქსიმუმ უსარგებლო ბაიტები რჩება შარდში
+        if self._writer is not None:
+            self._writer.flush()
+
+        self.db.commit()
+        self._uncommitted = 0
+
+    def close_writer(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def close(self):
+        self.flush()
+        self.close_writer()
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def __contains__(self, key):
+        return self.db.execute("SELECT 1 FROM docs WHERE key = ?", (key,)).fetchone() is not None
+
+    def get_hash(self, key):
+        row = self.db.execute("SELECT text_hash FROM docs WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, key, default=None):
+        row = self.db.execute("SELECT shard, offset, length FROM docs WHERE key = ?", (key,)).fetchone()
+
+        if not row:
+            return default
+
+        if self._writer is not None:
+            self._writer.flush()
+
+        shard, offset, length = row
+        with open(self._shard_path(shard), 'rb') as f:
+            f.seek(offset)
+            return self._decode(f.read(length))[1]
+
+    def __getitem__(self, key):
+        text = self.get(key)
+        if text is None:
+            raise KeyError(key)
+        return text
+
+    def delete(self, key):
+        self.db.execute("DELETE FROM docs WHERE key = ?", (key,))
+        self.db.commit()
+
+    def keys(self):
+        return [row[0] for row in self.db.execute("SELECT key FROM docs ORDER BY seq")]
+
+    def items(self):
+        # ნაკადური წაკითხვა შარდების მიხედვით თანმიმდევრულად; მეხსიერებაში ერთი დოკუმენტია
+        if self._writer is not None:
+            self._writer.flush()
+
+        positions = self.db.execute("SELECT shard, offset, length FROM docs ORDER BY shard, offset").fetchall()
+
+        current_shard = None
+        f = None
+
+        try:
+            for shard, offset, length in positions:
+                if shard != current_shard:
+                    if f is not None:
+                        f.close()
+                    f = open(self._shard_path(shard), 'rb')
+                    current_shard = shard
+
+                f.seek(offset)
+                yield self._decode(f.read(length))
+        finally:
+            if f is not None:
+                f.close()
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def compact(self):
+        # შეცვლილი/წაშლილი დოკუმენტების ძველი ჩანაწერების მოშორება. ახალი შარდები ძველების შემდეგი
+        # ნომრებით და ახალი ინდექსი ჯერ ცალკე იწერება, index.sqlite ბოლოს os.replace-ით იცვლება და
+        # ძველი შარდები მხოლოდ ამის შემდეგ იშლება - ავარიისას ძველი ან ახალი ინდექსი ყოველთვის სრულია
+        self.flush()
+        self.close_writer()
+        old_shards = sorted(self.root.glob("texts-*.jsonl"))
+        first = self.shard + 1
+
+        staging_root = self.root / "compact.tmp"
+        shutil.rmtree(staging_root, ignore_errors=True)
+        staging = TextStore(staging_root, compress=self.compress, max_shard_bytes=self.max_shard_bytes)
+        for key, text in self.items():
+            staging.put(key, text)
+        staging.db.execute("UPDATE docs SET shard = shard + ?", (first,))
+        staging.close()
+
+        for path in sorted(staging_root.glob("texts-*.jsonl")):
+            shard = int(path.stem.split('-')[1]) + first
+            os.replace(path, self._shard_path(shard))
+
+        self.db.close()
+        os.replace(staging_root / "index.sqlite", self.root / "index.sqlite")
+        self._open_index()
+
+        for path in old_shards:
+            path.unlink()
+        shutil.rmtree(staging_root, ignore_errors=True)
+
+    def import_json(self, json_file):
+        # ძველი extracted_texts.json-დან გადმოტანა
+        count = self.update(iter_json_texts(json_file))
+        logger.info(f"Imported {count} documents from {json_file} into {self.root}")
+        return count
+
+
+def iter_json_texts(path, read_size=1 << 20):
+    # {"pdf_path": "text", ...} ფაილის ნაკადური წაკითხვა json.load-ის გარეშე:
+    # მეხსიერებაში ერთდროულად მხოლოდ ერთი დოკუმენტი და read_size ბუფერია
+    decoder = json.JSONDecoder()
+    separator = re.compile(r'\s*:\s*')
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        started = False
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+
+            if pos >= len(buffer) or (started and buffer[pos] == '"'):
+                try:
+                    if pos >= len(buffer):
+                        raise ValueError("buffer exhausted")
+
+                    key, end = decoder.raw_decode(buffer, pos)
+                    match = separator.match(buffer, end)
+                    if not match or match.end() >= len(buffer):
+                        raise ValueError("incomplete pair")
+
+                    value, end = decoder.raw_decode(buffer, match.end())
+
+                except ValueError:
+                    chunk = f.read(read_size)
+                    if not chunk:
+                        if pos >= len(buffer):
+                            return
+                        raise
+
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+                    continue
+
+                pos = end
+                yield key, value
+                continue
+
+            if buffer[pos] == '{' and not started:
+                started = True
+                pos += 1
+            elif buffer[pos] == '}':
+                return
+            else:
+                raise ValueError(f"Unexpected character {buffer[pos]!r} in {path}")
@@ -0,0 +1,396 @@
+import hashlib
+import logging
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from itertools import chain
+from html import unescape
+from pathlib import Path
+from urllib.parse import unquote, urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from src.agent.rate_limiter import RateLimiter
+except ImportError:
+    # src/scraper-დან გაშვებისას (python info_scraper.py)
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+    from src.agent.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+UUID_RE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE)
+LINK_RE = re.compile(r'<(?:a|iframe|embed|object)\b[^>]*?\b(?:href|src|data)="([^"]+)"', re.IGNORECASE)
+PDF_URL_RE = re.compile(r'([./]pdf($|\?)|/download)', re.IGNORECASE)
+FILENAME_RE = re.compile(r"filename\*?=(?:UTF-8'')?\"?([^\";]+)\"?", re.IGNORECASE)
+# PDF_URL_RE ნებისმიერ /download ბმულს იღებს - პასუხი შეიძლება HTML (შეცდომის / ავტორიზაციის გვერდი) იყოს
+PDF_CONTENT_TYPES = ('application/pdf', 'application/x-pdf', 'application/octet-stream', 'binary/octet-stream')
+PDF_MAGIC = b'%PDF'
+
+DOWNLOAD_BUTTON_XPATH = (
+    "//div[contains(@class, 'cursor-pointer') and contains(@class, 'gap-1-5') "
+    "and .//rs-icon[@key='download-cloud']]"
+)
+PDF_OPTION_XPATH = (
+    "//div[contains(text(), 'Adobe PDF')]/ancestor::div[contains(@class, 'cursor-pointer')] "
+    "| //div[contains(text(), 'Adobe PDF')]"
+)
+CONFIRM_BUTTON_XPATH = "//button[contains(@class, 'bg-blue-primary') and contains(text(), 'ჩამოტვირთვა')]"
+
+
+class NotPDFError(ValueError):
+    pass
+
+
+def document_uuid(detail_url):
+    # /ka/workspace/document/<uuid>?openFromSearch=true -> <uuid>
+    match = UUID_RE.search(detail_url or "")
+    return match.group(0).lower() if match else None
+
+
+def safe_filename(name):
+    # Chrome-ის მსგავსად: "/" -> "_" (გადაწყვეტილება №25852/2/2025 -> №25852_2_2025)
+    name = re.sub(r'[\\/:*?"<>|\x00-\x1f]+', '_', name).strip(' .')
+    return name or "document"
+
+
+def find_pdf_url(html, page_url):
+    # SSR გვერდზე პირდაპირი ბმული PDF-ზე (a/iframe/embed/object), თუ არსებობს.
+    # მთლიანი DOM-ის აგება არ სჭირდება - ატრიბუტები რეგექსით იკითხება
+    for url in LINK_RE.findall(html):
+        url = unescape(url)
+        if PDF_URL_RE.search(url):
+            return urljoin(page_url, url)
+
+    return None
+
+
+def _wait_for_download(directory, before, timeout):
+    # ახალი .pdf ფაილი, რომლის ჩაწერაც დასრულდა (.crdownload აღარ არის)
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        if not any(directory.glob("*.crdownload")):
+            new_files = set(directory.glob("*.pdf")) - before
+            if new_files:
+                return max(new_files, key=lambda path: path.stat().st_mtime)
+        time.sleep(0.2)
+
+    return None
+
+
+class BrowserPool:
+    # გრძელვადიანი headless Chrome სესიები; თითოეულს საკუთარი download დირექტორია აქვს,
+    # რომ პარალელური ჩამოტვირთვები ერთმანეთში არ აირიოს. ChromeDriverManager ერთხელ ეშვება
+
+    def __init__(self, size=2, download_dir="data/temp_downloads", wait_timeout=20):
+        self.size = size
+        self.download_dir = Path(download_dir).absolute()
+        self.wait_timeout = wait_timeout
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._driver_path = None
+
+    def _create(self, number):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        with self._lock:
+            if self._driver_path is None:
+                self._driver_path = ChromeDriverManager().install()
+
+        download_dir = self.download_dir / f"browser-{number}"
+        download_dir.mkdir(parents=True, exist_ok=True)
+
+        options = Options()
+        options.add_argument('--headless')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-gpu')
+        options.add_experimental_option("prefs", {
+            "download.default_directory": str(download_dir),
+            "download.prompt_for_download": False,
+            "plugins.always_open_pdf_externally": True
+        })
+
+        driver = webdriver.Chrome(service=Service(self._driver_path), options=options)
+        driver.download_dir = download_dir
+        return driver
+
+    @contextmanager
+    def driver(self):
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            # ახალი სესია მხოლოდ size-მდე, დანარჩენები თავისუფალ სესიას ელოდებიან
+            with self._lock:
+                number = self._created + 1 if self._created < self.size else None
+                if number:
+                    self._created = number
+
+            if number:
+                try:
+                    driver = self._create(number)
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                driver = self._idle.get()
+
+        try:
+            yield driver
+        except Exception:
+            # დაზიანებული სესია პულში აღარ ბრუნდება
+            driver.quit()
+            with self._lock:
+                self._created -= 1
+            raise
+        else:
+            self._idle.put(driver)
+
+    def get_html(self, url, wait_css=None):
+        # გვერდის HTML JavaScript-ის შესრულების შემდეგ; wait_css - ელემენტი, რომლის გამოჩენასაც ველოდებით
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        with self.driver() as driver:
+            driver.get(url)
+            try:
+                WebDriverWait(driver, self.wait_timeout).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, wait_css or "body"))
+                )
+            except TimeoutException:
+                # ცარიელი შედეგების გვერდი - ბარათები არ ჩნდება
+                logger.info(f"No {wait_css} on {url} after {self.wait_timeout}s")
+            return driver.page_source
+
+    def download(self, url):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        with self.driver() as driver:
+            wait = WebDriverWait(driver, self.wait_timeout)
+            before = set(driver.download_dir.glob("*.pdf"))
+
+            driver.get(url)
+
+            button = wait.until(EC.element_to_be_clickable((By.XPATH, DOWNLOAD_BUTTON_XPATH)))
+            driver.execute_script("arguments[0].click();", button)
+
+            try:
+                option = wait.until(EC.element_to_be_clickable((By.XPATH, PDF_OPTION_XPATH)))
+                driver.execute_script("arguments[0].click();", option)
+            except Exception as e:
+                logger.warning(f"PDF option not found: {e}")
+
+            confirm = wait.until(EC.element_to_be_clickable((By.XPATH, CONFIRM_BUTTON_XPATH)))
+            driver.execute_script("arguments[0].click();", confirm)
+
+            return _wait_for_download(driver.download_dir, before, self.wait_timeout * 3)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().quit()
+            except queue.Empty:
+                break
+
+
+class DocumentDownloader:
+    # დოკუმენტების ჩამოტვირთვა ერთი pooled requests.Session-ით:
+    #   1. pdf_url_template (მაგ. "{base_url}/api/documents/{uuid}/pdf"), თუ ცნობილია;
+    #   2. ბმული დეტალების გვერდის SSR HTML-ში;
+    #   3. fallback - BrowserPool (use_browser=True).
+    # ერთდროულად max_workers მოთხოვნა, სერვერზე არაუმეტეს requests_per_minute
+
+    def __init__(self, base_url="https://infohub.rs.ge", download_dir="data/raw/pdfs", max_workers=4,
+                 requests_per_minute=60, timeout=30, pdf_url_template=None, use_browser=True,
+                 browser_pool_size=2, session=None, manifest=None):
+        self.base_url = base_url
+        self.download_dir = Path(download_dir)
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        # src.scraper.manifest.DocumentManifest - ფაილის სახელების კონფლიქტების შესამოწმებლად
+        self.manifest = manifest
+        self.pdf_url_template = pdf_url_template or os.getenv("INFOHUB_PDF_URL_TEMPLATE")
+        self.rate_limiter = RateLimiter(requests_per_minute, burst=max_workers) if requests_per_minute else None
+
+        self.session = session or requests.Session()
+        self.session.headers.setdefault('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+        retry = Retry(total=3, backoff_factor=1.0, status_forcelist=(429, 500, 502, 503, 504), respect_retry_after_header=True)
+        # +1: ძიების გვერდები (SearchCrawler) იმავე session-ით, ჩამოტვირთვების პარალელურად
+        adapter = HTTPAdapter(pool_connections=max_workers + 1, pool_maxsize=max_workers + 1, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.browsers = BrowserPool(browser_pool_size, self.download_dir.parent / "temp_downloads") if use_browser else None
+        self.stats = {'http': 0, 'browser': 0, 'failed': 0}
+        self._reserved = {}
+        self._names_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        # ყველა HTTP მოთხოვნა infohub-ზე (ძიების გვერდებიც) - საერთო requests_per_minute ლიმიტით
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        response = self.session.get(url, timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def detail_url(self, document):
+        return urljoin(self.base_url, document['detail_url'])
+
+    def resolve_pdf_url(self, document):
+        uuid = document_uuid(document['detail_url'])
+
+        if self.pdf_url_template and uuid:
+            return self.pdf_url_template.format(base_url=self.base_url.rstrip('/'), uuid=uuid)
+
+        page_url = self.detail_url(document)
+        return find_pdf_url(self.get(page_url).text, page_url)
+
+    def _filename(self, response, document):
+        match = FILENAME_RE.search(response.headers.get('Content-Disposition', ''))
+        if match:
+            return safe_filename(unquote(match.group(1)))
+
+        name = document.get('doc_number') or document_uuid(document['detail_url']) or "document"
+        return safe_filename(name) + ".pdf"
+
+    def _target(self, document, filename):
+        target = self.download_dir / filename
+        uuid = document_uuid(document['detail_url'])
+
+        # იგივე სახელი სხვა დოკუმენტს ეკუთვნის (მაგ. "ბრძანება N 2546" სხვა წლიდან) ან პარალელურად
+        # სხვა ნაკადი წერს - UUID-ის სუფიქსი. "_" არა, რომ ნომერს (№25852_2_2025) არ მიეწებოს
+        with self._names_lock:
+            owner = self._reserved.get(target)
+            if owner is None and self.manifest and target.exists():
+                owner = self.manifest.path_owner(target)
+            if owner is None and target.exists() and not self.manifest:
+                owner = uuid
+
+            if uuid and owner not in (None, uuid):
+                target = target.with_name(f"{target.stem} [{uuid}]{target.suffix}")
+            self._reserved[target] = uuid
+
+        return target
+
+    def _check_pdf(self, response, first):
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in PDF_CONTENT_TYPES:
+            raise NotPDFError(f"unexpected Content-Type {content_type} from {response.url}")
+
+        # სპეციფიკაციით %PDF პირველ 1024 ბაიტშია
+        if PDF_MAGIC not in first[:1024]:
+            raise NotPDFError(f"response from {response.url} is not a PDF")
+
+    def _save(self, response, document):
+        blocks = response.iter_content(chunk_size=64 * 1024)
+        first = next(blocks, b'')
+
+        # არავალიდური პასუხი ფაილად არ ინახება და სახელს არ იკავებს
+        try:
+            self._check_pdf(response, first)
+        except NotPDFError:
+            response.close()
+            raise
+
+        target = self._target(document, self._filename(response, document))
+        temp = target.with_name(target.name + ".part")
+        digest = hashlib.sha256()
+
+        with open(temp, 'wb') as f:
+            for block in chain([first], blocks):
+                digest.update(block)
+                f.write(block)
+
+        # ერთი და იგივე დოკუმენტი იმავე სახელით იცვლება, "(1)" ასლები აღარ იქმნება
+        os.replace(temp, target)
+        document['content_hash'] = digest.hexdigest()
+        return target
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def download(self, document):
+        # აბრუნებს document-ს pdf_path / download_status / error ველებით
+        document = dict(document)
+
+        try:
+            pdf_url = self.resolve_pdf_url(document)
+            path = None
+
+            if pdf_url:
+                response = self.get(pdf_url, stream=True)
+                try:
+                    path = self._save(response, document)
+                    self._count('http')
+                except NotPDFError as e:
+                    if not self.browsers:
+                        raise
+                    logger.warning(f"{e}, falling back to browser")
+
+            if path is None and self.browsers:
+                if self.rate_limiter:
+                    self.rate_limiter.acquire()
+                path = self.browsers.download(self.detail_url(document))
+                if path:
+                    # იგივე სახელების წესი, რაც HTTP-ით ჩამოტვირთვისას (სხვა დოკუმენტის ფაილი არ გადაიწერება)
+                    target = self._target(document, safe_filename(path.name))
+                    os.replace(path, target)
+                    path = target
+                    self._count('browser')
+
+            if not path:
+                raise RuntimeError("PDF not found")
+
+            document['pdf_path'] = str(path)
+            document['download_status'] = 'success'
+
+        except Exception as e:
+            logger.warning(f"Download failed for {document.get('detail_url')}: {e}")
+            document['pdf_path'] = None
+            document['download_status'] = 'failed'
+            document['error'] = str(e)
+            self._count('failed')
+
+        return document
+
+    def download_many(self, documents):
+        # generator: შედეგები დასრულების მიხედვით; documents შეიძლება თავადაც generator იყოს
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = set()
+
+            for document in documents:
+                pending.add(pool.submit(self.download, document))
+
+                # შეზღუდული რიგი - დიდი სია მთლიანად მეხსიერებაში არ იტვირთება
+                if len(pending) >= self.max_workers * 2:
+                    done = next(as_completed(pending))
+                    pending.remove(done)
+                    yield done.result()
+
+            for future in as_completed(pending):
+                yield future.result()
+
+    def close(self):
+        self.session.close()
+        if self.browsers:
+            self.browsers.close()
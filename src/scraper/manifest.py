@@ -0,0 +1,234 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+try:
+    from src.scraper.downloader import document_uuid
+except ImportError:
+    from downloader import document_uuid
+
+logger = logging.getLogger(__name__)
+
+# ბარათის ველები, რომლებიც metadata.json-ში გადადის
+CARD_FIELDS = ('title', 'doc_number', 'date', 'description')
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DocumentManifest:
+    # სკრაპერის მდგომარეობა SQLite-ში, გასაღები - დეტალების URL-ის UUID.
+    # documents: ბარათის ველები, ჩამოტვირთვის სტატუსი, ფაილი და მისი sha256.
+    # changes: ყოველი გაშვების (run) ახალი / შეცვლილი დოკუმენტები - შემდეგი ეტაპებისთვის
+
+    def __init__(self, db_path="data/raw/manifest.sqlite"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        self.db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "uuid TEXT PRIMARY KEY, detail_url TEXT NOT NULL, card TEXT NOT NULL, "
+            "status TEXT NOT NULL, pdf_path TEXT, content_hash TEXT, error TEXT, "
+            "first_seen REAL NOT NULL, last_seen REAL NOT NULL, downloaded_at REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS documents_hash ON documents(content_hash)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS documents_path ON documents(pdf_path)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS changes ("
+            "run_id INTEGER NOT NULL, uuid TEXT NOT NULL, change TEXT NOT NULL, "
+            "pdf_path TEXT, PRIMARY KEY (run_id, uuid))"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "run_id INTEGER PRIMARY KEY AUTOINCREMENT, started REAL NOT NULL, finished REAL)"
+        )
+        self.db.commit()
+
+        self.run_id = None
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def start_run(self):
+        with self._lock:
+            cursor = self.db.execute("INSERT INTO runs (started) VALUES (?)", (time.time(),))
+            self.db.commit()
+        self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def finish_run(self):
+        with self._lock:
+            self.db.execute("UPDATE runs SET finished = ? WHERE run_id = ?", (time.time(), self.run_id))
+            self.db.commit()
+
+    def get(self, uuid):
+        row = self.db.execute(
+            "SELECT uuid, detail_url, card, status, pdf_path, content_hash, error FROM documents WHERE uuid = ?",
+            (uuid,)
+        ).fetchone()
+        return self._row_to_document(row) if row else None
+
+    @staticmethod
+    def _row_to_document(row):
+        uuid, detail_url, card, status, pdf_path, content_hash, error = row
+        document = json.loads(card)
+        document.update({
+            'uuid': uuid,
+            'detail_url': detail_url,
+            'pdf_path': pdf_path,
+            'download_status': status,
+            'content_hash': content_hash
+        })
+        if error:
+            document['error'] = error
+        return document
+
+    def is_downloaded(self, uuid):
+        # წარმატებით ჩამოტვირთული და ფაილი ჯერ კიდევ დისკზეა
+        row = self.db.execute("SELECT status, pdf_path FROM documents WHERE uuid = ?", (uuid,)).fetchone()
+        return bool(row) and row[0] == 'success' and bool(row[1]) and Path(row[1]).exists()
+
+    def path_owner(self, pdf_path):
+        with self._lock:
+            row = self.db.execute("SELECT uuid FROM documents WHERE pdf_path = ?", (str(pdf_path),)).fetchone()
+        return row[0] if row else None
+
+    def discover(self, document):
+        # ბარათი ძიების შედეგებიდან; აბრუნებს True-ს, თუ დოკუმენტი ახალია
+        uuid = document_uuid(document['detail_url'])
+        card = json.dumps({field: document.get(field) for field in CARD_FIELDS}, ensure_ascii=False)
+        now = time.time()
+
+        with self._lock:
+            exists = self.db.execute("SELECT 1 FROM documents WHERE uuid = ?", (uuid,)).fetchone()
+            if exists:
+                self.db.execute(
+                    "UPDATE documents SET card = ?, detail_url = ?, last_seen = ? WHERE uuid = ?",
+                    (card, document['detail_url'], now, uuid)
+                )
+            else:
+                self.db.execute(
+                    "INSERT INTO documents (uuid, detail_url, card, status, first_seen, last_seen) "
+                    "VALUES (?, ?, ?, 'discovered', ?, ?)",
+                    (uuid, document['detail_url'], card, now, now)
+                )
+            self.db.commit()
+
+        return not exists
+
+    def record_download(self, document):
+        # ჩამოტვირთვის შედეგი. იდენტური შინაარსის ფაილი (სხვა UUID-ით) ერთხელ ინახება;
+        # ცვლილება (ახალი ან შეცვლილი შინაარსი) changes ცხრილში იწერება
+        uuid = document_uuid(document['detail_url'])
+        pdf_path = document.get('pdf_path')
+        status = document.get('download_status', 'failed')
+        change = None
+
+        if status != 'success' or not pdf_path:
+            with self._lock:
+                self.db.execute(
+                    "UPDATE documents SET status = CASE WHEN status = 'success' THEN status ELSE ? END, "
+                    "error = ? WHERE uuid = ?",
+                    (status, document.get('error'), uuid)
+                )
+                self.db.commit()
+            return document
+
+        content_hash = document.get('content_hash') or file_hash(pdf_path)
+
+        with self._lock:
+            previous = self.db.execute("SELECT content_hash, pdf_path FROM documents WHERE uuid = ?", (uuid,)).fetchone()
+            duplicate = self.db.execute(
+                "SELECT pdf_path FROM documents WHERE content_hash = ? AND uuid != ? AND status = 'success'",
+                (content_hash, uuid)
+            ).fetchone()
+
+            if duplicate and duplicate[0] != pdf_path and Path(duplicate[0]).exists():
+                logger.info(f"Duplicate of {duplicate[0]}: {pdf_path}")
+                Path(pdf_path).unlink(missing_ok=True)
+                pdf_path = duplicate[0]
+            elif not previous or previous[0] != content_hash:
+                change = 'updated' if previous and previous[0] else 'new'
+
+            self.db.execute(
+                "UPDATE documents SET status = 'success', pdf_path = ?, content_hash = ?, error = NULL, "
+                "downloaded_at = ? WHERE uuid = ?",
+                (pdf_path, content_hash, time.time(), uuid)
+            )
+            if change and self.run_id is not None:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO changes (run_id, uuid, change, pdf_path) VALUES (?, ?, ?, ?)",
+                    (self.run_id, uuid, change, pdf_path)
+                )
+            self.db.commit()
+
+        document = dict(document, pdf_path=pdf_path, content_hash=content_hash, uuid=uuid)
+        if change:
+            document['change'] = change
+        return document
+
+    def changed_documents(self, run_id=None):
+        run_id = run_id or self.run_id
+        rows = self.db.execute(
+            "SELECT c.uuid, c.change, c.pdf_path, d.detail_url FROM changes c "
+            "JOIN documents d ON d.uuid = c.uuid WHERE c.run_id = ? ORDER BY c.rowid",
+            (run_id,)
+        ).fetchall()
+        return [
+            {'uuid': uuid, 'change': change, 'pdf_path': pdf_path, 'detail_url': detail_url}
+            for uuid, change, pdf_path, detail_url in rows
+        ]
+
+    def documents(self):
+        rows = self.db.execute(
+            "SELECT uuid, detail_url, card, status, pdf_path, content_hash, error FROM documents "
+            "ORDER BY first_seen, rowid"
+        ).fetchall()
+        return [self._row_to_document(row) for row in rows]
+
+    def import_metadata(self, metadata_file):
+        # ძველი metadata.json-ის ერთჯერადი გადმოტანა, რომ უკვე ჩამოტვირთული დოკუმენტები ცნობილი იყოს
+        metadata_file = Path(metadata_file)
+        if not metadata_file.exists():
+            return 0
+
+        with open(metadata_file, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+
+        imported = 0
+        for entry in entries:
+            if not document_uuid(entry.get('detail_url')):
+                continue
+
+            self.discover(entry)
+            pdf_path = entry.get('pdf_path')
+            if entry.get('download_status') == 'success' and pdf_path and Path(pdf_path).exists():
+                self.record_download(entry)
+            imported += 1
+
+        logger.info(f"Imported {imported} documents from {metadata_file}")
+        return imported
+
+    def export_metadata(self, metadata_file):
+        # metadata.json ქვედა ეტაპებისთვის (document_metadata, ტექსტის ამოღება) - ატომური ჩაწერით
+        metadata_file = Path(metadata_file)
+        temp = metadata_file.with_name(metadata_file.name + ".tmp")
+
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump(self.documents(), f, ensure_ascii=False, indent=2)
+
+        temp.replace(metadata_file)
+
+    def close(self):
+        self.db.close()
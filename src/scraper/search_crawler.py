@@ -0,0 +1,191 @@
+import logging
+import re
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+try:
+    from src.scraper.downloader import document_uuid
+except ImportError:
+    from downloader import document_uuid
+
+logger = logging.getLogger(__name__)
+
+# ძიების შედეგის ბარათი = ბმული დოკუმენტის დეტალების გვერდზე
+DOCUMENT_LINK_CSS = 'a[href*="/workspace/document/"]'
+DOCUMENT_LINK_RE = re.compile(r'href="[^"]*/workspace/document/[0-9a-fA-F-]{36}')
+DOCUMENT_HREF_RE = re.compile(r'/workspace/document/')
+
+DOC_NUMBER_RE = re.compile(r'N\s*(\d+)')
+DOC_ID_RE = re.compile(r'#:\s*(\d+)')
+DATE_RE = re.compile(r'\d{1,2}\s+\S+\s+\d{4}')
+
+
+def _is_card(tag, classes):
+    return tag == 'rs-card' or 'card' in (classes or '').lower()
+
+
+def make_document(href, title, text, description=None):
+    # ველები იგივე წესით, რაც InfoScraper._extract_* - metadata.json-ის ფორმატი არ იცვლება
+    match = DOC_NUMBER_RE.search(text)
+    doc_number = f"N {match.group(1)}" if match else None
+    if not doc_number:
+        match = DOC_ID_RE.search(text)
+        doc_number = match.group(1) if match else None
+
+    date = DATE_RE.search(text)
+
+    return {
+        'detail_url': href,
+        'title': title or "Untitled",
+        'doc_number': doc_number,
+        'date': date.group(0) if date else None,
+        'description': description
+    }
+
+
+def _iter_selectolax(html):
+    # lexbor backend (selectolax >= 1.0-ში ძველი selectolax.parser აღარ მუშაობს)
+    from selectolax.lexbor import LexborHTMLParser
+
+    for link in LexborHTMLParser(html).css(DOCUMENT_LINK_CSS):
+        card = link
+        while card.parent is not None and not _is_card(card.tag, card.attributes.get('class')):
+            card = card.parent
+        if card.parent is None:
+            card = link
+
+        heading = card.css_first('h1, h2, h3, [class*="title"]')
+        description = card.css_first('p, [class*="description"]')
+        yield (
+            link.attributes.get('href'),
+            (heading or link).text(separator='', strip=True),
+            card.text(separator=' '),
+            description.text(strip=True) if description else None
+        )
+
+
+def _iter_lxml(html):
+    import lxml.html
+
+    for link in lxml.html.fromstring(html).xpath('//a[contains(@href, "/workspace/document/")]'):
+        card = next((node for node in link.iterancestors() if _is_card(node.tag, node.get('class'))), link)
+
+        heading = card.xpath('.//h1 | .//h2 | .//h3 | .//*[contains(@class, "title")]')
+        description = card.xpath('.//p | .//*[contains(@class, "description")]')
+        yield (
+            link.get('href'),
+            ''.join(part.strip() for part in (heading[0] if heading else link).itertext()),
+            ' '.join(card.itertext()),
+            description[0].text_content().strip() if description else None
+        )
+
+
+def _iter_bs4(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    # find_all(href=regex) - soupsieve-ის CSS selector-ზე რამდენჯერმე სწრაფი
+    for link in soup.find_all('a', href=DOCUMENT_HREF_RE):
+        card = link.find_parent(lambda tag: _is_card(tag.name, ' '.join(tag.get('class') or []))) or link
+
+        heading = (
+            card.find('h1') or card.find('h2') or card.find('h3') or
+            card.find(class_=lambda x: x and 'title' in str(x).lower())
+        )
+        description = card.find('p') or card.find(class_=lambda x: x and 'description' in str(x).lower())
+        yield (
+            link.get('href'),
+            (heading or link).get_text(strip=True),
+            card.get_text(),
+            description.get_text(strip=True) if description else None
+        )
+
+
+PARSERS = {'selectolax': _iter_selectolax, 'lxml': _iter_lxml, 'bs4': _iter_bs4}
+
+
+def available_parser(preferred=None):
+    # selectolax > lxml > BeautifulSoup (html.parser); პირველი, რომელიც დაინსტალირებულია
+    for name in ([preferred] if preferred else ['selectolax', 'lxml', 'bs4']):
+        try:
+            __import__({'selectolax': 'selectolax.lexbor', 'lxml': 'lxml.html', 'bs4': 'bs4'}[name])
+            return name
+        except ImportError:
+            continue
+    raise ImportError(f"HTML parser {preferred} is not installed")
+
+
+def iter_cards(html, parser=None):
+    # generator: ბარათები დოკუმენტის რიგით, UUID-ით უნიკალური (ერთ ბარათში რამდენიმე ბმული - ერთხელ)
+    if not DOCUMENT_LINK_RE.search(html):
+        return
+
+    seen = set()
+    for href, title, text, description in PARSERS[available_parser(parser)](html):
+        uuid = document_uuid(href)
+        if not uuid or uuid in seen:
+            continue
+        seen.add(uuid)
+        yield make_document(href, title, text, description)
+
+
+class SearchCrawler:
+    # ძიების შედეგების ყველა გვერდი generator-ად: დოკუმენტი გადაეცემა მომდევნო ეტაპს (ჩამოტვირთვას)
+    # აღმოჩენისთანავე. fetch(url) -> HTML; ცარიელი ან მხოლოდ უკვე ნანახი გვერდი პაგინაციას ამთავრებს
+
+    def __init__(self, fetch, page_param="page", first_page=1, parser=None):
+        self.fetch = fetch
+        self.page_param = page_param
+        self.first_page = first_page
+        self.parser = available_parser(parser)
+        logger.info(f"Search results parser: {self.parser}")
+        if self.parser == 'bs4':
+            logger.warning("selectolax / lxml not installed (see requirements.txt), parsing with BeautifulSoup (slower)")
+        self.seen = set()
+        self.stats = {'pages': 0, 'cards': 0, 'duplicates': 0, 'fetch_s': 0.0, 'parse_s': 0.0}
+        self._last_page_new = 0
+
+    def page_url(self, search_url, page):
+        parts = urlsplit(search_url)
+        query = [(key, value) for key, value in parse_qsl(parts.query) if key != self.page_param]
+        query.append((self.page_param, str(page)))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    def iter_page(self, html):
+        new_cards = 0
+        started = time.perf_counter()
+
+        for document in iter_cards(html, self.parser):
+            uuid = document_uuid(document['detail_url'])
+            if uuid in self.seen:
+                self.stats['duplicates'] += 1
+                continue
+
+            self.seen.add(uuid)
+            new_cards += 1
+            self.stats['cards'] += 1
+            self.stats['parse_s'] += time.perf_counter() - started
+            yield document
+            started = time.perf_counter()
+
+        self.stats['parse_s'] += time.perf_counter() - started
+        self.stats['pages'] += 1
+        self._last_page_new = new_cards
+
+    def iter_documents(self, search_url, max_pages=None):
+        page = self.first_page
+
+        while not max_pages or page - self.first_page < max_pages:
+            started = time.perf_counter()
+            html = self.fetch(self.page_url(search_url, page))
+            self.stats['fetch_s'] += time.perf_counter() - started
+
+            self._last_page_new = 0
+            if html:
+                yield from self.iter_page(html)
+
+            if not self._last_page_new:
+                logger.info(f"No new documents on page {page}, stopping")
+                break
+
+            page += 1
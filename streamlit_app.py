@@ -1,5 +1,6 @@
 import streamlit as st
 from rag_agent import GeorgianTaxRAGAgent
+from src.agent.metrics import PrometheusExporter
 import os
 from pathlib import Path
 
@@ -60,7 +61,14 @@ def load_agent():
         except:
             st.info("გთხოვთ დააყენოთ API key Streamlit Cloud Secrets-ში")
             st.stop()
-    return GeorgianTaxRAGAgent(api_key)
+    agent = GeorgianTaxRAGAgent(api_key)
+    
+    # RAG_METRICS_PORT=9108 -> Prometheus-ის /metrics endpoint
+    metrics_port = os.getenv("RAG_METRICS_PORT")
+    if metrics_port:
+        PrometheusExporter(agent.metrics).serve(int(metrics_port))
+    
+    return agent
 
 
 with st.sidebar:
@@ -124,30 +132,50 @@ with col2:
 
 
 if search_button and question:
-    with st.spinner("🔄 ვამუშავებ თქვენს კითხვას..."):
-        try:
-            
-            result = agent.answer_question(question)
-            
-          
-            st.markdown("###  პასუხი:")
-            st.markdown(f'<div class="answer-box">{result["answer"]}</div>', unsafe_allow_html=True)
-            
-            st.markdown("### 📚 გამოყენებული წყაროები:")
-            sources = list(set(result['sources']))
-            
-            for i, source in enumerate(sources, 1):
-                st.markdown(f'<div class="source-box"><b>{i}.</b> {source}</div>', unsafe_allow_html=True)
-            
-            with st.expander(" დამატებითი ინფორმაცია"):
-                st.write(f"**გამოყენებული ჩანქების რაოდენობა:** {result['context_used']}")
-                st.write(f"**სულ წყაროები:** {len(sources)}")
-            
-            st.session_state.question = ""
+    try:
+        
+        st.markdown("###  პასუხი:")
+        answer_placeholder = st.empty()
+        answer_placeholder.markdown("🔄 ვამუშავებ თქვენს კითხვას...")
+        
+        # პასუხი ჩანს ტოკენების მოსვლისთანავე
+        answer_text = ""
+        result = None
+        for event in agent.answer_question_stream(question):
+            if event['type'] == 'text':
+                answer_text += event['text']
+                answer_placeholder.markdown(f'<div class="answer-box">{answer_text}▌</div>', unsafe_allow_html=True)
+            elif event['type'] == 'done':
+                result = event
+        
+        answer_placeholder.markdown(f'<div class="answer-box">{result["answer"]}</div>', unsafe_allow_html=True)
+        
+        st.markdown("### 📚 გამოყენებული წყაროები:")
+        sources = list(set(result['sources']))
+        
+        for i, source in enumerate(sources, 1):
+            st.markdown(f'<div class="source-box"><b>{i}.</b> {source}</div>', unsafe_allow_html=True)
+        
+        with st.expander(" დამატებითი ინფორმაცია"):
+            st.write(f"**გამოყენებული ჩანქების რაოდენობა:** {result['context_used']}")
+            st.write(f"**სულ წყაროები:** {len(sources)}")
+            usage = result.get('usage') or {}
+            if usage.get('cache_read_input_tokens') or usage.get('cache_creation_input_tokens'):
+                st.write(
+                    f"**Prompt cache:** წაკითხული {usage['cache_read_input_tokens']}, "
+                    f"ჩაწერილი {usage['cache_creation_input_tokens']} ტოკენი"
+                )
             
-        except Exception as e:
-            st.error(f" შეცდომა: {e}")
-            st.info("გთხოვთ, სცადოთ თავიდან ან დაუკავშირდით ადმინისტრატორს.")
+            timings = result.get('timings') or {}
+            if timings:
+                st.write("**დრო ეტაპების მიხედვით (ms):**")
+                st.table({'ეტაპი': list(timings), 'ms': list(timings.values())})
+        
+        st.session_state.question = ""
+        
+    except Exception as e:
+        st.error(f" შეცდომა: {e}")
+        st.info("გთხოვთ, სცადოთ თავიდან ან დაუკავშირდით ადმინისტრატორს.")
 
 elif search_button and not question:
     st.warning(" გთხოვთ, შეიყვანოთ კითხვა!")
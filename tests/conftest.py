@@ -0,0 +1,74 @@
+import hashlib
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import chromadb
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import rag_agent
+from rag_agent import GeorgianTaxRAGAgent
+
+CHUNKS = [
+    ("ბრძანება N 2546.pdf", "დღგ-ის გადამხდელად რეგისტრაცია ხორციელდება განცხადების საფუძველზე."),
+    ("ბრძანება N 2546.pdf", "საჩივარი ნაწილობრივ დაკმაყოფილდა, ჯარიმა გაუქმდა."),
+    ("ბრძანება N 996.pdf", "ქონების გადასახადის დეკლარაცია წარედგინება ელექტრონულად."),
+]
+
+
+class HashEmbedder:
+    # SentenceTransformer-ის ნაცვლად: დეტერმინისტული ვექტორები ტექსტის ჰეშიდან (მოდელის ჩამოტვირთვის გარეშე)
+    max_seq_length = 128
+    tokenizer = None
+    dim = 64
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, **kwargs):
+        vectors = []
+        for text in texts:
+            digest = hashlib.sha256(text.encode('utf-8')).digest() * 2
+            vector = np.frombuffer(digest, dtype=np.uint8)[:self.dim].astype(np.float32) - 128
+            vectors.append(vector / np.linalg.norm(vector))
+        return np.array(vectors)
+
+
+@pytest.fixture
+def make_agent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    embedder = HashEmbedder()
+    monkeypatch.setattr(
+        rag_agent, "EmbeddingBackend",
+        lambda model_name, backend=None: SimpleNamespace(model=embedder, backend="torch", cache_name="hash-test")
+    )
+
+    collection = chromadb.PersistentClient(path=str(tmp_path / "vectordb")).get_or_create_collection("georgian_tax_docs")
+    counts = {}
+    for source, _ in CHUNKS:
+        counts[source] = counts.get(source, 0) + 1
+    seen = {}
+    for i, (source, text) in enumerate(CHUNKS):
+        chunk_id = seen.get(source, 0)
+        seen[source] = chunk_id + 1
+        collection.add(
+            ids=[f"chunk-{i}"],
+            documents=[text],
+            embeddings=embedder.encode([text]).tolist(),
+            metadatas=[{'source': source, 'source_path': f"data/raw/pdfs/{source}",
+                        'chunk_id': chunk_id, 'total_chunks': counts[source]}]
+        )
+
+    def make(client, **kwargs):
+        kwargs.setdefault('hybrid', False)
+        return GeorgianTaxRAGAgent(
+            api_key=None,
+            client=client,
+            warmup=False,
+            persist_dir=str(tmp_path / "vectordb"),
+            embedding_cache_dir=str(tmp_path / "embedding_cache"),
+            **kwargs
+        )
+
+    return make
@@ -0,0 +1,23 @@
+import numpy as np
+
+from src.agent.answer_cache import SemanticAnswerCache
+
+
+def test_put_appends_to_matrix_and_matches_reload(tmp_path):
+    cache = SemanticAnswerCache(db_path=tmp_path / "answers.sqlite", max_entries=3)
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(5, 8)).astype(np.float32)
+
+    for i, vector in enumerate(vectors[:3]):
+        cache.put(f"კითხვა {i}", vector, [f"chunk-{i}"], f"პასუხი {i}", [])
+    cache.put("ნომრით", None, ["chunk-9"], "პასუხი", [])
+    assert cache.lookup(vectors[1], ["chunk-1"])['answer'] == "პასუხი 1"
+
+    # max_entries-ის გადაჭარბებისას ყველაზე ძველი იშლება და მატრიცა თავიდან იტვირთება
+    cache.put("კითხვა 4", vectors[4], ["chunk-4"], "პასუხი 4", [])
+    appended = (list(cache._ids), cache._chunk_ids, cache._matrix.copy())
+    cache._load()
+
+    assert appended[0] == cache._ids and appended[1] == cache._chunk_ids
+    assert np.allclose(appended[2], cache._matrix)
+    assert cache.lookup(vectors[4], ["chunk-4"])['answer'] == "პასუხი 4"
@@ -0,0 +1,20 @@
+import sqlite3
+
+import numpy as np
+
+from src.processing.embedding_cache import EmbeddingCache
+
+
+def test_reads_do_not_fail_while_builder_holds_write_lock(tmp_path):
+    cache = EmbeddingCache("model", cache_dir=tmp_path, touch_batch=1)
+    keys = [cache.key(f"ტექსტი {i}") for i in range(3)]
+    cache.put_many(keys, np.ones((3, 4)))
+
+    builder = sqlite3.connect(str(cache.cache_dir / "index.sqlite"))
+    builder.execute("BEGIN IMMEDIATE")
+    assert all(vector is not None for vector in cache.get_many(keys[:2]))
+    builder.rollback()
+
+    # გადადებული LRU განახლებები შემდეგ წაკითხვაზე იწერება
+    cache.get_many(keys[2:])
+    assert cache._touched == {}
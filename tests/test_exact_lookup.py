@@ -0,0 +1,55 @@
+from src.agent.fake_llm import FakeAnthropic
+from src.processing.lexical_index import LexicalIndex
+
+from conftest import CHUNKS
+
+QUESTION = "რას ადგენს ბრძანება N 2546?"
+
+
+def build_lexical_index(path):
+    chunks = [(f"chunk-{i}", f"{source}\n{text}") for i, (source, text) in enumerate(CHUNKS)]
+    return LexicalIndex.build(chunks, path)
+
+
+def test_exact_id_question_is_not_embedded(make_agent, tmp_path):
+    build_lexical_index(tmp_path / "lexical_index")
+    agent = make_agent(FakeAnthropic(), hybrid=True, lexical_index_dir=str(tmp_path / "lexical_index"))
+
+    embedded = []
+    embed_query = agent.embed_query
+    agent.embed_query = lambda question: embedded.append(question) or embed_query(question)
+
+    first = agent.answer_question(QUESTION)
+    second = agent.answer_question(QUESTION)
+
+    assert embedded == []
+    assert set(first['sources']) == {"ბრძანება N 2546.pdf"}
+    # პასუხების ქეში ნომრით ძებნის კითხვას ტექსტით პოულობს
+    assert first['cached'] is False and second['cached'] is True
+    assert second['answer'] == first['answer']
+
+
+def test_incremental_update_matches_full_build(tmp_path):
+    index = build_lexical_index(tmp_path / "incremental")
+    added = [("chunk-1", "ბრძანება N 2546.pdf\nსაჩივარი არ დაკმაყოფილდა."), ("chunk-9", "ბრძანება N 77.pdf\nაქციზი")]
+    index = index.update(added, removed={"chunk-2"}, index_version="2")
+
+    chunks = [("chunk-0", f"{CHUNKS[0][0]}\n{CHUNKS[0][1]}")] + added
+    full = LexicalIndex.build(chunks, tmp_path / "full", index_version="2")
+
+    assert sorted(index.chunk_ids) == sorted(full.chunk_ids)
+    assert index.meta == full.meta
+    for query in ("საჩივარი დაკმაყოფილდა", "N 77", "N 996", "ქონების დეკლარაცია"):
+        assert sorted(index.search(query)) == sorted(full.search(query))
+        assert sorted(index.exact_matches(query)) == sorted(full.exact_matches(query))
+
+
+def test_batch_keeps_fallback_embedding_for_unmatched_id(make_agent, tmp_path):
+    build_lexical_index(tmp_path / "lexical_index")
+    agent = make_agent(FakeAnthropic(), hybrid=True, lexical_index_dir=str(tmp_path / "lexical_index"))
+
+    # N 99999 ინდექსში არ არის - ვექტორული ძებნით პასუხობს და ქეშში ემბედინგით ინახება
+    results = agent.answer_questions([QUESTION, "რას ადგენს ბრძანება N 99999?"])
+
+    assert all('error' not in result for result in results)
+    assert agent.answer_cache.stats()['size'] == 1
@@ -0,0 +1,49 @@
+from rag_agent import GeorgianTaxRAGAgent
+from src.agent.fake_llm import FakeAnthropic
+from src.processing.chunking import estimate_tokens
+
+QUESTION = "როგორ ხდება დღგ-ის რეგისტრაცია?"
+
+
+def test_system_prompt_clears_cache_minimum():
+    assert estimate_tokens(GeorgianTaxRAGAgent.system_prompt) >= GeorgianTaxRAGAgent.min_cacheable_tokens
+
+
+def test_request_shape_marks_only_stable_prefix(make_agent):
+    client = FakeAnthropic(require_cache_control=True)
+    agent = make_agent(client, answer_cache=False)
+
+    agent.answer_question(QUESTION)
+    request = client.requests[-1]
+
+    # validate() - ისივე შემოწმება, რასაც FakeAnthropic ყოველ მოთხოვნაზე აკეთებს
+    blocks, breakpoints = client.validate(request)
+    assert breakpoints == [0]
+
+    system = request['system']
+    assert isinstance(system, list) and len(system) == 1
+    assert system[0] == {
+        'type': 'text',
+        'text': GeorgianTaxRAGAgent.system_prompt,
+        'cache_control': {'type': 'ephemeral'}
+    }
+
+    # ცვლადი ნაწილი (კონტექსტი და კითხვა) - მხოლოდ user შეტყობინებაში, cache_control-ის გარეშე
+    content = request['messages'][0]['content']
+    assert request['messages'][0]['role'] == 'user'
+    assert isinstance(content, str)
+    assert QUESTION in content and "წყარო:" in content
+    assert QUESTION not in system[0]['text']
+
+
+def test_second_question_reads_prefix_from_cache(make_agent):
+    client = FakeAnthropic()
+    agent = make_agent(client, answer_cache=False)
+
+    first = agent.answer_question(QUESTION)
+    second = agent.answer_question("რა შედეგით დასრულდა საჩივარი?")
+
+    assert first['usage']['cache_creation_input_tokens'] >= client.min_cacheable_tokens
+    assert first['usage']['cache_read_input_tokens'] == 0
+    assert second['usage']['cache_read_input_tokens'] == first['usage']['cache_creation_input_tokens']
+    assert second['usage']['cache_creation_input_tokens'] == 0
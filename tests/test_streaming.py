@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import pytest
+
+from rag_agent import AgentOverloadedError, AsyncGeorgianTaxRAGAgent
+from src.agent.fake_llm import FakeAnthropic, FakeAsyncAnthropic, FakeStreamError
+
+ANSWER = "დღგ-ის რეგისტრაცია ხორციელდება განცხადებით [წყარო: ბრძანება N 2546.pdf]"
+QUESTION = "როგორ ხდება დღგ-ის რეგისტრაცია?"
+
+
+def answer_fn(request):
+    return ANSWER
+
+
+def test_stream_yields_deltas_incrementally_in_order(make_agent):
+    client = FakeAnthropic(answer_fn=answer_fn, token_delay=0.02)
+    agent = make_agent(client, answer_cache=False)
+
+    events = []
+    for event in agent.answer_question_stream(QUESTION):
+        events.append((time.perf_counter(), event))
+
+    texts = [event for _, event in events if event['type'] == 'text']
+    expected = FakeAnthropic.split_deltas(ANSWER)
+    assert [event['text'] for event in texts] == expected
+    assert len(texts) > 1
+
+    # ნაწილები გენერაციისთანავე მოდის და არა ერთად სტრიმის ბოლოს
+    arrivals = [arrived for arrived, event in events if event['type'] == 'text']
+    assert arrivals == sorted(arrivals)
+    assert arrivals[-1] - arrivals[0] >= 0.02 * (len(arrivals) - 1) * 0.5
+
+
+def test_stream_ends_with_done_event_and_usage(make_agent):
+    client = FakeAnthropic(answer_fn=answer_fn)
+    agent = make_agent(client, answer_cache=False)
+
+    events = list(agent.answer_question_stream(QUESTION))
+
+    assert [event['type'] for event in events].count('done') == 1
+    done = events[-1]
+    assert done['type'] == 'done'
+    assert done['answer'] == ANSWER
+    assert done['cached'] is False
+    assert done['sources']
+    assert done['usage']['output_tokens'] == len(FakeAnthropic.split_deltas(ANSWER))
+    assert done['usage']['input_tokens'] > 0
+    assert 'llm_first_token' in done['timings']
+
+
+def test_stream_error_midway_is_raised_and_not_cached(make_agent):
+    client = FakeAnthropic(answer_fn=answer_fn, stream_error_after=2)
+    agent = make_agent(client)
+
+    events = []
+    with pytest.raises(FakeStreamError):
+        for event in agent.answer_question_stream(QUESTION):
+            events.append(event)
+
+    assert [event['text'] for event in events] == FakeAnthropic.split_deltas(ANSWER)[:2]
+    assert all(event['type'] == 'text' for event in events)
+    # ნახევარი პასუხი ქეშში არ უნდა მოხვდეს - შემდეგი მოთხოვნა LLM-ს თავიდან მიმართავს
+    assert agent.answer_cache.stats()['size'] == 0
+
+    client.stream_error_after = None
+    done = list(agent.answer_question_stream(QUESTION))[-1]
+    assert done['answer'] == ANSWER
+    assert done['cached'] is False
+
+
+def test_async_stream_order_and_error(make_agent):
+    agent = make_agent(FakeAnthropic(), answer_cache=False)
+
+    async def collect(client):
+        async_agent = AsyncGeorgianTaxRAGAgent(agent, client=client)
+        events = []
+        try:
+            async for event in async_agent.answer_question_stream(QUESTION):
+                events.append(event)
+        finally:
+            await async_agent.aclose()
+        return events
+
+    events = asyncio.run(collect(FakeAsyncAnthropic(answer_fn=answer_fn)))
+    assert [event['text'] for event in events if event['type'] == 'text'] == FakeAnthropic.split_deltas(ANSWER)
+    assert events[-1]['type'] == 'done' and events[-1]['answer'] == ANSWER
+
+    with pytest.raises(FakeStreamError):
+        asyncio.run(collect(FakeAsyncAnthropic(answer_fn=answer_fn, stream_error_after=1)))
+
+
+def test_async_batch_is_admitted_as_one_unit(make_agent):
+    agent = make_agent(FakeAnthropic(), answer_cache=False)
+
+    async def run(questions, max_pending):
+        async_agent = AsyncGeorgianTaxRAGAgent(
+            agent, client=FakeAsyncAnthropic(answer_fn=answer_fn), max_concurrency=2, max_pending=max_pending
+        )
+        try:
+            return await async_agent.answer_questions(questions), async_agent.pending
+        finally:
+            await async_agent.aclose()
+
+    # max_concurrency-ზე დიდი batch ერთიანად მიიღება და ბოლომდე მუშავდება; max_pending-ზე დიდი - უარყოფილია
+    results, pending = asyncio.run(run([QUESTION] * 6, max_pending=6))
+    assert [result['answer'] for result in results] == [ANSWER] * 6
+    assert pending == 0
+
+    with pytest.raises(AgentOverloadedError):
+        asyncio.run(run([QUESTION] * 7, max_pending=6))